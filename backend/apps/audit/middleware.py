@@ -1,17 +1,49 @@
-from .services import log_action
-from django.utils.deprecation import MiddlewareMixin
-import json
+from functools import partial
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import transaction
+from .pipeline import audit_pipeline, request_entry
 
-class AuditLogMiddleware(MiddlewareMixin):
+MUTATION_ACTIONS = {'POST': 'CREATE', 'PUT': 'UPDATE', 'PATCH': 'UPDATE', 'DELETE': 'DELETE'}
+
+class AuditLogMiddleware:
     """
-    Logs strict write operations (POST, PUT, PATCH, DELETE).
+    Logs successful write operations (POST, PUT, PATCH, DELETE) as request events:
+    action, actor, path and status. Object-level detail comes from `log_action`.
+    Entries go to the audit pipeline; the request never waits on the INSERT.
     """
-    def process_response(self, request, response):
-        if request.method in ['POST', 'PUT', 'PATCH', 'DELETE']:
-            if 200 <= response.status_code < 300:
-                # Log successful mutation
-                # Note: Capturing the *object* changed is hard here without view cooperation.
-                # This middleware logs the *Request* event.
-                pass 
-                
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _entry(self, request, response):
+        action = MUTATION_ACTIONS.get(request.method)
+        if action is None or not 200 <= response.status_code < 300:
+            return None
+        # The view has run, so reading request.user resolves nothing new
+        return request_entry(request, action, changes={
+            'path': request.path, 'method': request.method, 'status': response.status_code,
+        })
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        entry = self._entry(request, response)
+        if entry is not None:
+            transaction.on_commit(partial(audit_pipeline.submit, entry))
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if request.method not in MUTATION_ACTIONS:
+            return response
+        # request.user may still be lazy; resolving it touches the DB
+        entry = await sync_to_async(self._entry)(request, response)
+        if entry is not None and not audit_pipeline.offer(entry):
+            # Queue full: apply the back-pressure policy off the event loop
+            await sync_to_async(audit_pipeline.submit, thread_sensitive=False)(entry)
         return response
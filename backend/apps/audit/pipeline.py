@@ -0,0 +1,159 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections
+from django.utils import timezone
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_INLINE = 'inline'
+OVERFLOW_DROP = 'drop'
+
+class AuditEntry(NamedTuple):
+    action: str
+    timestamp: datetime
+    actor_id: Optional[object] = None
+    model: Optional[type] = None
+    object_id: Optional[str] = None
+    changes: Optional[dict] = None
+    ip_address: Optional[str] = None
+    user_agent: str = ''
+
+def request_entry(request, action, model=None, object_id=None, changes=None) -> AuditEntry:
+    user = getattr(request, 'user', None)
+    return AuditEntry(
+        action=action,
+        timestamp=timezone.now(),
+        actor_id=user.pk if user is not None and user.is_authenticated else None,
+        model=model,
+        object_id=object_id,
+        changes=changes,
+        ip_address=request.META.get('REMOTE_ADDR'),
+        user_agent=request.META.get('HTTP_USER_AGENT', '')[:200],
+    )
+
+class AuditPipeline:
+    """
+    Bounded in-process queue of audit entries. A background thread wakes every
+    AUDIT_FLUSH_INTERVAL seconds and writes what is queued, one `bulk_create`
+    per AUDIT_BATCH_SIZE entries.
+    When the queue is full, AUDIT_OVERFLOW decides:
+    - block: wait up to AUDIT_BLOCK_SECONDS for space, then write inline (nothing lost)
+    - inline: write the entry in the caller's thread right away (nothing lost)
+    - drop: discard the entry and count it in `dropped`
+    Queued entries are flushed at interpreter exit; a hard kill loses at most one queue.
+    """
+    def __init__(self, background=True):
+        self.background = background
+        self.queue: queue.Queue = queue.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+        self.batch_size = settings.AUDIT_BATCH_SIZE
+        self.flush_interval = settings.AUDIT_FLUSH_INTERVAL
+        self.overflow = settings.AUDIT_OVERFLOW
+        self.block_seconds = settings.AUDIT_BLOCK_SECONDS
+        self.written = 0
+        self.dropped = 0
+        self._content_types = {}
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid = None
+
+    def offer(self, entry: AuditEntry) -> bool:
+        """Queue without waiting; False when full (caller applies `submit` off the event loop)."""
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            return False
+        self._ensure_writer()
+        return True
+
+    def submit(self, entry: AuditEntry):
+        if self.offer(entry):
+            return
+        if self.overflow == OVERFLOW_DROP:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("Audit queue full, %d entries dropped so far", self.dropped)
+            return
+        if self.overflow == OVERFLOW_BLOCK:
+            try:
+                self.queue.put(entry, timeout=self.block_seconds)
+                return
+            except queue.Full:
+                pass
+        self.write([entry])
+
+    def flush(self):
+        """Write everything queued so far in the calling thread."""
+        while batch := self._take():
+            self.write(batch)
+
+    def write(self, entries):
+        try:
+            content_types = self._content_type_ids({e.model for e in entries if e.model is not None})
+            AuditLog.objects.bulk_create([
+                AuditLog(
+                    timestamp=e.timestamp,
+                    actor_id=e.actor_id,
+                    action=e.action,
+                    content_type_id=content_types.get(e.model),
+                    object_id=e.object_id,
+                    changes=e.changes,
+                    ip_address=e.ip_address,
+                    user_agent=e.user_agent,
+                )
+                for e in entries
+            ])
+        except Exception:
+            logger.exception("Failed to write %d audit entries", len(entries))
+        else:
+            self.written += len(entries)
+
+    def _content_type_ids(self, models):
+        missing = [m for m in models if m not in self._content_types]
+        if missing:
+            for model, ct in ContentType.objects.get_for_models(*missing).items():
+                self._content_types[model] = ct.id
+        return self._content_types
+
+    def _take(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _ensure_writer(self):
+        if not self.background:
+            return
+        pid = os.getpid()
+        if self._writer_pid == pid and self._writer.is_alive():
+            return
+        with self._lock:
+            # Threads don't survive a fork: each worker process starts its own writer
+            if self._writer_pid == pid and self._writer.is_alive():
+                return
+            if self._writer_pid is None:
+                atexit.register(self.flush)
+            self._writer = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._writer_pid = pid
+            self._writer.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            while batch := self._take():
+                close_old_connections()
+                self.write(batch)
+
+audit_pipeline = AuditPipeline()
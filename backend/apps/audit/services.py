@@ -1,7 +1,8 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from django.contrib.contenttypes.models import ContentType
-from .models import AuditLog
+from functools import partial
+from django.db import transaction
+from .pipeline import audit_pipeline, request_entry
 from users.models import User, InviteCode
 # Import other critical models as needed
 
@@ -20,15 +21,11 @@ def log_user_change(sender, instance, created, **kwargs):
 
 # We will implement a utility to be called from Views/Services
 def log_action(request, obj, action, changes=None):
+    """
+    Queue an audit entry for `obj`; it is written in a batch once the
+    surrounding transaction commits (nothing is logged for rolled-back work).
+    """
     if not request: return
-    
-    ct = ContentType.objects.get_for_model(obj)
-    AuditLog.objects.create(
-        actor=request.user if request.user.is_authenticated else None,
-        action=action,
-        content_type=ct,
-        object_id=str(obj.pk),
-        changes=changes,
-        ip_address=request.META.get('REMOTE_ADDR'),
-        user_agent=request.META.get('HTTP_USER_AGENT', '')[:200]
-    )
+
+    entry = request_entry(request, action, model=type(obj), object_id=str(obj.pk), changes=changes)
+    transaction.on_commit(partial(audit_pipeline.submit, entry))
@@ -0,0 +1,73 @@
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.contenttypes.models import ContentType
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from .middleware import AuditLogMiddleware
+from .models import AuditLog
+from .pipeline import AuditEntry, AuditPipeline
+
+User = get_user_model()
+
+class AuditPipelineTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='audited', email='audited@example.com', password='pw')
+
+    def entry(self, **kwargs):
+        return AuditEntry(action='UPDATE', timestamp=timezone.now(), actor_id=self.user.pk,
+                          model=User, object_id=str(self.user.pk), **kwargs)
+
+    def test_batched_write(self):
+        pipeline = AuditPipeline(background=False)
+        captured = timezone.now() - timedelta(minutes=5)
+        for _ in range(3):
+            pipeline.submit(self.entry()._replace(timestamp=captured))
+        self.assertFalse(AuditLog.objects.exists())
+
+        pipeline.flush()
+        with self.assertNumQueries(1):  # content type map is warm
+            pipeline.submit(self.entry())
+            pipeline.flush()
+        logs = list(AuditLog.objects.order_by('timestamp'))
+        self.assertEqual(len(logs), 4)
+        self.assertEqual(logs[0].timestamp, captured)
+        self.assertEqual(logs[0].content_type, ContentType.objects.get_for_model(User))
+        self.assertEqual(logs[0].actor, self.user)
+        self.assertEqual(pipeline.written, 4)
+
+    @override_settings(AUDIT_QUEUE_SIZE=1, AUDIT_OVERFLOW='drop')
+    def test_overflow_drop(self):
+        pipeline = AuditPipeline(background=False)
+        pipeline.submit(self.entry())
+        pipeline.submit(self.entry())
+        self.assertEqual(pipeline.dropped, 1)
+        pipeline.flush()
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+    @override_settings(AUDIT_QUEUE_SIZE=1, AUDIT_OVERFLOW='block', AUDIT_BLOCK_SECONDS=0.01)
+    def test_overflow_block_falls_back_inline(self):
+        pipeline = AuditPipeline(background=False)
+        pipeline.submit(self.entry())
+        pipeline.submit(self.entry())
+        self.assertEqual(AuditLog.objects.count(), 1)  # written by the caller
+        pipeline.flush()
+        self.assertEqual(AuditLog.objects.count(), 2)
+
+class AuditLogMiddlewareTests(TestCase):
+    def test_records_successful_mutations(self):
+        pipeline = AuditPipeline(background=False)
+        middleware = AuditLogMiddleware(lambda request: HttpResponse(status=201))
+        factory = RequestFactory()
+        with mock.patch('audit.middleware.audit_pipeline', pipeline), \
+                self.captureOnCommitCallbacks(execute=True):
+            for method in ('post', 'get', 'delete'):
+                request = getattr(factory, method)('/api/v1/listings/hotspots/')
+                request.user = AnonymousUser()
+                middleware(request)
+        entries = list(pipeline.queue.queue)
+        self.assertEqual([e.action for e in entries], ['CREATE', 'DELETE'])
+        self.assertIsNone(entries[0].actor_id)
+        self.assertEqual(entries[0].changes, {'path': '/api/v1/listings/hotspots/', 'method': 'POST', 'status': 201})
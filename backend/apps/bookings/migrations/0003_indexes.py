@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0002_inquiry_user"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="inquiry",
+            index=models.Index(
+                fields=["user", "-created_at"], name="inquiry_user_created"
+            ),
+        ),
+    ]
@@ -37,6 +37,11 @@ class Inquiry(models.Model):
     reference_token = models.CharField(max_length=20, unique=True, editable=False)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='inquiries')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='inquiry_user_created'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.reference_token:
             # Simple reference gen (e.g., VIS-1234)
@@ -2,6 +2,7 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from .models import Inquiry
 from .serializers import InquiryPublicSerializer, InquiryListSerializer
+from shared.pagination import CreatedCursorPagination
 
 class PublicInquiryCreateView(generics.CreateAPIView):
     queryset = Inquiry.objects.all()
@@ -30,6 +31,7 @@ class PublicInquiryCreateView(generics.CreateAPIView):
 class UserInquiryListView(generics.ListAPIView):
     serializer_class = InquiryListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedCursorPagination
 
     def get_queryset(self):
         return Inquiry.objects.filter(user=self.request.user).order_by('-created_at')
@@ -15,8 +15,13 @@ class BroadcastMessageAdmin(admin.ModelAdmin):
 
     @admin.action(description="Publish (enable override)")
     def publish_selected(self, request, queryset):
-        queryset.update(is_active_override=True)
+        # Save each row (not queryset.update) so cache invalidation and kiosk push fire
+        for message in queryset:
+            message.is_active_override = True
+            message.save(update_fields=['is_active_override', 'updated_at'])
 
     @admin.action(description="Disable broadcasts")
     def disable_selected(self, request, queryset):
-        queryset.update(is_active_override=False)
+        for message in queryset:
+            message.is_active_override = False
+            message.save(update_fields=['is_active_override', 'updated_at'])
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BroadcastsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "broadcasts"
+
+    def ready(self):
+        from . import signals  # noqa: F401 (connects public cache invalidation)
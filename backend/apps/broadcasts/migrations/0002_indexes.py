@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("broadcasts", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="broadcastmessage",
+            index=models.Index(
+                condition=models.Q(("is_active_override", True)),
+                fields=["district_id", "start_at", "end_at"],
+                name="broadcast_active_window",
+            ),
+        ),
+    ]
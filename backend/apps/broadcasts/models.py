@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.utils import timezone
 import uuid
@@ -31,6 +32,13 @@ class BroadcastMessage(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Public list: active override + time window, per district (NULL = global)
+            models.Index(fields=['district_id', 'start_at', 'end_at'], name='broadcast_active_window',
+                         condition=Q(is_active_override=True)),
+        ]
+
     @property
     def is_active(self):
         now = timezone.now()
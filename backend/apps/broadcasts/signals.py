@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from shared.cache import BROADCASTS, bump_versions_on_commit
+from .models import BroadcastMessage
+
+@receiver(post_save, sender=BroadcastMessage)
+@receiver(post_delete, sender=BroadcastMessage)
+def invalidate_broadcast_cache(sender, instance, **kwargs):
+    bump_versions_on_commit(BROADCASTS, instance.district_id)
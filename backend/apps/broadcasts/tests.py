@@ -1,3 +1,76 @@
-from django.test import TestCase
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from .models import BroadcastMessage
+from .views import PublicBroadcastListView
 
-# Create your tests here.
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+@override_settings(CACHES=LOCMEM)
+class PublicBroadcastCacheTests(TestCase):
+    url = '/api/v1/public/broadcasts'
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        now = timezone.now()
+        self.east = BroadcastMessage.objects.create(
+            district_id='east', category='ADVISORY', title='Fog', message='m',
+            start_at=now - timedelta(hours=1), end_at=now + timedelta(hours=2))
+        BroadcastMessage.objects.create(
+            district_id='west', category='ADVISORY', title='Rain', message='m',
+            start_at=now - timedelta(hours=1), end_at=now + timedelta(hours=2))
+
+    def _titles(self, district):
+        response = self.client.get(self.url, {'district_id': district})
+        self.assertEqual(response.status_code, 200)
+        return [b['title'] for b in response.data]
+
+    def test_second_read_served_from_cache(self):
+        self.assertEqual(self._titles('east'), ['Fog'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self._titles('east'), ['Fog'])
+
+    def test_write_invalidates_only_its_district(self):
+        self._titles('east')
+        self._titles('west')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.east.title = 'Dense fog'
+            self.east.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(self._titles('west'), ['Rain'])
+        self.assertEqual(self._titles('east'), ['Dense fog'])
+
+    def test_global_broadcast_invalidates_every_district(self):
+        self._titles('west')
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            BroadcastMessage.objects.create(district_id='', category='ADVISORY', title='Strike', message='m',
+                                            start_at=now - timedelta(minutes=1), end_at=now + timedelta(hours=1))
+        self.assertEqual(sorted(self._titles('west')), ['Rain', 'Strike'])
+
+    def test_timeout_stops_at_next_window_change(self):
+        now = timezone.now()
+        BroadcastMessage.objects.create(district_id='east', category='ADVISORY', title='Later', message='m',
+                                        start_at=now + timedelta(minutes=10), end_at=now + timedelta(hours=1))
+        view = PublicBroadcastListView()
+        view.request = type('Request', (), {'query_params': {'district_id': 'east'}})()
+        self.assertTrue(590 <= view.get_cache_timeout() <= 601)
+
+    def test_conditional_get_returns_304_without_queries(self):
+        first = self.client.get(self.url, {'district_id': 'east'})
+        etag = first['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'district_id': 'east'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.east.title = 'Dense fog'
+            self.east.save()
+        response = self.client.get(self.url, {'district_id': 'east'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
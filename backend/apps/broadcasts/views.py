@@ -1,23 +1,34 @@
+from adrf.generics import ListAPIView as AsyncListAPIView
 from django.utils import timezone
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from .models import BroadcastMessage
 from .serializers import BroadcastMessageSerializer
+from shared.cache import BROADCASTS, cached_public_response, next_window_change
 
-class PublicBroadcastListView(generics.ListAPIView):
+class PublicBroadcastListView(AsyncListAPIView):
     serializer_class = BroadcastMessageSerializer
     permission_classes = [permissions.AllowAny]
 
+    @cached_public_response(BROADCASTS)
+    async def get(self, request, *args, **kwargs):
+        messages = [message async for message in self.get_queryset()]
+        return Response(self.get_serializer(messages, many=True).data)
+
+    def get_cache_timeout(self):
+        return next_window_change(self.get_district_queryset())
+
     def get_queryset(self):
-        district_id = self.request.query_params.get('district_id')
         now = timezone.now()
-        qs = BroadcastMessage.objects.filter(
-            is_active_override=True,
-            start_at__lte=now,
-            end_at__gte=now
-        )
-        
+        qs = self.get_district_queryset().filter(start_at__lte=now, end_at__gte=now)
+        return qs.order_by('-severity', '-created_at')
+
+    def get_district_queryset(self):
+        """Enabled broadcasts for the requested district, regardless of time window."""
+        district_id = self.request.query_params.get('district_id')
+        qs = BroadcastMessage.objects.filter(is_active_override=True)
+
         if district_id:
             # Include global (null) and specific district
             qs = qs.filter(district_id__in=[None, '', district_id])
@@ -29,7 +40,7 @@ class PublicBroadcastListView(generics.ListAPIView):
             # Let's return global if no district provided
             qs = qs.filter(district_id__isnull=True)
             
-        return qs.order_by('-severity', '-created_at')
+        return qs
 
 class AdminBroadcastListCreateView(generics.ListCreateAPIView):
     queryset = BroadcastMessage.objects.all()
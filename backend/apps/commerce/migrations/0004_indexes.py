@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("commerce", "0003_deal_product_remove_qrcode_host_dealtoken_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dealtoken",
+            index=models.Index(fields=["token_value"], name="dealtoken_value"),
+        ),
+    ]
@@ -52,5 +52,10 @@ class DealToken(models.Model):
     used_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['token_value'], name='dealtoken_value'),
+        ]
+
     def is_valid(self):
         return (not self.used_at) and (timezone.now() < self.expires_at)
@@ -1,39 +1,126 @@
+import re
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.http import JsonResponse
 from rest_framework import status
+from shared.db import replica_aliases, replica_reads
 
-class KioskIsolationMiddleware:
+KIOSK_RULE = 'kiosk'
+ADMIN_RULE = 'admin'
+
+def compile_path_rules(rules):
+    """
+    One anchored regex for {rule_name: [path prefixes]}.
+    `match(path).lastgroup` names the rule the path falls under, or the match is None.
+    A path can only fall under one rule, so prefixes that overlap across rules
+    (one starts with the other) are rejected: the second rule's check would be skipped.
+    """
+    owners = [(prefix, name) for name, prefixes in rules.items() for prefix in set(prefixes) if prefix]
+    for prefix, name in owners:
+        for other, other_name in owners:
+            if name != other_name and other.startswith(prefix):
+                raise ImproperlyConfigured(f"Path prefix {other!r} ({other_name}) overlaps {prefix!r} ({name})")
+    alternatives = []
+    for name, prefixes in rules.items():
+        prefixes = sorted({p for p in prefixes if p}, key=len, reverse=True)
+        if prefixes:
+            alternatives.append(f"(?P<{name}>{'|'.join(map(re.escape, prefixes))})")
+    return re.compile('|'.join(alternatives)) if alternatives else None
+
+def forbidden(detail):
+    return JsonResponse({'detail': detail}, status=status.HTTP_403_FORBIDDEN)
+
+class AccessPolicyMiddleware:
     """
-    Middleware to handle Kiosk-specific traffic.
-    - If 'X-Kiosk-ID' is present, enforce Kiosk constraints.
-    - Block access to personalized endpoints (users/me, wallet, etc.)
+    Path policy for kiosks and the Django admin, evaluated in one regex match.
+    - Requests with 'X-Kiosk-ID' are tagged `is_kiosk` and blocked from
+      ACCESS_POLICY_KIOSK_BLOCKED prefixes (users/me, signup, bookings, ...).
+    - ACCESS_POLICY_ADMIN_PREFIXES are limited to superusers and
+      ACCESS_POLICY_ADMIN_ROLES; anonymous users fall through to the admin login.
+    - `request.user` is only resolved on admin paths, so public and kiosk
+      calls never pay for session/JWT lookup here.
+    Rules are compiled once at startup; runs natively under ASGI and WSGI.
     """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
-        self.kiosk_restricted_paths = [
-            '/api/v1/users/me/',
-            '/api/v1/auth/signup/', # Kiosks don't sign up
-            '/api/v1/bookings/',
-        ]
+        self.admin_roles = frozenset(settings.ACCESS_POLICY_ADMIN_ROLES)
+        self.rules = compile_path_rules({
+            KIOSK_RULE: settings.ACCESS_POLICY_KIOSK_BLOCKED,
+            ADMIN_RULE: settings.ACCESS_POLICY_ADMIN_PREFIXES,
+        })
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _rule(self, request):
+        request.is_kiosk = 'X-Kiosk-ID' in request.headers
+        match = self.rules.match(request.path_info) if self.rules else None
+        return match.lastgroup if match else None
+
+    def _admin_allowed(self, user):
+        return not user.is_authenticated or user.is_superuser or user.role in self.admin_roles
 
     def __call__(self, request):
-        kiosk_id = request.headers.get('X-Kiosk-ID')
-        
-        if kiosk_id:
-            # Enforce restrictions
-            path = request.path_info
-            
-            # 1. Block restricted paths
-            for restricted in self.kiosk_restricted_paths:
-                if path.startswith(restricted):
-                     return JsonResponse(
-                         {'detail': 'Action forbidden for Kiosk clients.'}, 
-                         status=status.HTTP_403_FORBIDDEN
-                     )
-            
-            # 2. Tag request (optional, for views to know)
-            request.is_kiosk = True
-        else:
-            request.is_kiosk = False
-
-        response = self.get_response(request)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        rule = self._rule(request)
+        if rule == KIOSK_RULE and request.is_kiosk:
+            return forbidden('Action forbidden for Kiosk clients.')
+        if rule == ADMIN_RULE and not self._admin_allowed(request.user):
+            return forbidden('Access forbidden to Admin Area.')
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        rule = self._rule(request)
+        if rule == KIOSK_RULE and request.is_kiosk:
+            return forbidden('Action forbidden for Kiosk clients.')
+        if rule == ADMIN_RULE and not self._admin_allowed(await request.auser()):
+            return forbidden('Access forbidden to Admin Area.')
+        return await self.get_response(request)
+
+class ReplicaReadMiddleware:
+    """
+    Public GET/HEAD requests under REPLICA_READ_PREFIXES read from a replica.
+    - A successful write sets the REPLICA_PIN_COOKIE for REPLICA_STICKY_SECONDS;
+      while it is present that client reads from the primary (sees its own edits).
+    - Writes inside a replica request still go to the primary, and so do the
+      reads after them (shared.db.PrimaryReplicaRouter).
+    Passes everything through when no replicas are configured.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = bool(replica_aliases())
+        self.rules = compile_path_rules({'replica': settings.REPLICA_READ_PREFIXES})
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _use_replica(self, request):
+        return (self.enabled and request.method in ('GET', 'HEAD') and self.rules is not None
+                and settings.REPLICA_PIN_COOKIE not in request.COOKIES
+                and self.rules.match(request.path_info) is not None)
+
+    def _pin_after_write(self, request, response):
+        if self.enabled and request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            response.set_cookie(settings.REPLICA_PIN_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS,
+                                httponly=True, samesite='Lax')
         return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self._use_replica(request):
+            with replica_reads():
+                return self.get_response(request)
+        return self._pin_after_write(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        if self._use_replica(request):
+            with replica_reads():
+                return await self.get_response(request)
+        return self._pin_after_write(request, await self.get_response(request))
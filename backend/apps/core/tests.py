@@ -0,0 +1,181 @@
+import uuid
+from django.db import connection
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.functional import SimpleLazyObject
+from rest_framework.test import APIClient
+from django.utils import timezone
+from listings.models import Hotspot
+from safety.models import CrowdAggregate, DistrictRestriction
+from broadcasts.models import BroadcastMessage
+from commerce.models import DealToken
+from users.models import ConnectCode
+from shared.cache import CROWD, bump_versions, recently_changed
+from shared.db import PrimaryReplicaRouter, current_read_alias, replica_reads
+from shared.pagination import UpdatedCursorPagination
+from .middleware import AccessPolicyMiddleware, ReplicaReadMiddleware, compile_path_rules
+
+User = get_user_model()
+
+class QueryPlanTests(TestCase):
+    """
+    Hot public query paths must be index-backed.
+    Seq scans are disabled for the transaction, so any plan that still
+    contains one has no usable index and fails here instead of in production.
+    """
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertIndexed(self, qs):
+        plan = qs.explain()
+        self.assertNotIn("Seq Scan", plan, msg=f"\n{qs.query}\n{plan}")
+
+    def test_hotspot_district_lookups(self):
+        live = Hotspot.objects.filter(status=Hotspot.Status.Live)
+        self.assertIndexed(live.filter(district__iexact='East Sikkim'))
+        self.assertIndexed(live.filter(
+            sensitivity_level=Hotspot.Sensitivity.Public, district__iexact='East Sikkim'))
+
+    def test_hotspot_cursor_ordering(self):
+        qs = Hotspot.objects.filter(status=Hotspot.Status.Live).order_by('-updated_at', '-id')[:21]
+        self.assertIndexed(qs)
+        self.assertNotIn("Sort", qs.explain())
+        # A later page: the (updated_at, id) seek condition still walks the index
+        paginator = UpdatedCursorPagination()
+        paginator.fields = ['updated_at', 'id']
+        seek = paginator._seek([timezone.now().isoformat(), 10**6], descending=True)
+        qs = Hotspot.objects.filter(status=Hotspot.Status.Live).filter(seek).order_by('-updated_at', '-id')[:21]
+        self.assertIndexed(qs)
+        self.assertNotIn("Sort", qs.explain())
+
+    def test_hotspot_tag_overlap(self):
+        self.assertIndexed(Hotspot.objects.filter(tags_normalized__overlap=['tea', 'nature']))
+
+    def test_crowd_latest(self):
+        self.assertIndexed(CrowdAggregate.objects.filter(hotspot_id='1').order_by('-timestamp')[:10])
+        self.assertIndexed(CrowdAggregate.objects.filter(district_id='east').order_by('-timestamp')[:10])
+        self.assertIndexed(CrowdAggregate.objects.order_by('-timestamp')[:10])
+
+    def test_reco_crowd_levels(self):
+        from reco.infrastructure import CrowdAggregateAdapter
+        qs = CrowdAggregateAdapter()._latest({'1': 1, '2': 2})
+        self.assertIndexed(qs)
+        # Not a full walk of the (district_id, hotspot_id) key
+        self.assertIn("current_crowd_hotspot", qs.explain())
+
+    def test_active_windows(self):
+        now = timezone.now()
+        self.assertIndexed(BroadcastMessage.objects.filter(
+            is_active_override=True, start_at__lte=now, end_at__gte=now, district_id='east'))
+        self.assertIndexed(DistrictRestriction.objects.filter(
+            start_at__lte=now, end_at__gte=now, district_id='east'))
+
+    def test_token_lookups(self):
+        self.assertIndexed(DealToken.objects.filter(token_value=uuid.uuid4()))
+        self.assertIndexed(ConnectCode.objects.filter(code='123456', is_used=False))
+
+class AccessPolicyMiddlewareTests(TestCase):
+    def test_compiled_rules(self):
+        rules = compile_path_rules({'kiosk': ['/api/v1/users/me/', '/api/v1/bookings/'], 'admin': ['/admin/'], 'none': []})
+        self.assertEqual(rules.match('/api/v1/bookings/12/').lastgroup, 'kiosk')
+        self.assertEqual(rules.match('/admin/listings/').lastgroup, 'admin')
+        self.assertIsNone(rules.match('/api/v1/kiosk/discover/'))
+        self.assertIsNone(rules.match('/x/admin/'))
+
+    def test_overlapping_rules_rejected(self):
+        for kiosk, admin in [(['/admin/'], ['/admin/']), (['/admin/users/'], ['/admin/']),
+                             (['/a/', '/a/b/'], ['/a/c/'])]:
+            with self.assertRaises(ImproperlyConfigured):
+                compile_path_rules({'kiosk': kiosk, 'admin': admin})
+        # Within one rule, overlap is harmless
+        self.assertIsNotNone(compile_path_rules({'kiosk': ['/a/', '/a/b/']}))
+
+    @override_settings(ACCESS_POLICY_KIOSK_BLOCKED=['/admin/'], ACCESS_POLICY_ADMIN_PREFIXES=['/admin/'])
+    def test_overlapping_settings_fail_at_startup(self):
+        with self.assertRaises(ImproperlyConfigured):
+            AccessPolicyMiddleware(lambda request: HttpResponse())
+
+    def test_kiosk_blocked_only_with_header(self):
+        response = self.client.get('/api/v1/users/me/', headers={'X-Kiosk-ID': 'k-1'})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()['detail'], 'Action forbidden for Kiosk clients.')
+        self.assertNotEqual(self.client.get('/api/v1/users/me/').status_code, 403)
+
+    def test_admin_area_by_role(self):
+        host = User.objects.create_user(username='policy-host', email='policy-host@example.com',
+                                        password='pw', role=User.Role.HOST)
+        self.client.force_login(host)
+        self.assertEqual(self.client.get('/admin/').status_code, 403)
+        host.role = User.Role.ADMIN
+        host.save()
+        self.assertNotEqual(self.client.get('/admin/').status_code, 403)
+
+    def test_public_path_does_not_load_user(self):
+        middleware = AccessPolicyMiddleware(lambda request: 'ok')
+        request = RequestFactory().get('/api/v1/kiosk/discover/', headers={'X-Kiosk-ID': 'k-1'})
+        request.user = SimpleLazyObject(lambda: self.fail('user resolved on a public path'))
+        self.assertEqual(middleware(request), 'ok')
+        self.assertTrue(request.is_kiosk)
+
+    async def test_async_chain(self):
+        async def view(request):
+            return 'ok'
+        middleware = AccessPolicyMiddleware(view)
+        request = RequestFactory().get('/api/v1/bookings/', headers={'X-Kiosk-ID': 'k-1'})
+        self.assertEqual((await middleware(request)).status_code, 403)
+        request = RequestFactory().get('/api/v1/sights/')
+        self.assertEqual(await middleware(request), 'ok')
+
+class DatabaseStatsTests(TestCase):
+    def test_admin_only(self):
+        self.assertIn(self.client.get('/api/v1/ops/db/').status_code, (401, 403))
+        admin = User.objects.create_user(username='ops-admin', email='ops-admin@example.com',
+                                         password='pw', role=User.Role.ADMIN)
+        client = APIClient()
+        client.force_authenticate(admin)
+        body = client.get('/api/v1/ops/db/').json()
+        self.assertEqual(body['mode'], settings.DB_CONN_MODE)
+        self.assertIn('conn_max_age', body['databases']['default'])
+
+@override_settings(DATABASE_REPLICAS=['replica_0'], CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ReplicaRoutingTests(TestCase):
+    def test_router(self):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Hotspot), 'default')
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Hotspot), 'replica_0')
+            self.assertEqual(router.db_for_write(Hotspot), 'default')
+            self.assertEqual(router.db_for_read(Hotspot), 'default')  # read-your-writes
+        self.assertFalse(router.allow_migrate('replica_0', 'listings'))
+
+    def test_middleware_prefixes_and_pin(self):
+        seen = []
+        def view(request):
+            seen.append(current_read_alias())
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+        middleware = ReplicaReadMiddleware(view)
+        factory = RequestFactory()
+
+        middleware(factory.get('/api/v1/safety/public/crowd'))
+        middleware(factory.get('/api/v1/users/me/'))
+        response = middleware(factory.post('/api/v1/listings/host/hotspots/'))
+        pinned = factory.get('/api/v1/safety/public/crowd')
+        pinned.COOKIES[settings.REPLICA_PIN_COOKIE] = response.cookies[settings.REPLICA_PIN_COOKIE].value
+        middleware(pinned)
+
+        self.assertEqual(seen, ['replica_0', 'default', 'default', 'default'])
+        self.assertEqual(response.cookies[settings.REPLICA_PIN_COOKIE]['max-age'], settings.REPLICA_STICKY_SECONDS)
+
+    def test_cache_miss_after_change_reads_primary(self):
+        cache.clear()
+        self.assertFalse(recently_changed(CROWD, 'east'))
+        bump_versions(CROWD, 'east')
+        self.assertTrue(recently_changed(CROWD, 'East'))
+        self.assertTrue(recently_changed(CROWD))  # cross-district listings
+        self.assertFalse(recently_changed(CROWD, 'west'))
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import DatabaseStatsView
+
+urlpatterns = [
+    path('db/', DatabaseStatsView.as_view(), name='ops-db-stats'),
+]
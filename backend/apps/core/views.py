@@ -0,0 +1,35 @@
+import os
+from django.conf import settings
+from django.db import connections
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rbac.permissions import IsAdmin
+
+def database_stats() -> dict:
+    """
+    Connection settings per alias for this worker process, plus psycopg pool
+    counters (pool_size, pool_available, requests_waiting, ...) in pool mode.
+    """
+    databases = {}
+    for alias in connections:
+        conn = connections[alias]
+        stats = {
+            'vendor': conn.vendor,
+            'conn_max_age': conn.settings_dict['CONN_MAX_AGE'],
+            'health_checks': conn.settings_dict['CONN_HEALTH_CHECKS'],
+        }
+        pool = getattr(conn, 'pool', None)  # postgresql backend, pool mode only
+        if pool is not None:
+            stats['pool'] = pool.get_stats()
+        databases[alias] = stats
+    return {'pid': os.getpid(), 'mode': settings.DB_CONN_MODE, 'databases': databases}
+
+class DatabaseStatsView(APIView):
+    """
+    GET /api/v1/ops/db/ (Admin Only)
+    Numbers are per worker process; scrape each worker or sum across responses.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(database_stats())
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class FeaturesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'features'
+
+    def ready(self):
+        from . import signals  # noqa: F401 (invalidates flag snapshots)
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:34
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("features", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="featureflag",
+            name="enabled_districts",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                blank=True,
+                default=list,
+                size=None,
+            ),
+        ),
+    ]
@@ -1,12 +1,23 @@
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from shared.cache import normalize_district
 
 class FeatureFlag(models.Model):
+    """
+    Evaluated by `features.services.is_feature_enabled`, most general rule first:
+    global switch, then districts, then a deterministic percentage of subjects.
+    """
     name = models.CharField(max_length=100, unique=True)
     is_global_enabled = models.BooleanField(default=False)
-    # enabled_districts = models.ManyToManyField('geography.District') # TODO Link
+    # District ids (case-insensitive) the flag is fully on for
+    enabled_districts = ArrayField(models.CharField(max_length=100), default=list, blank=True)
     rollout_percentage = models.IntegerField(default=0)
     
     description = models.TextField(blank=True)
 
+    def save(self, *args, **kwargs):
+        self.enabled_districts = sorted({normalize_district(d) for d in self.enabled_districts if normalize_district(d)})
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.name} ({'ON' if self.is_global_enabled else 'OFF'})"
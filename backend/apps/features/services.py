@@ -0,0 +1,99 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Dict, FrozenSet, NamedTuple, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from shared.cache import FEATURES, get_versions, normalize_district
+from .models import FeatureFlag
+
+logger = logging.getLogger(__name__)
+
+class FlagRule(NamedTuple):
+    global_enabled: bool
+    districts: FrozenSet[str]
+    percentage: int
+
+def bucket(name: str, subject_id) -> int:
+    """Stable 0-99 bucket per (flag, subject): a subject stays in or out as the percentage grows."""
+    digest = hashlib.sha1(f"{name}:{subject_id}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'big') % 100
+
+def evaluate(rule: FlagRule, name: str, district=None, subject_id=None) -> bool:
+    """
+    - global switch on: enabled everywhere
+    - district listed in enabled_districts: enabled for that district
+    - otherwise the subject's bucket (or the district's, without a subject)
+      must fall under rollout_percentage
+    """
+    if rule.global_enabled:
+        return True
+    district = normalize_district(district)
+    if district and district in rule.districts:
+        return True
+    subject = subject_id if subject_id not in (None, '') else district
+    if rule.percentage <= 0 or not subject:
+        return False
+    return bucket(name, subject) < rule.percentage
+
+class FlagSnapshot:
+    """
+    Process-local copy of every FeatureFlag.
+    - Evaluations read the snapshot only; no DB or cache round trip.
+    - At most every FEATURE_FLAG_CHECK_SECONDS the shared version key is read;
+      all flags are reloaded (one query) only when it moved, so an admin change
+      reaches every process without a restart.
+    - Cache outage: reload on every check instead (fail open, bounded by the interval).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rules: Optional[Dict[str, FlagRule]] = None
+        self._version: Optional[str] = None
+        self._checked_at = 0.0
+        self.loads = 0
+
+    def current(self) -> Optional[Dict[str, FlagRule]]:
+        """The snapshot if it doesn't need a version check yet, else None."""
+        if self._rules is not None and time.monotonic() - self._checked_at < settings.FEATURE_FLAG_CHECK_SECONDS:
+            return self._rules
+        return None
+
+    def rules(self) -> Dict[str, FlagRule]:
+        rules = self.current()
+        if rules is not None:
+            return rules
+        try:
+            version = get_versions(FEATURES)
+        except Exception as exc:
+            logger.warning("Feature flag version check failed: %s", exc)
+            version = None
+        with self._lock:
+            if self._rules is None or version is None or version != self._version:
+                self._rules = {
+                    flag.name: FlagRule(flag.is_global_enabled, frozenset(flag.enabled_districts),
+                                        flag.rollout_percentage)
+                    for flag in FeatureFlag.objects.all()
+                }
+                self._version = version
+                self.loads += 1
+            self._checked_at = time.monotonic()
+            return self._rules
+
+    def invalidate(self):
+        with self._lock:
+            self._rules = None
+
+flag_snapshot = FlagSnapshot()
+
+def is_feature_enabled(name: str, district=None, subject_id=None, default: bool = False) -> bool:
+    """`default` applies when no flag with this name exists."""
+    rule = flag_snapshot.rules().get(name)
+    return default if rule is None else evaluate(rule, name, district, subject_id)
+
+async def ais_feature_enabled(name: str, district=None, subject_id=None, default: bool = False) -> bool:
+    rules = flag_snapshot.current()
+    if rules is None:
+        rules = await sync_to_async(flag_snapshot.rules)()
+    rule = rules.get(name)
+    return default if rule is None else evaluate(rule, name, district, subject_id)
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from shared.cache import FEATURES, bump_versions_on_commit
+from .models import FeatureFlag
+from .services import flag_snapshot
+
+@receiver(post_save, sender=FeatureFlag)
+@receiver(post_delete, sender=FeatureFlag)
+def invalidate_flag_snapshots(sender, instance, **kwargs):
+    # After commit: this process reloads at once, others on their next version check
+    transaction.on_commit(flag_snapshot.invalidate)
+    bump_versions_on_commit(FEATURES)
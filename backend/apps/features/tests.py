@@ -0,0 +1,49 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from shared.cache import FEATURES, bump_versions
+from .models import FeatureFlag
+from .services import FlagRule, bucket, evaluate, flag_snapshot, is_feature_enabled
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+class FlagEvaluationTests(SimpleTestCase):
+    def test_hierarchy(self):
+        rule = FlagRule(global_enabled=False, districts=frozenset({'east'}), percentage=0)
+        self.assertTrue(evaluate(rule, 'f', district=' East '))
+        self.assertFalse(evaluate(rule, 'f', district='west', subject_id='kiosk-1'))
+        self.assertTrue(evaluate(rule._replace(global_enabled=True), 'f', district='west'))
+        self.assertTrue(evaluate(rule._replace(percentage=100), 'f', district='west', subject_id='kiosk-1'))
+        self.assertFalse(evaluate(rule._replace(percentage=100), 'f'))  # nothing to bucket
+
+    def test_bucketing_is_stable_and_monotonic(self):
+        subjects = [f"kiosk-{i}" for i in range(1000)]
+        self.assertEqual([bucket('f', s) for s in subjects], [bucket('f', s) for s in subjects])
+        at = {pct: {s for s in subjects if evaluate(FlagRule(False, frozenset(), pct), 'f', subject_id=s)}
+              for pct in (10, 50)}
+        self.assertTrue(at[10] < at[50])
+        self.assertAlmostEqual(len(at[50]) / len(subjects), 0.5, delta=0.06)
+
+@override_settings(CACHES=LOCMEM, FEATURE_FLAG_CHECK_SECONDS=60)
+class FlagSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        flag_snapshot.invalidate()
+        self.addCleanup(flag_snapshot.invalidate)
+
+    def test_hot_path_is_query_free(self):
+        FeatureFlag.objects.create(name='new_ui', enabled_districts=['east'])
+        self.assertTrue(is_feature_enabled('new_ui', 'east'))
+        with self.assertNumQueries(0):
+            for _ in range(100):
+                is_feature_enabled('new_ui', 'east', subject_id='k1')
+            self.assertTrue(is_feature_enabled('missing', default=True))
+
+    def test_change_in_another_process(self):
+        flag = FeatureFlag.objects.create(name='new_ui')
+        self.assertFalse(is_feature_enabled('new_ui', 'west'))
+        # Simulate another process: row changes without this process's signal
+        FeatureFlag.objects.filter(pk=flag.pk).update(enabled_districts=['west'])
+        bump_versions(FEATURES)
+        self.assertFalse(is_feature_enabled('new_ui', 'west'))  # still within the check interval
+        with override_settings(FEATURE_FLAG_CHECK_SECONDS=0):
+            self.assertTrue(is_feature_enabled('new_ui', 'west'))
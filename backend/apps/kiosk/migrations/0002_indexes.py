@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kiosk", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="kioskheartbeat",
+            index=models.Index(
+                fields=["kiosk", "-timestamp"], name="heartbeat_kiosk_ts"
+            ),
+        ),
+    ]
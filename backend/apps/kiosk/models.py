@@ -28,6 +28,11 @@ class KioskHeartbeat(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     ipv4 = models.GenericIPAddressField(null=True, blank=True)
     status_payload = models.JSONField(default=dict, help_text="Device health metrics")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kiosk', '-timestamp'], name='heartbeat_kiosk_ts'),
+        ]
     
     def __str__(self):
         return f"{self.kiosk.name} @ {self.timestamp}"
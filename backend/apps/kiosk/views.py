@@ -1,18 +1,25 @@
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
 from listings.models import Hotspot
+from listings.queries import filter_by_interests
 from listings.serializers import HotspotPublicSerializer
-from django.db.models import Q
+from shared.cache import HOTSPOTS, cached_public_response
+from shared.pagination import RankedCursorPagination
 
-class DiscoverView(APIView):
+class DiscoverView(AsyncAPIView):
     """
     Public discovery endpoint for Kiosks.
-    GET /api/kiosk/discover?time=60&interests=tea,nature
+    GET /api/kiosk/discover?time=60&interests=tea,nature&limit=20
+    Ranked by number of matching interests, cursor-paginated (`next` link).
     """
     permission_classes = [permissions.AllowAny]
+    pagination_class = RankedCursorPagination
 
-    def get(self, request):
+    @cached_public_response(HOTSPOTS, district_params=())
+    async def get(self, request):
         time_limit = request.query_params.get('time')
         interests_param = request.query_params.get('interests')
         
@@ -28,19 +35,21 @@ class DiscoverView(APIView):
             except ValueError:
                 pass
         
-        # 2. Interest Filter (Overlap)
+        # 2. Interest Filter (Overlap) - single && query on the GIN-indexed tag array
+        paginator = self.pagination_class()
         if interests_param:
-            interests = [i.strip().lower() for i in interests_param.split(',') if i.strip()]
-            if interests:
-                # Naive JSON list filter for SQLite compatibility (contains any)
-                q_objs = Q()
-                for interest in interests:
-                    q_objs |= Q(tags__contains=interest) 
-                queryset = queryset.filter(q_objs)
+            interests = interests_param.split(',')
+            if Hotspot.normalize_tags(interests):
+                queryset = filter_by_interests(queryset, interests)
+                paginator.ordering = ('-tag_overlap', '-id')
+
+        queryset = queryset.select_related('host').prefetch_related('media')
+        # Cursor pagination evaluates the page itself and has no async API
+        page = await sync_to_async(paginator.paginate_queryset)(queryset, request, view=self)
 
         # Serialize
-        data = HotspotPublicSerializer(queryset, many=True).data
-        return Response(data)
+        data = HotspotPublicSerializer(page, many=True).data
+        return paginator.get_paginated_response(data)
 
 class KioskHomeView(APIView):
     permission_classes = [permissions.AllowAny]
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Hotspot, Media, Review, ModerationTicket
+from .signals import hotspot_status_changed
 
 class MediaInline(admin.TabularInline):
     model = Media
@@ -41,17 +42,28 @@ class HotspotAdmin(admin.ModelAdmin):
 
     actions = ['approve_hotspots', 'reject_hotspots', 'publish_hotspots']
 
+    def _notify_status_change(self, hotspots, new_status):
+        # queryset.update() bypasses post_save, so emit the lifecycle signal explicitly
+        for hotspot in hotspots:
+            hotspot_status_changed.send(sender=Hotspot, hotspot=hotspot, old_status=hotspot.status, new_status=new_status)
+
     @admin.action(description='Approve selected hotspots')
     def approve_hotspots(self, request, queryset):
+        hotspots = list(queryset)
         queryset.update(status=Hotspot.Status.Approved, approved_by=request.user)
+        self._notify_status_change(hotspots, Hotspot.Status.Approved)
 
     @admin.action(description='Reject selected hotspots')
     def reject_hotspots(self, request, queryset):
-        queryset.update(status=Hotspot.Status.Rejected)
+        hotspots = list(queryset)
+        queryset.update(status=Hotspot.Status.ChangesRequested)
+        self._notify_status_change(hotspots, Hotspot.Status.ChangesRequested)
 
     @admin.action(description='Publish (Go Live)')
     def publish_hotspots(self, request, queryset):
+        approved = list(queryset.filter(status=Hotspot.Status.Approved))
         queryset.filter(status=Hotspot.Status.Approved).update(status=Hotspot.Status.Live)
+        self._notify_status_change(approved, Hotspot.Status.Live)
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:02
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0005_hotspot_hotspot_type_hotspot_sights_category"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="hotspot",
+            index=models.Index(
+                fields=["status", "sensitivity_level", "district"],
+                name="hotspot_status_sens_dist",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hotspot",
+            index=models.Index(
+                django.db.models.functions.text.Upper("district"),
+                condition=models.Q(("status", "LIVE")),
+                name="hotspot_live_dist_upper",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:03
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_tags_normalized(apps, schema_editor):
+    Hotspot = apps.get_model("listings", "Hotspot")
+    batch = []
+    for hotspot in Hotspot.objects.only("id", "tags").iterator(chunk_size=500):
+        seen = []
+        for tag in hotspot.tags or []:
+            tag = str(tag).strip().lower()
+            if tag and tag not in seen:
+                seen.append(tag)
+        hotspot.tags_normalized = seen
+        batch.append(hotspot)
+    Hotspot.objects.bulk_update(batch, ["tags_normalized"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0006_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hotspot",
+            name="tags_normalized",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                blank=True,
+                default=list,
+                editable=False,
+                size=None,
+            ),
+        ),
+        migrations.RunPython(backfill_tags_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="hotspot",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tags_normalized"], name="hotspot_tags_gin"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0007_hotspot_tags_normalized"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="hotspot",
+            index=models.Index(
+                condition=models.Q(("status", "LIVE")),
+                fields=["-updated_at", "-id"],
+                name="hotspot_live_updated",
+            ),
+        ),
+    ]
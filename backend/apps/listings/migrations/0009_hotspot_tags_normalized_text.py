@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:10
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0008_hotspot_live_updated_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="hotspot",
+            name="tags_normalized",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.TextField(),
+                blank=True,
+                default=list,
+                editable=False,
+                size=None,
+            ),
+        ),
+    ]
@@ -1,4 +1,8 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.conf import settings
 
 class Hotspot(models.Model):
@@ -33,6 +37,8 @@ class Hotspot(models.Model):
     operating_hours = models.CharField(max_length=100, blank=True, help_text="e.g., '09:00 - 17:00'")
     seasons = models.JSONField(default=list, blank=True, help_text="e.g., ['Winter', 'Spring']")
     tags = models.JSONField(default=list, blank=True)
+    # Lowercased, de-duplicated copy of `tags` maintained on save (GIN-indexed for && overlap)
+    tags_normalized = ArrayField(models.TextField(), default=list, blank=True, editable=False)
     
     # Safety & Access
     safety_notes = models.TextField(blank=True, help_text="Public safety warnings")
@@ -79,6 +85,43 @@ class Hotspot(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Public/kiosk filters: status + sensitivity + district
+            models.Index(fields=['status', 'sensitivity_level', 'district'], name='hotspot_status_sens_dist'),
+            # district__iexact on LIVE rows compiles to UPPER(district::text)
+            models.Index(Upper('district'), name='hotspot_live_dist_upper', condition=Q(status='LIVE')),
+            GinIndex(fields=['tags_normalized'], name='hotspot_tags_gin'),
+            # Cursor pagination of public lists on (updated_at, id)
+            models.Index(fields=['-updated_at', '-id'], name='hotspot_live_updated',
+                         condition=Q(status='LIVE')),
+        ]
+
+    @staticmethod
+    def normalize_tags(tags):
+        """Lowercase, strip and de-duplicate tags, keeping first-seen order."""
+        seen = []
+        for tag in tags or []:
+            tag = str(tag).strip().lower()
+            if tag and tag not in seen:
+                seen.append(tag)
+        return seen
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # District as stored: a move also invalidates the old district's cache, without a query
+        instance._loaded_district = instance.__dict__.get('district')
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.tags_normalized = self.normalize_tags(self.tags)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'tags' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'tags_normalized'}
+        super().save(*args, **kwargs)
+        self._loaded_district = self.district
+
     def __str__(self):
         return f"{self.name} ({self.status})"
 
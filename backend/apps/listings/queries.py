@@ -0,0 +1,33 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from django.db.models import F, Func, Value
+from .models import Hotspot
+
+class TagOverlapCount(Func):
+    """
+    Number of distinct tags shared by an array column and a list of tags,
+    computed in SQL: cardinality(ARRAY(col INTERSECT tags)).
+    """
+    output_field = models.IntegerField()
+
+    def __init__(self, expression, tags, **extra):
+        tags_value = Value(list(tags), output_field=ArrayField(models.TextField()))
+        super().__init__(expression, tags_value, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        lhs, lhs_params = compiler.compile(self.source_expressions[0])
+        rhs, rhs_params = compiler.compile(self.source_expressions[1])
+        sql = f"cardinality(ARRAY(SELECT unnest({lhs}) INTERSECT SELECT unnest({rhs})))"
+        return sql, (*lhs_params, *rhs_params)
+
+def filter_by_interests(queryset, interests):
+    """
+    Keep hotspots sharing at least one tag with `interests` (GIN-backed && overlap)
+    and annotate `tag_overlap` with the number of shared tags.
+    """
+    interests = Hotspot.normalize_tags(interests)
+    if not interests:
+        return queryset
+    return queryset.filter(tags_normalized__overlap=interests).annotate(
+        tag_overlap=TagOverlapCount(F('tags_normalized'), interests)
+    )
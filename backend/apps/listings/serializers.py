@@ -46,9 +46,11 @@ class PublicSightSerializer(serializers.ModelSerializer):
         )
 
     def get_cover_media_url(self, obj):
-        cover = obj.media.filter(is_cover=True).first()
-        if not cover:
-            cover = obj.media.first()
+        # Prefetched by PublicSightsViewSet; fall back to queries for other callers
+        if hasattr(obj, 'cover_media'):
+            cover = obj.cover_media[0] if obj.cover_media else None
+        else:
+            cover = obj.media.filter(is_cover=True).first() or obj.media.first()
         return cover.file.url if cover else None
 
 # --- Host Serializers ---
@@ -1,6 +1,7 @@
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from .models import Hotspot, ModerationTicket
+from .signals import hotspot_status_changed
 
 class HotspotService:
     @staticmethod
@@ -85,13 +86,16 @@ class HotspotService:
         if hotspot.status != Hotspot.Status.Approved:
             raise ValidationError("Hotspot must be Approved first")
         
+        old_status = hotspot.status
         hotspot.status = Hotspot.Status.Live
         hotspot.save()
+        hotspot_status_changed.send(sender=Hotspot, hotspot=hotspot, old_status=old_status, new_status=hotspot.status)
         return hotspot
 
     @staticmethod
     def suspend(hotspot, moderator, reason):
         """Live -> Suspended"""
+        old_status = hotspot.status
         hotspot.status = Hotspot.Status.Suspended
         
         ModerationTicket.objects.create(
@@ -103,4 +107,5 @@ class HotspotService:
         )
         
         hotspot.save()
+        hotspot_status_changed.send(sender=Hotspot, hotspot=hotspot, old_status=old_status, new_status=hotspot.status)
         return hotspot
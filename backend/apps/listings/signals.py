@@ -0,0 +1,30 @@
+from django.dispatch import Signal
+
+# Sent by HotspotService (and bulk admin actions) on lifecycle transitions.
+# kwargs: hotspot, old_status, new_status
+hotspot_status_changed = Signal()
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from shared.cache import HOTSPOTS, bump_versions_on_commit
+from .models import Hotspot, Media
+
+# Public hotspot responses (sights, discover, districts) are cached per district.
+# Versions are bumped after commit, so a cache miss can't store pre-commit rows.
+
+@receiver(post_save, sender=Hotspot)
+@receiver(post_delete, sender=Hotspot)
+def invalidate_hotspot_cache(sender, instance, **kwargs):
+    bump_versions_on_commit(HOTSPOTS, instance.district)
+    previous = getattr(instance, '_loaded_district', None)
+    if previous and previous != instance.district:
+        bump_versions_on_commit(HOTSPOTS, previous)
+
+@receiver(hotspot_status_changed, sender=Hotspot)
+def invalidate_hotspot_cache_on_status(sender, hotspot, **kwargs):
+    bump_versions_on_commit(HOTSPOTS, hotspot.district)
+
+@receiver(post_save, sender=Media)
+@receiver(post_delete, sender=Media)
+def invalidate_hotspot_cache_on_media(sender, instance, **kwargs):
+    bump_versions_on_commit(HOTSPOTS, instance.hotspot.district)
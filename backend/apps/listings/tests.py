@@ -0,0 +1,215 @@
+import base64
+import json
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from shared.testing import QueryBudgetMixin
+from .models import Hotspot, Media, ModerationTicket
+from .queries import filter_by_interests
+
+User = get_user_model()
+
+class TagSearchTests(TestCase):
+    def setUp(self):
+        self.host = User.objects.create_user(username='taghost', email='taghost@example.com', password='pw')
+        self.tea = self._spot("Tea Garden", ["Tea", " Nature ", "tea"])
+        self.lake = self._spot("Lake", ["nature", "Boating"])
+        self.fort = self._spot("Fort", ["Heritage"])
+
+    def _spot(self, name, tags):
+        return Hotspot.objects.create(host=self.host, name=name, district="East",
+                                      status=Hotspot.Status.Live, duration_minutes=60, tags=tags)
+
+    def test_tags_normalized_on_save(self):
+        self.assertEqual(self.tea.tags_normalized, ["tea", "nature"])
+        self.tea.tags = ["Monastery"]
+        self.tea.save(update_fields=['tags'])
+        self.tea.refresh_from_db()
+        self.assertEqual(self.tea.tags_normalized, ["monastery"])
+
+    def test_long_tags_are_kept(self):
+        # `tags` is free-form JSON: no length limit to overflow on save
+        long_tag = "x" * 300
+        self._spot("Trail", [long_tag.upper()])
+        qs = filter_by_interests(Hotspot.objects.all(), [long_tag])
+        self.assertEqual(dict(qs.values_list('name', 'tag_overlap')), {"Trail": 1})
+
+    def test_overlap_count_in_sql(self):
+        qs = filter_by_interests(Hotspot.objects.all(), ["TEA", "nature", "food"])
+        overlap = dict(qs.values_list('name', 'tag_overlap'))
+        self.assertEqual(overlap, {"Tea Garden": 2, "Lake": 1})
+
+    def test_kiosk_discover_ranks_by_overlap(self):
+        response = APIClient().get('/api/v1/kiosk/discover/', {'interests': 'tea,nature', 'limit': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([h['name'] for h in response.data['results']], ["Tea Garden"])
+        self.assertIsNotNone(response.data['next'])
+
+@override_settings(MEDIA_ROOT='/tmp/safarsetu-test-media')
+class ListingQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Query count must not grow with the number of hotspots returned."""
+    def setUp(self):
+        self.client = APIClient()
+        self.host = User.objects.create_user(username='budgethost', email='budgethost@example.com',
+                                             password='pw', role=User.Role.HOST)
+        self.moderator = User.objects.create_user(username='budgetmod', email='budgetmod@example.com',
+                                                  password='pw', role=User.Role.MODERATOR)
+
+    def _populate(self, n):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_sights(n)
+
+    def _create_sights(self, n):
+        for i in range(n):
+            spot = Hotspot.objects.create(host=self.host, name=f"Sight {i}", district="East",
+                                          status=Hotspot.Status.Live, hotspot_type=Hotspot.HotspotType.Sight)
+            for j in range(2):
+                Media.objects.create(hotspot=spot, type='IMAGE', is_cover=(j == 1),
+                                     file=SimpleUploadedFile(f"m{i}_{j}.jpg", b"x"))
+            ModerationTicket.objects.create(hotspot=spot, reason_code=ModerationTicket.Reason.Quality,
+                                            notes="n", assigned_to=self.moderator)
+
+    def _check_budgets(self):
+        self.assertQueryBudget(2, self.client.get, '/api/v1/listings/hotspots/')
+        self.assertQueryBudget(2, self.client.get, '/api/v1/listings/public/sights/')
+        self.client.force_authenticate(self.host)
+        self.assertQueryBudget(2, self.client.get, '/api/v1/listings/host/hotspots/')
+        self.client.force_authenticate(self.moderator)
+        self.assertQueryBudget(2, self.client.get, '/api/v1/listings/mod/hotspots/')
+        self.assertQueryBudget(1, self.client.get, '/api/v1/listings/mod/tickets/')
+        self.client.force_authenticate(None)
+
+    def test_budget_independent_of_result_size(self):
+        self._populate(2)
+        self._check_budgets()
+        self._populate(8)
+        self._check_budgets()
+
+    def test_sight_cover_prefers_cover_flag(self):
+        self._populate(1)
+        response = self.client.get('/api/v1/listings/public/sights/')
+        self.assertIn('m0_1', response.data['results'][0]['cover_media_url'])
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        host = User.objects.create_user(username='pagehost', email='pagehost@example.com', password='pw')
+        for i in range(25):
+            Hotspot.objects.create(host=host, name=f"Spot {i}", district="East",
+                                   status=Hotspot.Status.Live, hotspot_type=Hotspot.HotspotType.Sight,
+                                   tags=["tea"] if i % 2 else ["tea", "nature"])
+
+    def _walk(self, url, params):
+        client = APIClient()
+        response = client.get(url, params)
+        pages = [response.data['results']]
+        while response.data['next']:
+            response = client.get(response.data['next'])
+            pages.append(response.data['results'])
+        return pages
+
+    def test_public_lists_walk_every_row_once(self):
+        for url in ('/api/v1/listings/hotspots/', '/api/v1/listings/public/sights/'):
+            pages = self._walk(url, {'page_size': 10})
+            self.assertEqual([len(p) for p in pages], [10, 10, 5])
+            ids = [row['id'] for page in pages for row in page]
+            self.assertEqual(len(set(ids)), 25)
+
+    def test_discover_ranked_pages(self):
+        pages = self._walk('/api/v1/kiosk/discover/', {'interests': 'tea,nature', 'limit': 5})
+        names = [row['name'] for page in pages for row in page]
+        self.assertEqual(len(set(names)), 25)
+        # All two-tag matches rank ahead of single-tag matches
+        two_tag = {f"Spot {i}" for i in range(0, 25, 2)}
+        self.assertEqual(set(names[:len(two_tag)]), two_tag)
+
+    def test_keyset_through_ties_without_offset(self):
+        # Every row ties on tag_overlap=1: pages are keyed on (tag_overlap, id)
+        client = APIClient()
+        with CaptureQueriesContext(connection) as queries:
+            pages = self._walk('/api/v1/kiosk/discover/', {'interests': 'tea', 'limit': 5})
+        ids = [row['id'] for page in pages for row in page]
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(len(set(ids)), 25)
+        self.assertFalse([q['sql'] for q in queries if 'OFFSET' in q['sql']])
+
+        first = client.get('/api/v1/listings/hotspots/', {'page_size': 10})
+        second = client.get(first.data['next'])
+        back = client.get(second.data['previous'])
+        self.assertEqual([r['id'] for r in back.data['results']], [r['id'] for r in first.data['results']])
+        self.assertIsNone(back.data['previous'])
+        self.assertEqual(client.get('/api/v1/listings/hotspots/', {'cursor': 'garbage'}).status_code, 404)
+
+    def test_tampered_cursor_values_404(self):
+        client = APIClient()
+        # Right length, wrong values: rejected before any query instead of a 500
+        for position in (["garbage", "x"], [None, None], [{"a": 1}, [1]]):
+            cursor = base64.urlsafe_b64encode(json.dumps({'p': position}).encode()).decode()
+            for url, params in (('/api/v1/listings/hotspots/', {}), ('/api/v1/kiosk/discover/', {'interests': 'tea'})):
+                response = client.get(url, {'cursor': cursor, **params})
+                self.assertEqual(response.status_code, 404, (url, position))
+
+    def test_moderator_queue_filtered_server_side(self):
+        # Older than the first page of recently updated hotspots
+        pending = Hotspot.objects.create(host=User.objects.get(username='pagehost'), name="Pending",
+                                         district="East", status=Hotspot.Status.Pending)
+        Hotspot.objects.filter(pk=pending.pk).update(updated_at=pending.updated_at.replace(year=2000))
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(
+            username='pagemod', email='pagemod@example.com', password='pw', role=User.Role.MODERATOR))
+        response = client.get('/api/v1/listings/mod/hotspots/', {'status': Hotspot.Status.Pending})
+        self.assertEqual([r['id'] for r in response.data['results']], [pending.id])
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PublicCacheInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        host = User.objects.create_user(username='cachehost', email='cachehost@example.com', password='pw')
+        self.spot = Hotspot.objects.create(host=host, name="Rumtek", district="East",
+                                           status=Hotspot.Status.Live, hotspot_type=Hotspot.HotspotType.Sight)
+        self.client = APIClient()
+
+    def _names(self, district):
+        response = self.client.get('/api/v1/listings/public/sights/', {'district': district})
+        return [s['title'] for s in response.data['results']]
+
+    def test_district_move_invalidates_both_districts(self):
+        self.assertEqual(self._names('east'), ["Rumtek"])
+        self.assertEqual(self._names('west'), [])
+        with self.assertNumQueries(0):
+            self._names('east')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.spot.district = "West"
+            self.spot.save()
+        self.assertEqual(self._names('east'), [])
+        self.assertEqual(self._names('west'), ["Rumtek"])
+
+    def test_district_move_needs_no_extra_query(self):
+        spot = Hotspot.objects.get(pk=self.spot.pk)
+        spot.district = "West"
+        with self.assertNumQueries(1):  # the UPDATE; the old district was kept from loading
+            spot.save()
+
+    def test_bump_waits_for_commit(self):
+        self._names('east')
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.spot.district = "West"
+            self.spot.save()
+            # Not committed yet: a concurrent miss must not cache this under a new version
+            with self.assertNumQueries(0):
+                self.assertEqual(self._names('east'), ["Rumtek"])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self._names('east'), [])
+
+    def test_district_list_follows_hotspot_writes(self):
+        client = APIClient()
+        self.assertEqual(client.get('/api/public/districts/').data, [{"district_id": "East", "name": "East"}])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.spot.status = Hotspot.Status.Suspended
+            self.spot.save()
+        self.assertEqual(client.get('/api/public/districts/').data, [])
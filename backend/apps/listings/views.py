@@ -1,13 +1,16 @@
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Hotspot, ModerationTicket
+from django.db.models import Prefetch
+from .models import Hotspot, Media, ModerationTicket
 from .serializers import (
     HotspotPublicSerializer, HotspotHostSerializer, HotspotCreateSerializer,
     HotspotModeratorSerializer, ModerationTicketSerializer
 )
 from .services import HotspotService
 from rbac.permissions import IsHost, IsModerator, IsTraveler
+from shared.cache import HOTSPOTS, cached_public_response
+from shared.pagination import UpdatedCursorPagination, CreatedCursorPagination
 
 # --- Public API (Kiosk/Traveler) ---
 class HotspotPublicViewSet(viewsets.ReadOnlyModelViewSet):
@@ -18,6 +21,7 @@ class HotspotPublicViewSet(viewsets.ReadOnlyModelViewSet):
     """
     serializer_class = HotspotPublicSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = UpdatedCursorPagination
     filter_backends = [filters.SearchFilter]
     search_fields = ['name', 'district', 'description', 'tags']
 
@@ -26,7 +30,7 @@ class HotspotPublicViewSet(viewsets.ReadOnlyModelViewSet):
         qs = Hotspot.objects.filter(status=Hotspot.Status.Live)
         # Exclude Restricted sensitivity
         qs = qs.exclude(sensitivity_level=Hotspot.Sensitivity.Restricted)
-        return qs
+        return qs.select_related('host').prefetch_related('media')
 
 # --- Host API ---
 class HotspotHostViewSet(viewsets.ModelViewSet):
@@ -41,7 +45,7 @@ class HotspotHostViewSet(viewsets.ModelViewSet):
     search_fields = ['name']
 
     def get_queryset(self):
-        return Hotspot.objects.filter(host=self.request.user)
+        return Hotspot.objects.filter(host=self.request.user).prefetch_related('media')
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
@@ -100,12 +104,17 @@ class HotspotModeratorViewSet(viewsets.ReadOnlyModelViewSet):
     """
     permission_classes = [permissions.IsAuthenticated, IsModerator]
     serializer_class = HotspotModeratorSerializer
+    pagination_class = UpdatedCursorPagination
     filter_backends = [filters.SearchFilter]
     search_fields = ['name', 'host__username']
 
     def get_queryset(self):
-        # Mods see everything
-        return Hotspot.objects.all().order_by('-updated_at')
+        # Mods see everything; ?status=UNDER_REVIEW narrows to the review queue
+        qs = Hotspot.objects.select_related('host').prefetch_related('media').order_by('-updated_at')
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            qs = qs.filter(status=status_filter)
+        return qs
 
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
@@ -138,9 +147,10 @@ class HotspotModeratorViewSet(viewsets.ReadOnlyModelViewSet):
 class ModerationTicketViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsModerator]
     serializer_class = ModerationTicketSerializer
+    pagination_class = CreatedCursorPagination
     
     def get_queryset(self):
-        return ModerationTicket.objects.all().order_by('-created_at')
+        return ModerationTicket.objects.select_related('hotspot', 'assigned_to').order_by('-created_at')
 
     def perform_create(self, serializer):
         serializer.save(assigned_to=self.request.user)
@@ -159,12 +169,23 @@ class PublicSightsViewSet(viewsets.ReadOnlyModelViewSet):
     from .serializers import PublicSightSerializer
     serializer_class = PublicSightSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = UpdatedCursorPagination
+
+    @cached_public_response(HOTSPOTS, district_params=('district',))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_queryset(self):
         qs = Hotspot.objects.filter(
             status=Hotspot.Status.Live,
             hotspot_type=Hotspot.HotspotType.Sight,
         ).exclude(sensitivity_level=Hotspot.Sensitivity.Restricted)
+        # Cover image in one query for the whole page: prefer is_cover, else first media
+        qs = qs.prefetch_related(Prefetch(
+            'media',
+            queryset=Media.objects.order_by('-is_cover', 'id')[:1],
+            to_attr='cover_media'
+        ))
 
         district = self.request.query_params.get('district_id') # Assuming internal use, or name
         # Often district might be passed as name if ID not enforced, but let's assume filtering by name for now per model
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from typing import Optional, Set
+from django.conf import settings
+from .models import KioskEvent
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    __slots__ = ('district', 'queue', 'overflowed')
+
+    def __init__(self, district: str, maxsize: int):
+        self.district = (district or '').lower()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def wants(self, event: KioskEvent) -> bool:
+        return not self.district or not event.district_id or event.district_id.lower() == self.district
+
+class EventHub:
+    """
+    Per-process fan-out for the kiosk SSE stream.
+    - One poller per process reads new KioskEvent rows (`id > last seen`),
+      however many kiosks are connected, and copies them into subscriber queues.
+    - A subscriber that falls `REALTIME_SUBSCRIBER_QUEUE` events behind is dropped;
+      its stream ends and the client resumes from the log with Last-Event-ID.
+    - The poller stops when the last subscriber leaves.
+    """
+    batch_size = 500
+
+    def __init__(self):
+        self._subscribers: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_id: Optional[int] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(self, district: str) -> Subscription:
+        """
+        Join the fan-out. Returns once the poller's start position is fixed, so a
+        replay queried afterwards overlaps live delivery instead of leaving a gap.
+        """
+        subscription = Subscription(district, getattr(settings, 'REALTIME_SUBSCRIBER_QUEUE', 100))
+        if self._last_id is None:
+            latest = await KioskEvent.objects.order_by('-id').values_list('id', flat=True).afirst()
+            if self._last_id is None:  # another subscriber may have seeded it meanwhile
+                self._last_id = latest or 0
+        self._subscribers.add(subscription)
+        self._ensure_running()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        interval = getattr(settings, 'REALTIME_POLL_INTERVAL', 1.0)
+        try:
+            while self._subscribers:
+                try:
+                    events = [
+                        event async for event in
+                        KioskEvent.objects.filter(id__gt=self._last_id).order_by('id')[:self.batch_size]
+                    ]
+                except Exception:
+                    logger.exception("Kiosk event poll failed")
+                    events = []
+                if events:
+                    self._last_id = events[-1].id
+                    self.dispatch(events)
+                if len(events) < self.batch_size:
+                    await asyncio.sleep(interval)
+        finally:
+            # Next subscriber starts from "now", not from where this poller stopped
+            self._last_id = None
+
+    def dispatch(self, events):
+        for subscription in list(self._subscribers):
+            for event in events:
+                if not subscription.wants(event):
+                    continue
+                try:
+                    subscription.queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    subscription.overflowed = True
+                    self._subscribers.discard(subscription)
+                    break
+
+event_hub = EventHub()
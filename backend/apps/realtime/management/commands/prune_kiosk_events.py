@@ -0,0 +1,17 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from realtime.models import KioskEvent
+
+class Command(BaseCommand):
+    help = 'Deletes kiosk push events older than the replay retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=settings.REALTIME_EVENT_RETENTION_HOURS,
+                            help='Keep events newer than this many hours')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        deleted, _ = KioskEvent.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} kiosk events older than {options['hours']}h"))
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:19
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="KioskEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("broadcast", "Broadcast"),
+                            ("restriction", "Restriction"),
+                            ("crowd", "Crowd State"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "district_id",
+                    models.CharField(
+                        blank=True,
+                        help_text="Null/blank for global",
+                        max_length=50,
+                        null=True,
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["created_at"], name="kioskevent_created")
+                ],
+            },
+        ),
+    ]
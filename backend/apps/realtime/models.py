@@ -0,0 +1,36 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+class KioskEventQuerySet(models.QuerySet):
+    def for_district(self, district):
+        """Events for one district plus global ones (blank district). No district = everything."""
+        if not district:
+            return self
+        return self.filter(Q(district_id__iexact=district) | Q(district_id='') | Q(district_id__isnull=True))
+
+class KioskEvent(models.Model):
+    """
+    Append-only log behind the kiosk SSE stream.
+    The auto-increment id is the SSE event id, so clients resume with Last-Event-ID.
+    """
+    class Kind(models.TextChoices):
+        BROADCAST = 'broadcast', 'Broadcast'
+        RESTRICTION = 'restriction', 'Restriction'
+        CROWD = 'crowd', 'Crowd State'
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    district_id = models.CharField(max_length=50, null=True, blank=True, help_text="Null/blank for global")
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = KioskEventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='kioskevent_created'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.kind} ({self.district_id or 'global'})"
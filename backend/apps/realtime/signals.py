@@ -0,0 +1,56 @@
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from broadcasts.models import BroadcastMessage
+from broadcasts.serializers import BroadcastMessageSerializer
+from safety.models import DistrictRestriction
+from safety.serializers import DistrictRestrictionSerializer
+from safety.signals import crowd_state_changed
+from .models import KioskEvent
+
+# Arbitrary constant for pg_advisory_xact_lock
+EVENT_LOCK_KEY = 0x4B494F53
+
+def publish(*events):
+    """
+    Write events once the change that caused them commits. Each write is a
+    short transaction serialized by an advisory lock, so ids are assigned in
+    commit order: a reader that has seen id N has seen every event below it,
+    and the hub poller and Last-Event-ID resume can keep a bare high-water id.
+    (Writing inside the caller's transaction lets a lower id commit after a
+    higher one was already streamed, and that event would never be sent.)
+    """
+    def write():
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_xact_lock(%s)', [EVENT_LOCK_KEY])
+            KioskEvent.objects.bulk_create(events)
+    transaction.on_commit(write)
+
+@receiver(post_save, sender=BroadcastMessage)
+def record_broadcast(sender, instance, **kwargs):
+    payload = dict(BroadcastMessageSerializer(instance).data, action='upsert')
+    publish(KioskEvent(kind=KioskEvent.Kind.BROADCAST, district_id=instance.district_id, payload=payload))
+
+@receiver(post_delete, sender=BroadcastMessage)
+def record_broadcast_removed(sender, instance, **kwargs):
+    payload = {'id': str(instance.pk), 'district_id': instance.district_id, 'action': 'removed'}
+    publish(KioskEvent(kind=KioskEvent.Kind.BROADCAST, district_id=instance.district_id, payload=payload))
+
+@receiver(post_save, sender=DistrictRestriction)
+def record_restriction(sender, instance, **kwargs):
+    payload = dict(DistrictRestrictionSerializer(instance).data, action='upsert')
+    publish(KioskEvent(kind=KioskEvent.Kind.RESTRICTION, district_id=instance.district_id, payload=payload))
+
+@receiver(post_delete, sender=DistrictRestriction)
+def record_restriction_removed(sender, instance, **kwargs):
+    payload = {'id': str(instance.pk), 'district_id': instance.district_id, 'action': 'removed'}
+    publish(KioskEvent(kind=KioskEvent.Kind.RESTRICTION, district_id=instance.district_id, payload=payload))
+
+@receiver(crowd_state_changed)
+def record_crowd_transitions(sender, transitions, **kwargs):
+    publish(*[
+        KioskEvent(kind=KioskEvent.Kind.CROWD, district_id=t.district_id, payload=t._asdict())
+        for t in transitions
+    ])
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+from datetime import timedelta
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from broadcasts.models import BroadcastMessage
+from safety.models import CrowdAggregate, CurrentCrowdState
+from .hub import EventHub, Subscription, event_hub
+from .models import KioskEvent
+
+class KioskEventRecordingTests(TestCase):
+    def test_broadcast_lifecycle_is_logged(self):
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            msg = BroadcastMessage.objects.create(district_id='east', category='ROUTE_CLOSURE', title='Landslide',
+                                                  message='NH10 closed', severity='CRITICAL',
+                                                  start_at=now, end_at=now + timedelta(hours=4))
+        with self.captureOnCommitCallbacks(execute=True):
+            msg.delete()
+        events = list(KioskEvent.objects.order_by('id'))
+        self.assertEqual([(e.kind, e.payload['action']) for e in events],
+                         [('broadcast', 'upsert'), ('broadcast', 'removed')])
+        self.assertEqual(events[0].payload['title'], 'Landslide')
+
+    def test_crowd_transitions_only(self):
+        now = timezone.now()
+        for minutes, state in [(0, 'LOW'), (5, 'LOW'), (10, 'HIGH')]:
+            agg = CrowdAggregate.objects.create(district_id='east', hotspot_id='7', density_state=state,
+                                                timestamp=now + timedelta(minutes=minutes))
+            with self.captureOnCommitCallbacks(execute=True):
+                CurrentCrowdState.objects.upsert_from([agg])
+        payloads = [e.payload for e in KioskEvent.objects.filter(kind='crowd').order_by('id')]
+        self.assertEqual([(p['old_state'], p['new_state']) for p in payloads], [(None, 'LOW'), ('LOW', 'HIGH')])
+
+class KioskEventCommitOrderTests(TransactionTestCase):
+    def _broadcast(self, title):
+        now = timezone.now()
+        BroadcastMessage.objects.create(district_id='east', category='ROUTE_CLOSURE', title=title,
+                                        message='-', severity='INFO', start_at=now, end_at=now + timedelta(hours=1))
+
+    def test_ids_follow_commit_order(self):
+        def concurrent_writer():
+            try:
+                self._broadcast('second')
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            self._broadcast('first')  # commits last
+            writer = threading.Thread(target=concurrent_writer)
+            writer.start()
+            writer.join()
+            seen = list(KioskEvent.objects.values_list('id', flat=True))
+        self.assertEqual(len(seen), 1)  # only the committed change is visible to readers
+
+        events = list(KioskEvent.objects.order_by('id'))
+        self.assertEqual([e.payload['title'] for e in events], ['second', 'first'])
+        # A reader that stopped at the first committed id still finds the later commit
+        self.assertEqual([e.payload['title'] for e in KioskEvent.objects.filter(id__gt=seen[0])], ['first'])
+
+class EventHubDispatchTests(SimpleTestCase):
+    def test_district_filter_and_overflow(self):
+        hub = EventHub()
+        east, west = Subscription('East', 2), Subscription('west', 10)
+        hub._subscribers.update({east, west})
+        events = [KioskEvent(id=i, kind='crowd', district_id=d, payload={})
+                  for i, d in enumerate(['east', None, 'west', 'east'], start=1)]
+        hub.dispatch(events)
+
+        self.assertEqual([e.id for e in list(west.queue._queue)], [2, 3])
+        self.assertTrue(east.overflowed)
+        self.assertEqual(hub.subscriber_count, 1)
+
+@override_settings(REALTIME_POLL_INTERVAL=0.01, REALTIME_HEARTBEAT_SECONDS=1)
+class KioskEventStreamTests(TestCase):
+    url = '/api/v1/realtime/kiosk/events'
+
+    async def _read_events(self, response, count):
+        chunks = []
+        stream = response.streaming_content
+        for _ in range(count + 5):  # a few keepalives at most
+            if len(chunks) == count:
+                break
+            chunk = await asyncio.wait_for(anext(stream), timeout=5)
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if chunk.startswith('id:'):
+                chunks.append(chunk)
+        return chunks
+
+    async def _finish(self):
+        event_hub._subscribers.clear()
+        await asyncio.sleep(0.05)  # let the poller notice and exit
+
+    async def test_event_between_subscribe_and_replay_is_delivered(self):
+        hub = EventHub()
+        subscription = await hub.subscribe('')
+        # Committed after subscribe() returned, before the poller's first query
+        event = await KioskEvent.objects.acreate(kind='broadcast', district_id='east', payload={})
+        try:
+            delivered = await asyncio.wait_for(subscription.queue.get(), timeout=5)
+            self.assertEqual(delivered.id, event.id)
+        finally:
+            hub._subscribers.clear()
+            await asyncio.sleep(0.05)
+
+    async def test_replay_then_live(self):
+        first = await KioskEvent.objects.acreate(kind='broadcast', district_id='east', payload={'n': 1})
+        await KioskEvent.objects.acreate(kind='broadcast', district_id='west', payload={'n': 2})
+        await KioskEvent.objects.acreate(kind='broadcast', district_id='', payload={'n': 3})
+
+        response = await self.async_client.get(self.url, {'district_id': 'east'},
+                                               headers={'Last-Event-ID': str(first.id - 1)})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        replayed = await self._read_events(response, 2)
+        self.assertIn('data: {"n":1}', replayed[0])
+        self.assertIn('data: {"n":3}', replayed[1])
+
+        live = await KioskEvent.objects.acreate(kind='crowd', district_id='EAST', payload={'n': 4})
+        [pushed] = await self._read_events(response, 1)
+        self.assertTrue(pushed.startswith(f"id: {live.id}\nevent: crowd\n"))
+        await self._finish()
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import kiosk_event_stream
+
+urlpatterns = [
+    path('kiosk/events', kiosk_event_stream, name='kiosk-event-stream'),
+]
@@ -0,0 +1,75 @@
+import asyncio
+import json
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from .hub import event_hub
+from .models import KioskEvent
+
+def format_event(event: KioskEvent) -> str:
+    data = json.dumps(event.payload, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f"id: {event.id}\nevent: {event.kind}\ndata: {data}\n\n"
+
+def parse_last_event_id(request):
+    raw = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+async def event_stream(district, last_event_id):
+    """
+    SSE body: replay from the log after `last_event_id`, then live events from the hub.
+    Subscribes before replaying so nothing written in between is missed.
+    """
+    subscription = await event_hub.subscribe(district)
+    heartbeat = getattr(settings, 'REALTIME_HEARTBEAT_SECONDS', 15)
+    replay_limit = getattr(settings, 'REALTIME_REPLAY_LIMIT', 500)
+    try:
+        yield f"retry: {getattr(settings, 'REALTIME_RETRY_MS', 3000)}\n\n"
+
+        sent = last_event_id or 0
+        if last_event_id is not None:
+            backlog = [
+                event async for event in
+                KioskEvent.objects.for_district(district).filter(id__gt=last_event_id).order_by('id')[:replay_limit + 1]
+            ]
+            if len(backlog) > replay_limit:
+                # Too far behind to replay: tell the client to refetch the REST endpoints
+                latest = await KioskEvent.objects.order_by('-id').values_list('id', flat=True).afirst()
+                sent = latest or 0
+                yield f"id: {sent}\nevent: reset\ndata: {{}}\n\n"
+            else:
+                for event in backlog:
+                    sent = event.id
+                    yield format_event(event)
+
+        while not (subscription.overflowed and subscription.queue.empty()):
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event.id <= sent:
+                continue  # already delivered by the replay
+            sent = event.id
+            yield format_event(event)
+    finally:
+        event_hub.unsubscribe(subscription)
+
+@require_GET
+async def kiosk_event_stream(request):
+    """
+    GET /api/v1/realtime/kiosk/events?district_id=east
+    Server-Sent Events: `broadcast`, `restriction` and `crowd` events for the
+    district (plus global ones). Serve under ASGI (config.asgi).
+    """
+    district = request.GET.get('district_id', '')
+    response = StreamingHttpResponse(
+        event_stream(district, parse_last_event_id(request)),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: flush each event immediately
+    return response
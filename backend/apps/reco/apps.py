@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class RecoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reco'
+
+    def ready(self):
+        from . import signals  # noqa: F401 (connects snapshot invalidation)
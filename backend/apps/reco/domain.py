@@ -22,7 +22,7 @@ class RecoInput:
             district=query_params.get('district', '')
         )
 
-@dataclass
+@dataclass(slots=True)
 class HotspotCandidate:
     id: int
     name: str
@@ -1,31 +1,93 @@
+from datetime import timedelta
 from typing import List, Dict
+from django.conf import settings
 from django.db.models import Q
+from django.utils import timezone
 from listings.models import Hotspot
+from safety.models import CrowdAggregate, CurrentCrowdState
 from .domain import HotspotCandidate, CrowdState
 from .interfaces import HotspotRepository, CrowdAdapter
+from .scoring import CandidateBatch
+from .snapshot import candidate_snapshots
 
 class DjangoHotspotRepository(HotspotRepository):
-    def get_candidates(self, district: str) -> List[HotspotCandidate]:
-        # Fetch LIVE hotspots in the district
-        qs = Hotspot.objects.filter(
+    def _live_in(self, district: str):
+        # LIVE hotspots in the district
+        return Hotspot.objects.filter(
             district__iexact=district,
             status=Hotspot.Status.Live
         )
-        
-        candidates = []
-        for h in qs:
-            candidates.append(HotspotCandidate(
-                id=h.id,
-                name=h.name,
-                description=h.description,
-                district=h.district,
-                tags=h.tags or [],
-                duration_minutes=h.duration_minutes or 60, # Default 1 hour
-                operating_hours=h.operating_hours
-            ))
-        return candidates
+
+    @staticmethod
+    def _to_candidate(h: Hotspot) -> HotspotCandidate:
+        return HotspotCandidate(
+            id=h.id,
+            name=h.name,
+            description=h.description,
+            district=h.district,
+            tags=h.tags or [],
+            duration_minutes=h.duration_minutes or 60, # Default 1 hour
+            operating_hours=h.operating_hours
+        )
+
+    def get_candidates(self, district: str) -> List[HotspotCandidate]:
+        return [self._to_candidate(h) for h in self._live_in(district)]
+
+    async def aget_candidates(self, district: str) -> List[HotspotCandidate]:
+        return [self._to_candidate(h) async for h in self._live_in(district)]
+
+    def get_batch(self, district: str) -> CandidateBatch:
+        # Served from the per-process snapshot; rebuilt only after a hotspot change
+        return candidate_snapshots.get(district, self.get_candidates)
+
+    async def aget_batch(self, district: str) -> CandidateBatch:
+        return await candidate_snapshots.aget(district, self.aget_candidates)
 
 class StubCrowdAdapter(CrowdAdapter):
     def get_crowd_levels(self, hotspot_ids: List[int]) -> Dict[int, CrowdState]:
         # Fallback: Assume UNKNOWN for all
         return {hid: CrowdState.UNKNOWN for hid in hotspot_ids}
+
+class CrowdAggregateAdapter(CrowdAdapter):
+    """
+    Crowd levels from safety.CurrentCrowdState (latest aggregate per hotspot).
+    - One query per call on the hotspot_id index, regardless of candidate count or history size.
+    - Readings older than `staleness` are ignored (-> UNKNOWN).
+    """
+    STATE_MAP = {
+        CrowdAggregate.DensityState.LOW: CrowdState.LOW,
+        CrowdAggregate.DensityState.MEDIUM: CrowdState.MODERATE,
+        CrowdAggregate.DensityState.HIGH: CrowdState.HIGH,
+    }
+
+    def __init__(self, staleness: timedelta = None):
+        if staleness is None:
+            staleness = timedelta(seconds=getattr(settings, 'RECO_CROWD_STALENESS_SECONDS', 1800))
+        self.staleness = staleness
+
+    def _latest(self, by_key: Dict[str, int]):
+        return CurrentCrowdState.objects.filter(
+            hotspot_id__in=list(by_key),
+            timestamp__gte=timezone.now() - self.staleness
+        ).values_list('hotspot_id', 'density_state')
+
+    def get_crowd_levels(self, hotspot_ids: List[int]) -> Dict[int, CrowdState]:
+        levels = {hid: CrowdState.UNKNOWN for hid in hotspot_ids}
+        if not hotspot_ids:
+            return levels
+
+        # CrowdAggregate.hotspot_id is a CharField
+        by_key = {str(hid): hid for hid in hotspot_ids}
+        for key, density in self._latest(by_key):
+            levels[by_key[key]] = self.STATE_MAP.get(density, CrowdState.UNKNOWN)
+        return levels
+
+    async def aget_crowd_levels(self, hotspot_ids: List[int]) -> Dict[int, CrowdState]:
+        levels = {hid: CrowdState.UNKNOWN for hid in hotspot_ids}
+        if not hotspot_ids:
+            return levels
+
+        by_key = {str(hid): hid for hid in hotspot_ids}
+        async for key, density in self._latest(by_key):
+            levels[by_key[key]] = self.STATE_MAP.get(density, CrowdState.UNKNOWN)
+        return levels
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict
+from asgiref.sync import sync_to_async
 from .domain import HotspotCandidate, CrowdState
 
 class HotspotRepository(ABC):
@@ -7,11 +8,23 @@ class HotspotRepository(ABC):
     def get_candidates(self, district: str) -> List[HotspotCandidate]:
         pass
 
+    def get_batch(self, district: str):
+        """Columnar candidates for batch scoring. Override to serve from a cache."""
+        from .scoring import CandidateBatch
+        return CandidateBatch.from_candidates(self.get_candidates(district))
+
+    async def aget_batch(self, district: str):
+        """Async variant. Override to use the async ORM."""
+        return await sync_to_async(self.get_batch)(district)
+
 class CrowdAdapter(ABC):
     @abstractmethod
     def get_crowd_levels(self, hotspot_ids: List[int]) -> Dict[int, CrowdState]:
         pass
 
+    async def aget_crowd_levels(self, hotspot_ids: List[int]) -> Dict[int, CrowdState]:
+        return await sync_to_async(self.get_crowd_levels)(hotspot_ids)
+
 class RecoSettings(ABC):
     @abstractmethod
     def get_weights(self) -> Dict[str, float]:
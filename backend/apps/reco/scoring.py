@@ -1,8 +1,28 @@
 import random
 import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict
+import numpy as np
 from .domain import RecoInput, ScoredRecommendation, HotspotCandidate, CrowdState
 
+# Columnar encoding of CrowdState used by the batch path.
+# Index into CROWD_PENALTIES gives the penalty for each code.
+CROWD_CODES = {
+    CrowdState.LOW: 0,
+    CrowdState.MODERATE: 1,
+    CrowdState.HIGH: 2,
+    CrowdState.UNKNOWN: 3,
+}
+CROWD_STATES = [CrowdState.LOW, CrowdState.MODERATE, CrowdState.HIGH, CrowdState.UNKNOWN]
+CROWD_PENALTIES = np.array([1.0, 0.7, 0.2, 1.0])
+
+@lru_cache(maxsize=65536)
+def rotation_value(hotspot_id) -> float:
+    """Stable pseudo-random value in [0, 1) for a hotspot id (memoized, hashes once per id)."""
+    h = hashlib.md5(str(hotspot_id).encode()).hexdigest()
+    return (int(h, 16) % 100) / 100.0
+
 class BaseScorer:
     def name(self) -> str:
         return self.__class__.__name__
@@ -44,9 +64,97 @@ class FairRotationScorer(BaseScorer):
     def score(self, candidate: HotspotCandidate) -> float:
         # Deterministic "random" based on ID and day (mocking day variance with just ID for now)
         # In real prod, could act on date.
-        h = hashlib.md5(str(candidate.id).encode()).hexdigest()
-        val = int(h, 16) % 100
-        return val / 100.0
+        return rotation_value(candidate.id)
+
+@dataclass
+class CandidateBatch:
+    """
+    Columnar view of a candidate list for batch scoring.
+    Row i of every array describes candidates[i].
+    - tag_bits: (n, words) uint64 bitsets over tag_index (lowercased tags).
+    """
+    candidates: List[HotspotCandidate]
+    ids: np.ndarray
+    durations: np.ndarray
+    tag_bits: np.ndarray
+    tag_index: Dict[str, int]
+    rotation: np.ndarray
+
+    def __len__(self):
+        return len(self.candidates)
+
+    @classmethod
+    def from_candidates(cls, candidates: List[HotspotCandidate]) -> 'CandidateBatch':
+        tag_index: Dict[str, int] = {}
+        for c in candidates:
+            for t in c.tags:
+                tag_index.setdefault(t.lower(), len(tag_index))
+
+        n = len(candidates)
+        words = max(1, (len(tag_index) + 63) // 64)
+        tag_bits = np.zeros((n, words), dtype=np.uint64)
+        for row, c in enumerate(candidates):
+            for t in c.tags:
+                idx = tag_index[t.lower()]
+                tag_bits[row, idx // 64] |= np.uint64(1 << (idx % 64))
+
+        return cls(
+            candidates=candidates,
+            ids=np.array([c.id for c in candidates], dtype=np.int64),
+            durations=np.array([c.duration_minutes for c in candidates], dtype=np.int64),
+            tag_bits=tag_bits,
+            tag_index=tag_index,
+            rotation=np.array([rotation_value(c.id) for c in candidates], dtype=np.float64),
+        )
+
+    def crowd_codes(self, crowd_map: Dict[int, CrowdState]) -> np.ndarray:
+        """Encode a crowd map as an int8 column aligned with the batch (missing -> UNKNOWN)."""
+        unknown = CROWD_CODES[CrowdState.UNKNOWN]
+        return np.array(
+            [CROWD_CODES.get(crowd_map.get(c.id), unknown) for c in self.candidates],
+            dtype=np.int8
+        )
+
+@dataclass
+class BatchScores:
+    """Per-candidate score columns produced by ScoringEngine.calculate_batch."""
+    batch: CandidateBatch
+    crowd_codes: np.ndarray
+    time_feasibility: np.ndarray
+    interest_match: np.ndarray
+    crowd_penalty: np.ndarray
+    fair_rotation: np.ndarray
+    score: np.ndarray
+
+    def breakdown(self, i: int) -> Dict[str, float]:
+        return {
+            "time_feasibility": float(self.time_feasibility[i]),
+            "interest_match": float(self.interest_match[i]),
+            "crowd_penalty": float(self.crowd_penalty[i]),
+            "fair_rotation": float(self.fair_rotation[i])
+        }
+
+    def explanation(self, i: int) -> str:
+        if self.time_feasibility[i] == 0:
+            return "Exceeds available time."
+        if self.interest_match[i] > 0.8:
+            return "Great match for your interests."
+        return "Fits your time."
+
+    def to_recommendation(self, i: int) -> ScoredRecommendation:
+        return ScoredRecommendation(
+            hotspot=self.batch.candidates[i],
+            score=float(self.score[i]),
+            score_breakdown=self.breakdown(i),
+            explanation=self.explanation(i),
+            crowd_state=CROWD_STATES[self.crowd_codes[i]]
+        )
+
+    def ranked(self, min_score: float = 0.0) -> List[ScoredRecommendation]:
+        """Recommendations scoring above min_score, best first (ties keep input order)."""
+        keep = np.flatnonzero(self.score > min_score)
+        order = keep[np.argsort(-self.score[keep], kind='stable')]
+        return [self.to_recommendation(i) for i in order]
 
 class ScoringEngine:
     def __init__(self):
@@ -89,3 +197,50 @@ class ScoringEngine:
             explanation=explanation,
             crowd_state=crowd_state
         )
+
+    def calculate_batch(self, batch: CandidateBatch, input_data: RecoInput, crowd_codes: np.ndarray) -> BatchScores:
+        """
+        Vectorized equivalent of calculate() over a whole CandidateBatch.
+        Same weights and rules; no per-candidate Python work.
+        """
+        n = len(batch)
+
+        # Time feasibility (hard constraint)
+        if input_data.available_time <= 0:
+            s_time = np.ones(n)
+        else:
+            s_time = (batch.durations <= input_data.available_time).astype(np.float64)
+
+        # Interest match: count user interests present in each candidate's tag bitset
+        user_interests = [t.lower() for t in input_data.interest_tags]
+        if not user_interests:
+            s_interest = np.full(n, 0.5)
+        else:
+            known = [batch.tag_index[t] for t in user_interests if t in batch.tag_index]
+            if known:
+                idx = np.array(known, dtype=np.int64)
+                words = batch.tag_bits[:, idx // 64]
+                bits = (words >> (idx % 64).astype(np.uint64)) & np.uint64(1)
+                matches = bits.sum(axis=1).astype(np.float64)
+            else:
+                matches = np.zeros(n)
+            s_interest = np.minimum(1.0, matches / len(user_interests))
+            # Untagged candidates never match
+            s_interest[~batch.tag_bits.any(axis=1)] = 0.0
+
+        s_crowd = CROWD_PENALTIES[crowd_codes]
+        s_rotation = batch.rotation
+
+        # Interest: 40%, Crowd: 30%, Rotation: 30%; time is a multiplier
+        base_score = (s_interest * 0.4) + (s_crowd * 0.3) + (s_rotation * 0.3)
+        final_score = np.round(base_score * s_time, 2)
+
+        return BatchScores(
+            batch=batch,
+            crowd_codes=crowd_codes,
+            time_feasibility=s_time,
+            interest_match=s_interest,
+            crowd_penalty=s_crowd,
+            fair_rotation=s_rotation,
+            score=final_score
+        )
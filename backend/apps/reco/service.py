@@ -1,12 +1,27 @@
 from typing import List, Optional
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from shared.contracts.kiosk_discovery import DiscoveryRequest, DiscoveryResult, TransportHubOption
+from features.services import ais_feature_enabled, is_feature_enabled
 from listings.models import Hotspot
-from django.db.models import Q
-from .domain import RecoInput, ScoredRecommendation
-from .infrastructure import DjangoHotspotRepository, StubCrowdAdapter
+from django.db.models import Q, F, Case, When, Value, IntegerField
+from listings.queries import TagOverlapCount
+from .domain import CrowdState, RecoInput, ScoredRecommendation
+from .infrastructure import DjangoHotspotRepository, CrowdAggregateAdapter
 from .scoring import ScoringEngine
 
+KIOSK_TOP_K = 6
+
+# FeatureFlag name; roll out per district with enabled_districts
+RECO_ENGINE_FLAG = 'reco_engine'
+
+# Columns read when mapping a Hotspot to DiscoveryResult
+DISCOVERY_FIELDS = (
+    'id', 'name', 'short_description', 'district', 'village_cluster_label',
+    'duration_minutes', 'distance_band', 'approx_travel_time_min',
+    'nearest_transport_hub_name', 'nearest_transport_hub_type', 'safety_notes',
+)
+
 def get_kiosk_recommendations(request: DiscoveryRequest) -> List[DiscoveryResult]:
     """
     Deterministic recommendation engine for Kiosk Discovery.
@@ -14,7 +29,7 @@ def get_kiosk_recommendations(request: DiscoveryRequest) -> List[DiscoveryResult
     - District (exact match)
     - Available Time (duration <= available)
     - Status (Live/Approved public safe)
-    RANKING:
+    RANKING (computed in SQL, top KIOSK_TOP_K only):
     - Interest Tags overlap
     """
     
@@ -40,33 +55,19 @@ def get_kiosk_recommendations(request: DiscoveryRequest) -> List[DiscoveryResult
     if request.available_time:
         query = query.filter(Q(duration_minutes__lte=request.available_time) | Q(duration_minutes__isnull=True))
 
-    # Fetch candidates
-    candidates = list(query.all())
-    
-    # 3. Scoring (In-Memory for Pilot)
-    scored_candidates = []
-    
-    user_interests = set(t.lower() for t in request.interest_tags)
-    
-    for spot in candidates:
-        score = 0
-        
-        # Interest Match
-        spot_tags = set(t.lower() for t in spot.tags)
-        overlap = user_interests.intersection(spot_tags)
-        score += len(overlap) * 10
-        
-        # Penalty if duration is unknown (risky)
-        if spot.duration_minutes is None:
-            score -= 5
-            
-        scored_candidates.append((score, spot))
-        
-    # Sort by Score DESC
-    scored_candidates.sort(key=lambda x: x[0], reverse=True)
-    
-    # Take top 6
-    top_picks = [x[1] for x in scored_candidates[:6]]
+    # 3. Scoring (pushed down to SQL): +10 per matching interest, -5 if duration unknown
+    user_interests = Hotspot.normalize_tags(request.interest_tags)
+    overlap = TagOverlapCount(F('tags_normalized'), user_interests) if user_interests else Value(0)
+    query = query.annotate(
+        rank_score=overlap * 10 - Case(
+            When(duration_minutes__isnull=True, then=Value(5)),
+            default=Value(0),
+            output_field=IntegerField()
+        )
+    )
+
+    # Take top N, fetching only the columns the DTO needs
+    top_picks = query.only(*DISCOVERY_FIELDS).order_by('-rank_score', 'id')[:KIOSK_TOP_K]
     
     # Map to DTO
     results = []
@@ -100,35 +101,40 @@ def get_kiosk_recommendations(request: DiscoveryRequest) -> List[DiscoveryResult
 class RecommendationService:
     def __init__(self):
         self.repo = DjangoHotspotRepository()
-        self.crowd_adapter = StubCrowdAdapter()
+        self.crowd_adapter = CrowdAggregateAdapter()
         self.scorer = ScoringEngine()
         
     def get_recommendations(self, input_data: RecoInput) -> List[ScoredRecommendation]:
-        # 1. Feature Flag Check
-        if not getattr(settings, 'RECO_FEATURE_FLAG', True):
+        # 1. Feature Flag Check (process snapshot, no query)
+        if not is_feature_enabled(RECO_ENGINE_FLAG, input_data.district, default=settings.RECO_FEATURE_FLAG):
             return self._get_fallback_list(input_data)
 
-        # 2. Fetch Candidates
-        candidates = self.repo.get_candidates(input_data.district)
-        if not candidates:
+        # 2. Fetch Candidates (columnar, cached per district)
+        batch = self.repo.get_batch(input_data.district)
+        if not len(batch):
             return []
 
         # 3. Fetch Context (Crowd)
-        candidate_ids = [c.id for c in candidates]
-        crowd_map = self.crowd_adapter.get_crowd_levels(candidate_ids)
+        crowd_map = self.crowd_adapter.get_crowd_levels(batch.ids.tolist())
 
-        # 4. Score
-        results = []
-        for cand in candidates:
-            crowd = crowd_map.get(cand.id, 'UNKNOWN')
-            scored = self.scorer.calculate(cand, input_data, crowd)
-            if scored.score > 0: # Filter out zero scores (usually time invalid)
-                results.append(scored)
-                
-        # 5. Sort
-        results.sort(key=lambda x: x.score, reverse=True)
-        
-        return results
+        # 4. Score (vectorized over all candidates)
+        scores = self.scorer.calculate_batch(batch, input_data, batch.crowd_codes(crowd_map))
+
+        # 5. Filter out zero scores (usually time invalid) and sort
+        return scores.ranked()
+
+    async def aget_recommendations(self, input_data: RecoInput) -> List[ScoredRecommendation]:
+        """Async variant for ASGI: same pipeline, DB reads through the async ORM."""
+        if not await ais_feature_enabled(RECO_ENGINE_FLAG, input_data.district, default=settings.RECO_FEATURE_FLAG):
+            return await sync_to_async(self._get_fallback_list)(input_data)
+
+        batch = await self.repo.aget_batch(input_data.district)
+        if not len(batch):
+            return []
+
+        crowd_map = await self.crowd_adapter.aget_crowd_levels(batch.ids.tolist())
+        scores = self.scorer.calculate_batch(batch, input_data, batch.crowd_codes(crowd_map))
+        return scores.ranked()
 
     def _get_fallback_list(self, input_data: RecoInput) -> List[ScoredRecommendation]:
         """Simple unfiltered list if engine is disabled"""
@@ -141,6 +147,6 @@ class RecommendationService:
                 score=1.0,
                 score_breakdown={},
                 explanation="Standard listing (Engine Disabled)",
-                crowd_state='UNKNOWN'
+                crowd_state=CrowdState.UNKNOWN
             ))
         return results
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from listings.models import Hotspot
+from listings.signals import hotspot_status_changed
+from .snapshot import candidate_snapshots
+
+@receiver(post_save, sender=Hotspot)
+@receiver(post_delete, sender=Hotspot)
+def invalidate_on_hotspot_write(sender, instance, **kwargs):
+    candidate_snapshots.invalidate(instance.district)
+
+@receiver(hotspot_status_changed, sender=Hotspot)
+def invalidate_on_status_change(sender, hotspot, **kwargs):
+    candidate_snapshots.invalidate(hotspot.district)
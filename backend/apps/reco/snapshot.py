@@ -0,0 +1,84 @@
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from django.conf import settings
+from .domain import HotspotCandidate
+from .scoring import CandidateBatch
+
+class _DistrictSnapshot:
+    __slots__ = ('version', 'built_at', 'batch')
+
+    def __init__(self, version: int, built_at: float, batch: CandidateBatch):
+        self.version = version
+        self.built_at = built_at
+        self.batch = batch
+
+class CandidateSnapshotCache:
+    """
+    Per-process cache of LIVE candidates, one CandidateBatch per district.
+    - Any hotspot change bumps `version`, which makes every snapshot stale.
+    - `ttl` bounds staleness for changes made by *other* processes
+      (signals only fire in the process that wrote the row).
+    """
+    def __init__(self, ttl: Optional[int] = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, _DistrictSnapshot] = {}
+        self.version = 0
+        self.builds = 0
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'RECO_SNAPSHOT_TTL', 300)
+
+    def get(self, district: str, loader: Callable[[str], List[HotspotCandidate]]) -> CandidateBatch:
+        batch = self._fresh(district)
+        if batch is not None:
+            return batch
+
+        # Capture version before loading so a concurrent invalidation isn't lost
+        version = self.version
+        return self._store(district, version, loader(district))
+
+    async def aget(self, district: str, loader: Callable[[str], Awaitable[List[HotspotCandidate]]]) -> CandidateBatch:
+        """Same as `get` with an async loader (async ORM)."""
+        batch = self._fresh(district)
+        if batch is not None:
+            return batch
+
+        version = self.version
+        return self._store(district, version, await loader(district))
+
+    def _fresh(self, district: str) -> Optional[CandidateBatch]:
+        snap = self._snapshots.get((district or '').lower())
+        if snap is not None and snap.version == self.version and time.monotonic() - snap.built_at < self.ttl:
+            return snap.batch
+        return None
+
+    def _store(self, district: str, version: int, candidates: List[HotspotCandidate]) -> CandidateBatch:
+        batch = CandidateBatch.from_candidates(candidates)
+        with self._lock:
+            self.builds += 1
+            if version == self.version:
+                self._snapshots[(district or '').lower()] = _DistrictSnapshot(version, time.monotonic(), batch)
+        return batch
+
+    def invalidate(self, district: Optional[str] = None):
+        """Drop snapshots. Always bumps the version (a district may have been renamed)."""
+        with self._lock:
+            self.version += 1
+            if district is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(district.lower(), None)
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "builds": self.builds,
+            "districts": sorted(self._snapshots.keys()),
+        }
+
+candidate_snapshots = CandidateSnapshotCache()
@@ -1,9 +1,11 @@
-from django.test import SimpleTestCase
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase
 import unittest
 import unittest.mock
 from .domain import RecoInput, HotspotCandidate, CrowdState
-from .scoring import ScoringEngine, TimeFeasibilityScorer, InterestMatchScorer
+from .scoring import ScoringEngine, TimeFeasibilityScorer, InterestMatchScorer, CandidateBatch
 from .service import RecommendationService
+from .snapshot import CandidateSnapshotCache, candidate_snapshots
 
 class ScorerTests(SimpleTestCase):
     def setUp(self):
@@ -33,6 +35,60 @@ class ScorerTests(SimpleTestCase):
         inp = RecoInput(available_time=120, interest_tags=["urban"], district="Test")
         self.assertEqual(scorer.score(self.candidate, inp), 0.0)
 
+class BatchScoringTests(SimpleTestCase):
+    def setUp(self):
+        self.candidates = [
+            HotspotCandidate(id=1, name="A", description="", district="Test",
+                             tags=["Nature", "Adventure"], duration_minutes=60, operating_hours=""),
+            HotspotCandidate(id=2, name="B", description="", district="Test",
+                             tags=["food"], duration_minutes=200, operating_hours=""),
+            HotspotCandidate(id=3, name="C", description="", district="Test",
+                             tags=[], duration_minutes=30, operating_hours=""),
+            HotspotCandidate(id=4, name="D", description="", district="Test",
+                             tags=["NATURE", "tea", "Food"], duration_minutes=90, operating_hours=""),
+        ]
+        self.crowd_map = {1: CrowdState.HIGH, 2: CrowdState.LOW, 4: CrowdState.MODERATE}
+        self.engine = ScoringEngine()
+
+    def test_batch_matches_scalar(self):
+        batch = CandidateBatch.from_candidates(self.candidates)
+        codes = batch.crowd_codes(self.crowd_map)
+        inputs = [
+            RecoInput(available_time=120, interest_tags=["nature", "food", "nature"], district="Test"),
+            RecoInput(available_time=0, interest_tags=[], district="Test"),
+            RecoInput(available_time=45, interest_tags=["unknown-tag"], district="Test"),
+        ]
+        for inp in inputs:
+            scores = self.engine.calculate_batch(batch, inp, codes)
+            for i, cand in enumerate(self.candidates):
+                expected = self.engine.calculate(cand, inp, self.crowd_map.get(cand.id, CrowdState.UNKNOWN))
+                got = scores.to_recommendation(i)
+                self.assertAlmostEqual(got.score, expected.score)
+                self.assertEqual(got.score_breakdown, expected.score_breakdown)
+                self.assertEqual(got.explanation, expected.explanation)
+                self.assertEqual(got.crowd_state, expected.crowd_state)
+
+    def test_ranked_filters_and_sorts(self):
+        batch = CandidateBatch.from_candidates(self.candidates)
+        inp = RecoInput(available_time=100, interest_tags=["nature"], district="Test")
+        ranked = self.engine.calculate_batch(batch, inp, batch.crowd_codes(self.crowd_map)).ranked()
+        self.assertNotIn(2, [r.hotspot.id for r in ranked]) # exceeds time
+        self.assertEqual([r.score for r in ranked], sorted((r.score for r in ranked), reverse=True))
+
+    def test_wide_tag_vocabulary(self):
+        # More than 64 distinct tags spills into a second bitset word
+        cands = [
+            HotspotCandidate(id=i, name=str(i), description="", district="Test",
+                             tags=[f"t{i}"], duration_minutes=10, operating_hours="")
+            for i in range(100)
+        ]
+        batch = CandidateBatch.from_candidates(cands)
+        self.assertEqual(batch.tag_bits.shape, (100, 2))
+        inp = RecoInput(available_time=0, interest_tags=["t99"], district="Test")
+        scores = self.engine.calculate_batch(batch, inp, batch.crowd_codes({}))
+        self.assertEqual(scores.interest_match[99], 1.0)
+        self.assertEqual(scores.interest_match[:99].sum(), 0.0)
+
 class ServiceTests(SimpleTestCase):
     def test_service_instantiation(self):
         # We mock the repository to avoid DB access during simple init test
@@ -40,15 +96,17 @@ class ServiceTests(SimpleTestCase):
             service = RecommendationService()
             self.assertIsNotNone(service)
 
+    @unittest.mock.patch('reco.service.is_feature_enabled', return_value=True)
     @unittest.mock.patch('reco.service.DjangoHotspotRepository')
-    @unittest.mock.patch('reco.service.StubCrowdAdapter')
-    def test_get_recommendations(self, mock_crowd, mock_repo):
+    @unittest.mock.patch('reco.service.CrowdAggregateAdapter')
+    def test_get_recommendations(self, mock_crowd, mock_repo, mock_flag):
         # Setup Mocks
         candidate = HotspotCandidate(
             id=1, name="Mock Spot", description="Desc", district="Test",
             tags=["fun"], duration_minutes=60, operating_hours="9-5"
         )
         mock_repo.return_value.get_candidates.return_value = [candidate]
+        mock_repo.return_value.get_batch.return_value = CandidateBatch.from_candidates([candidate])
         mock_crowd.return_value.get_crowd_levels.return_value = {1: CrowdState.LOW}
         
         service = RecommendationService()
@@ -57,3 +115,189 @@ class ServiceTests(SimpleTestCase):
         results = service.get_recommendations(inp)
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].hotspot.id, 1)
+
+class SnapshotCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.calls = []
+        self.cache = CandidateSnapshotCache(ttl=3600)
+
+    def loader(self, district):
+        self.calls.append(district)
+        return [HotspotCandidate(id=len(self.calls), name="S", description="", district=district,
+                                 tags=["x"], duration_minutes=60, operating_hours="")]
+
+    def test_snapshot_reused_until_invalidated(self):
+        first = self.cache.get("Gangtok", self.loader)
+        self.assertIs(self.cache.get("gangtok", self.loader), first)
+        self.assertEqual(len(self.calls), 1)
+
+        version = self.cache.version
+        self.cache.invalidate("Gangtok")
+        self.assertEqual(self.cache.version, version + 1)
+        self.assertIsNot(self.cache.get("Gangtok", self.loader), first)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_ttl_expiry(self):
+        cache = CandidateSnapshotCache(ttl=0)
+        cache.get("Gangtok", self.loader)
+        cache.get("Gangtok", self.loader)
+        self.assertEqual(len(self.calls), 2)
+
+class SnapshotInvalidationTests(TestCase):
+    def test_hotspot_lifecycle_bumps_version(self):
+        from django.contrib.auth import get_user_model
+        from listings.models import Hotspot
+        from listings.services import HotspotService
+
+        host = get_user_model().objects.create_user(
+            username='snaphost', email='snaphost@example.com', password='pw')
+        version = candidate_snapshots.version
+        hotspot = Hotspot.objects.create(host=host, name="Spot", district="Gangtok",
+                                         status=Hotspot.Status.Approved)
+        self.assertGreater(candidate_snapshots.version, version)
+
+        version = candidate_snapshots.version
+        HotspotService.publish(hotspot, host)
+        self.assertGreater(candidate_snapshots.version, version)
+
+        version = candidate_snapshots.version
+        hotspot.delete()
+        self.assertGreater(candidate_snapshots.version, version)
+
+    def test_admin_moderation_actions_bump_version(self):
+        from django.contrib.admin.sites import site
+        from django.contrib.auth import get_user_model
+        from django.test import RequestFactory
+        from listings.models import Hotspot
+
+        admin_user = get_user_model().objects.create_superuser(
+            username='snapadmin', email='snapadmin@example.com', password='pw')
+        Hotspot.objects.create(host=admin_user, name="Spot", district="Gangtok", status=Hotspot.Status.Live)
+        model_admin = site._registry[Hotspot]
+        request = RequestFactory().post('/admin/')
+        request.user = admin_user
+
+        # queryset.update() sends no post_save: the actions must signal the change themselves
+        for action in (model_admin.reject_hotspots, model_admin.approve_hotspots):
+            version = candidate_snapshots.version
+            action(request, Hotspot.objects.filter(district="Gangtok"))
+            self.assertGreater(candidate_snapshots.version, version)
+
+class CrowdAggregateAdapterTests(TestCase):
+    def test_latest_fresh_reading_per_hotspot(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from safety.models import CrowdAggregate, CurrentCrowdState
+        from .infrastructure import CrowdAggregateAdapter
+
+        now = timezone.now()
+        CurrentCrowdState.objects.upsert_from([
+            CrowdAggregate.objects.create(district_id="d1", hotspot_id="1", density_state="LOW",
+                                          timestamp=now - timedelta(minutes=20)),
+            CrowdAggregate.objects.create(district_id="d1", hotspot_id="1", density_state="HIGH",
+                                          timestamp=now - timedelta(minutes=5)),
+            CrowdAggregate.objects.create(district_id="d1", hotspot_id="2", density_state="MEDIUM",
+                                          timestamp=now - timedelta(minutes=5)),
+            # Too old to count
+            CrowdAggregate.objects.create(district_id="d1", hotspot_id="3", density_state="HIGH",
+                                          timestamp=now - timedelta(hours=3)),
+        ])
+
+        adapter = CrowdAggregateAdapter(staleness=timedelta(minutes=30))
+        with self.assertNumQueries(1):
+            levels = adapter.get_crowd_levels([1, 2, 3, 4])
+        self.assertEqual(levels, {
+            1: CrowdState.HIGH,
+            2: CrowdState.MODERATE,
+            3: CrowdState.UNKNOWN,
+            4: CrowdState.UNKNOWN,
+        })
+
+class AsyncRecommendationTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from listings.models import Hotspot
+        host = get_user_model().objects.create_user(
+            username='asynchost', email='asynchost@example.com', password='pw')
+        for name, tags in [("Tea Garden", ["tea"]), ("Lake", ["nature"])]:
+            Hotspot.objects.create(host=host, name=name, district="Async", status=Hotspot.Status.Live,
+                                   duration_minutes=60, tags=tags)
+        candidate_snapshots.invalidate()
+
+    async def test_async_service_matches_sync(self):
+        inp = RecoInput(available_time=120, interest_tags=["tea"], district="async")
+        service = RecommendationService()
+        async_results = await service.aget_recommendations(inp)
+        sync_results = await sync_to_async(service.get_recommendations)(inp)
+        self.assertEqual([(r.hotspot.name, r.score) for r in async_results],
+                         [(r.hotspot.name, r.score) for r in sync_results])
+        self.assertEqual(async_results[0].hotspot.name, "Tea Garden")
+
+    def test_public_view(self):
+        response = self.client.get('/api/public/recommendations/',
+                                   {'district': 'Async', 'available_time': 120, 'interest_tags': 'nature'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['name'], "Lake")
+
+    def test_district_rollout_flag(self):
+        from features.models import FeatureFlag
+        from features.services import flag_snapshot
+        self.addCleanup(flag_snapshot.invalidate)  # the row is rolled back without a signal
+        FeatureFlag.objects.create(name='reco_engine', enabled_districts=['ASYNC'])
+        service = RecommendationService()
+        enabled = service.get_recommendations(RecoInput(available_time=120, interest_tags=["tea"], district="Async"))
+        disabled = service.get_recommendations(RecoInput(available_time=120, interest_tags=[], district="Other"))
+        self.assertEqual(enabled[0].hotspot.name, "Tea Garden")
+        self.assertEqual(disabled, [])  # fallback list, nothing live in "Other"
+
+    def test_fallback_list_through_view(self):
+        from features.models import FeatureFlag
+        from features.services import flag_snapshot
+        self.addCleanup(flag_snapshot.invalidate)
+        FeatureFlag.objects.create(name='reco_engine', enabled_districts=['OTHER'])
+        response = self.client.get('/api/public/recommendations/',
+                                   {'district': 'Async', 'available_time': 120, 'interest_tags': 'nature'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual({r['name'] for r in data}, {"Tea Garden", "Lake"})
+        self.assertEqual({r['crowd_label'] for r in data}, {"UNKNOWN"})
+
+class KioskRecommendationTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from listings.models import Hotspot
+        host = get_user_model().objects.create_user(
+            username='kioskhost', email='kioskhost@example.com', password='pw')
+        def spot(name, tags, duration=60, district="East"):
+            return Hotspot.objects.create(host=host, name=name, district=district, tags=tags,
+                                          duration_minutes=duration, status=Hotspot.Status.Live,
+                                          description="long narrative " * 100)
+        self.both = spot("Both", ["tea", "nature"])
+        self.one = spot("One", ["Nature"])
+        self.unknown = spot("Unknown duration", ["tea"], duration=None)
+        self.none = spot("None", ["heritage"])
+        self.too_long = spot("Too long", ["tea", "nature"], duration=600)
+        self.elsewhere = spot("Elsewhere", ["tea", "nature"], district="West")
+        for i in range(10):
+            spot(f"Filler {i}", [])
+
+    def test_ranked_in_sql_top_k(self):
+        from shared.contracts.kiosk_discovery import DiscoveryRequest
+        from .service import get_kiosk_recommendations, KIOSK_TOP_K
+
+        req = DiscoveryRequest(available_time=120, interest_tags=["Tea", "nature"], district_id="east")
+        with self.assertNumQueries(1):
+            results = get_kiosk_recommendations(req)
+        self.assertEqual(len(results), KIOSK_TOP_K)
+        # 20, 10, 10-5, then zero-overlap rows by id
+        self.assertEqual([r.title for r in results[:4]], ["Both", "One", "Unknown duration", "None"])
+        self.assertNotIn("Too long", [r.title for r in results])
+        self.assertNotIn("Elsewhere", [r.title for r in results])
+
+    def test_no_interests(self):
+        from shared.contracts.kiosk_discovery import DiscoveryRequest
+        from .service import get_kiosk_recommendations
+
+        results = get_kiosk_recommendations(DiscoveryRequest(available_time=0, interest_tags=[], district_id="East"))
+        self.assertEqual(len(results), 6)
+        self.assertNotIn("Unknown duration", [r.title for r in results])
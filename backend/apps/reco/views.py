@@ -1,33 +1,34 @@
 import logging
 import dataclasses
+from adrf.views import APIView as AsyncAPIView
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from shared.contracts.kiosk_discovery import DiscoveryRequest
 from .service import get_kiosk_recommendations
 from listings.models import Hotspot
+from shared.cache import HOTSPOTS, cached_public_response
 
 from .domain import RecoInput
 from .service import RecommendationService
+from .snapshot import candidate_snapshots
 
 logger = logging.getLogger(__name__)
 
-class RecommendationPublicView(APIView):
+class RecommendationPublicView(AsyncAPIView):
     authentication_classes = [] # Public Access
     permission_classes = []
     
-    def get(self, request):
+    async def get(self, request):
         try:
             # 1. Parse Input
             input_data = RecoInput.from_request(request.query_params)
             
             logger.info(f"Reco Request: {input_data}")
             
-            # 2. Call Service
+            # 2. Call Service (async ORM; no worker thread held while waiting on the DB)
             service = RecommendationService()
-            recommendations = service.get_recommendations(input_data)
+            recommendations = await service.aget_recommendations(input_data)
             
             # 3. Serialize Response
             data = [r.to_dict() for r in recommendations]
@@ -36,7 +37,8 @@ class RecommendationPublicView(APIView):
                 "meta": {
                     "count": len(data),
                     "district": input_data.district,
-                    "policy_version": "v1"
+                    "policy_version": "v1",
+                    "snapshot_version": candidate_snapshots.version
                 },
                 "data": data
             }, status=status.HTTP_200_OK)
@@ -88,7 +90,7 @@ class DistrictListView(APIView):
     authentication_classes = [] # Public
     permission_classes = []
 
-    @method_decorator(cache_page(60*60)) # Cache for 1 hour
+    @cached_public_response(HOTSPOTS, district_params=())
     def get(self, request):
         # Return distinct districts from Live Hotspots
         # For pilot, we might just want all districts or specific ones. 
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import ModerationTicket, CrowdAggregate, DistrictRestriction, EmergencyContact
+from .models import (
+    ModerationTicket, CrowdAggregate, CurrentCrowdState, CrowdAggregateHourly, CrowdAggregateDaily,
+    DistrictRestriction, EmergencyContact,
+)
 
 
 @admin.register(ModerationTicket)
@@ -48,6 +51,34 @@ class CrowdAggregateAdmin(admin.ModelAdmin):
         return request.user.is_superuser
 
 
+@admin.register(CurrentCrowdState)
+class CurrentCrowdStateAdmin(admin.ModelAdmin):
+    list_display = ('district_id', 'hotspot_id', 'density_state', 'timestamp', 'updated_at')
+    list_filter = ('density_state',)
+    search_fields = ('district_id', 'hotspot_id')
+    ordering = ('district_id', 'hotspot_id')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(CrowdAggregateHourly, CrowdAggregateDaily)
+class CrowdRollupAdmin(admin.ModelAdmin):
+    list_display = ('district_id', 'hotspot_id', 'bucket', 'samples', 'count_avg', 'count_max', 'peak_density_state')
+    list_filter = ('peak_density_state',)
+    search_fields = ('district_id', 'hotspot_id')
+    ordering = ('-bucket',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(DistrictRestriction)
 class DistrictRestrictionAdmin(admin.ModelAdmin):
     list_display = ('district_id', 'restriction_type', 'severity', 'start_at', 'end_at', 'created_by')
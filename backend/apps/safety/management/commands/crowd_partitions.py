@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from safety.timeseries import add_months, drop_partitions_before, ensure_monthly_partitions, month_start
+
+class Command(BaseCommand):
+    help = 'Creates upcoming monthly CrowdAggregate partitions and optionally drops expired ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=3,
+                            help='Months after the current one to pre-create')
+        parser.add_argument('--retain-months', type=int, default=None,
+                            help='Drop partitions older than this many whole months (roll up first)')
+
+    def handle(self, *args, **options):
+        current = month_start(timezone.now())
+        created = ensure_monthly_partitions(current, options['ahead'] + 1)
+        for name in created:
+            self.stdout.write(f"Created partition {name}")
+
+        if options['retain_months'] is not None:
+            cutoff = add_months(current, -options['retain_months'])
+            for name in drop_partitions_before(cutoff):
+                self.stdout.write(f"Dropped partition {name}")
+
+        self.stdout.write(self.style.SUCCESS("Crowd partitions up to date"))
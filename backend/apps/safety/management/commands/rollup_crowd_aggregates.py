@@ -0,0 +1,21 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from safety.timeseries import rollup
+
+class Command(BaseCommand):
+    help = 'Rebuilds hourly and daily CrowdAggregate rollups for recent days'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2,
+                            help='Number of days (including today, UTC) to recompute')
+
+    def handle(self, *args, **options):
+        end = timezone.now()
+        # Start on a UTC day boundary so daily buckets are always complete
+        start = (end - timedelta(days=max(options['days'] - 1, 0))).replace(
+            hour=0, minute=0, second=0, microsecond=0)
+        counts = rollup(start, end)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rolled up {start:%Y-%m-%d} .. now: {counts['hour']} hourly, {counts['day']} daily buckets"
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("safety", "0002_crowdaggregate_emergencycontact_districtrestriction"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="crowdaggregate",
+            index=models.Index(
+                fields=["hotspot_id", "-timestamp"], name="crowd_hotspot_ts"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="crowdaggregate",
+            index=models.Index(
+                fields=["district_id", "-timestamp"], name="crowd_district_ts"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="crowdaggregate",
+            index=models.Index(fields=["-timestamp"], name="crowd_ts"),
+        ),
+        migrations.AddIndex(
+            model_name="districtrestriction",
+            index=models.Index(
+                fields=["district_id", "start_at", "end_at"],
+                name="restriction_district_window",
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+BACKFILL_SQL = """
+INSERT INTO safety_currentcrowdstate
+    (district_id, hotspot_id, density_state, count_15min, source_type, timestamp, aggregate_id, updated_at)
+SELECT DISTINCT ON (district_id, COALESCE(hotspot_id, ''))
+    district_id, COALESCE(hotspot_id, ''), density_state, count_15min, source_type, timestamp, id, NOW()
+FROM safety_crowdaggregate
+ORDER BY district_id, COALESCE(hotspot_id, ''), timestamp DESC
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("safety", "0003_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CurrentCrowdState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("district_id", models.CharField(max_length=50)),
+                ("hotspot_id", models.CharField(blank=True, default="", max_length=50)),
+                (
+                    "density_state",
+                    models.CharField(
+                        choices=[
+                            ("LOW", "Low"),
+                            ("MEDIUM", "Medium"),
+                            ("HIGH", "High"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("count_15min", models.IntegerField(blank=True, null=True)),
+                (
+                    "source_type",
+                    models.CharField(
+                        choices=[
+                            ("CCTV_EDGE", "CCTV Edge"),
+                            ("MANUAL", "Manual"),
+                            ("OTHER", "Other"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("timestamp", models.DateTimeField()),
+                (
+                    "aggregate_id",
+                    models.UUIDField(
+                        help_text="CrowdAggregate row this state came from"
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("district_id", "hotspot_id"), name="current_crowd_key"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
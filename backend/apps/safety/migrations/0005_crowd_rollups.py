@@ -0,0 +1,104 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("safety", "0004_currentcrowdstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CrowdAggregateDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("district_id", models.CharField(max_length=50)),
+                ("hotspot_id", models.CharField(blank=True, default="", max_length=50)),
+                ("bucket", models.DateTimeField()),
+                ("samples", models.IntegerField(default=0)),
+                ("count_avg", models.FloatField(blank=True, null=True)),
+                ("count_max", models.IntegerField(blank=True, null=True)),
+                (
+                    "peak_density_state",
+                    models.CharField(
+                        choices=[
+                            ("LOW", "Low"),
+                            ("MEDIUM", "Medium"),
+                            ("HIGH", "High"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["district_id", "-bucket"], name="crowd_daily_district"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("district_id", "hotspot_id", "bucket"),
+                        name="crowd_daily_key",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="CrowdAggregateHourly",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("district_id", models.CharField(max_length=50)),
+                ("hotspot_id", models.CharField(blank=True, default="", max_length=50)),
+                ("bucket", models.DateTimeField()),
+                ("samples", models.IntegerField(default=0)),
+                ("count_avg", models.FloatField(blank=True, null=True)),
+                ("count_max", models.IntegerField(blank=True, null=True)),
+                (
+                    "peak_density_state",
+                    models.CharField(
+                        choices=[
+                            ("LOW", "Low"),
+                            ("MEDIUM", "Medium"),
+                            ("HIGH", "High"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["district_id", "-bucket"], name="crowd_hourly_district"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("district_id", "hotspot_id", "bucket"),
+                        name="crowd_hourly_key",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,119 @@
+"""
+Convert safety_crowdaggregate into a table RANGE-partitioned by month on
+"timestamp". Django's model state is unchanged; the primary key becomes
+(id, timestamp) at the database level because Postgres requires the
+partition key in every unique constraint.
+"""
+
+from datetime import datetime, timezone
+
+from django.db import migrations
+
+TABLE = "safety_crowdaggregate"
+LEGACY = "safety_crowdaggregate_unpartitioned"
+INDEXES = ["crowd_hotspot_ts", "crowd_district_ts", "crowd_ts"]
+COLUMNS = (
+    '"id", "district_id", "hotspot_id", "source_type", "density_state", '
+    '"count_15min", "timestamp", "created_at"'
+)
+MONTHS_AHEAD = 3
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE "{table}" (
+        "id" uuid NOT NULL,
+        "district_id" varchar(50) NOT NULL,
+        "hotspot_id" varchar(50) NULL,
+        "source_type" varchar(50) NOT NULL,
+        "density_state" varchar(50) NOT NULL,
+        "count_15min" integer NULL,
+        "timestamp" timestamp with time zone NOT NULL,
+        "created_at" timestamp with time zone NOT NULL,
+        {primary_key}
+    ) {partition}
+"""
+
+CREATE_INDEXES_SQL = [
+    'CREATE INDEX "crowd_hotspot_ts" ON "{table}" ("hotspot_id", "timestamp" DESC)',
+    'CREATE INDEX "crowd_district_ts" ON "{table}" ("district_id", "timestamp" DESC)',
+    'CREATE INDEX "crowd_ts" ON "{table}" ("timestamp" DESC)',
+]
+
+
+def _month_start(value):
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def _add_months(value, months):
+    index = value.year * 12 + (value.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _move_aside(cursor):
+    cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY}"')
+    cursor.execute(
+        f'ALTER TABLE "{LEGACY}" RENAME CONSTRAINT "{TABLE}_pkey" TO "{LEGACY}_pkey"'
+    )
+    for name in INDEXES:
+        cursor.execute(f'ALTER INDEX "{name}" RENAME TO "{name}_legacy"')
+
+
+def _finish(cursor):
+    for sql in CREATE_INDEXES_SQL:
+        cursor.execute(sql.format(table=TABLE))
+    cursor.execute(
+        f'INSERT INTO "{TABLE}" ({COLUMNS}) SELECT {COLUMNS} FROM "{LEGACY}"'
+    )
+    cursor.execute(f'DROP TABLE "{LEGACY}"')
+
+
+def partition(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        _move_aside(cursor)
+        cursor.execute(
+            CREATE_TABLE_SQL.format(
+                table=TABLE,
+                primary_key='PRIMARY KEY ("id", "timestamp")',
+                partition='PARTITION BY RANGE ("timestamp")',
+            )
+        )
+        cursor.execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+
+        cursor.execute(f'SELECT MIN("timestamp") FROM "{LEGACY}"')
+        oldest = cursor.fetchone()[0]
+        now = datetime.now(timezone.utc)
+        first = _month_start(min(oldest, now) if oldest else now)
+        last = _add_months(now, MONTHS_AHEAD)
+        month = first
+        while month <= last:
+            upper = _add_months(month, 1)
+            cursor.execute(
+                f'CREATE TABLE "{TABLE}_p{month.year:04d}_{month.month:02d}" '
+                f'PARTITION OF "{TABLE}" FOR VALUES FROM (%s) TO (%s)',
+                [month, upper],
+            )
+            month = upper
+        _finish(cursor)
+
+
+def unpartition(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        _move_aside(cursor)
+        cursor.execute(
+            CREATE_TABLE_SQL.format(
+                table=TABLE,
+                primary_key=f'CONSTRAINT "{TABLE}_pkey" PRIMARY KEY ("id")',
+                partition="",
+            )
+        )
+        _finish(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("safety", "0005_crowd_rollups"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("safety", "0006_partition_crowdaggregate"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="currentcrowdstate",
+            index=models.Index(fields=["hotspot_id"], name="current_crowd_hotspot"),
+        ),
+    ]
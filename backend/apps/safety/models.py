@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import connections, models
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -29,6 +29,8 @@ class ModerationTicket(models.Model):
         return f"Ticket #{self.id} - {self.reason}"
 
 import uuid
+from datetime import datetime
+from typing import NamedTuple, Optional
 from django.utils import timezone
 
 class CrowdAggregate(models.Model):
@@ -51,9 +53,159 @@ class CrowdAggregate(models.Model):
     timestamp = models.DateTimeField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['hotspot_id', '-timestamp'], name='crowd_hotspot_ts'),
+            models.Index(fields=['district_id', '-timestamp'], name='crowd_district_ts'),
+            models.Index(fields=['-timestamp'], name='crowd_ts'),
+        ]
+
     def __str__(self):
         return f"{self.district_id} - {self.density_state} @ {self.timestamp}"
 
+class CrowdTransition(NamedTuple):
+    district_id: str
+    hotspot_id: str
+    old_state: Optional[str]
+    new_state: str
+    count_15min: Optional[int]
+    timestamp: datetime
+
+class CurrentCrowdStateManager(models.Manager):
+    UPSERT_SQL = """
+        WITH incoming (district_id, hotspot_id, density_state, count_15min,
+                       source_type, timestamp, aggregate_id, updated_at) AS (
+            VALUES {values}
+        ),
+        previous AS (
+            SELECT c.district_id, c.hotspot_id, c.density_state
+            FROM {table} c JOIN incoming i USING (district_id, hotspot_id)
+        ),
+        upserted AS (
+            INSERT INTO {table} (district_id, hotspot_id, density_state, count_15min,
+                                 source_type, timestamp, aggregate_id, updated_at)
+            SELECT * FROM incoming
+            ON CONFLICT (district_id, hotspot_id) DO UPDATE SET
+                density_state = EXCLUDED.density_state,
+                count_15min = EXCLUDED.count_15min,
+                source_type = EXCLUDED.source_type,
+                timestamp = EXCLUDED.timestamp,
+                aggregate_id = EXCLUDED.aggregate_id,
+                updated_at = EXCLUDED.updated_at
+            WHERE {table}.timestamp <= EXCLUDED.timestamp
+            RETURNING district_id, hotspot_id, density_state, count_15min, timestamp
+        )
+        SELECT u.district_id, u.hotspot_id, u.density_state, u.count_15min, u.timestamp,
+               p.density_state
+        FROM upserted u LEFT JOIN previous p USING (district_id, hotspot_id)
+    """
+    # Typed placeholders: VALUES in a CTE can't infer column types from the INSERT target
+    ROW_SQL = "(%s, %s, %s, %s::integer, %s, %s::timestamptz, %s::uuid, %s::timestamptz)"
+
+    def upsert_from(self, aggregates):
+        """
+        Fold CrowdAggregate rows into the current-state table in one statement.
+        - Out-of-order readings never overwrite a newer state.
+        - Density changes (including a key's first reading) are sent once,
+          as a list, via `crowd_state_changed`.
+        """
+        from .signals import crowd_state_changed
+
+        # Keep only the newest reading per key (ON CONFLICT can't touch a row twice)
+        latest = {}
+        for agg in aggregates:
+            key = (agg.district_id, agg.hotspot_id or '')
+            if key not in latest or agg.timestamp >= latest[key].timestamp:
+                latest[key] = agg
+        if not latest:
+            return 0
+
+        now = timezone.now()
+        params = []
+        for (district_id, hotspot_id), agg in latest.items():
+            params.extend([district_id, hotspot_id, agg.density_state, agg.count_15min,
+                           agg.source_type, agg.timestamp, agg.id, now])
+        values = ", ".join([self.ROW_SQL] * len(latest))
+        sql = self.UPSERT_SQL.format(table=self.model._meta.db_table, values=values)
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        transitions = [
+            CrowdTransition(district_id, hotspot_id, previous, state, count, timestamp)
+            for district_id, hotspot_id, state, count, timestamp, previous in rows
+            if state != previous
+        ]
+        if transitions:
+            crowd_state_changed.send(sender=self.model, transitions=transitions)
+        return len(latest)
+
+class CurrentCrowdState(models.Model):
+    """
+    Latest crowd reading per (district_id, hotspot_id), maintained on ingest.
+    District-level readings use hotspot_id=''.
+    """
+    district_id = models.CharField(max_length=50)
+    hotspot_id = models.CharField(max_length=50, blank=True, default='')
+    density_state = models.CharField(max_length=50, choices=CrowdAggregate.DensityState.choices)
+    count_15min = models.IntegerField(null=True, blank=True)
+    source_type = models.CharField(max_length=50, choices=CrowdAggregate.SourceType.choices)
+    timestamp = models.DateTimeField()
+    aggregate_id = models.UUIDField(help_text="CrowdAggregate row this state came from")
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    objects = CurrentCrowdStateManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['district_id', 'hotspot_id'], name='current_crowd_key'),
+        ]
+        indexes = [
+            # Reco looks hotspots up by id alone (listing districts differ from crowd district ids)
+            models.Index(fields=['hotspot_id'], name='current_crowd_hotspot'),
+        ]
+
+    def __str__(self):
+        return f"{self.district_id}/{self.hotspot_id or '*'} - {self.density_state} @ {self.timestamp}"
+
+class CrowdRollup(models.Model):
+    """
+    Summary of CrowdAggregate rows per (district_id, hotspot_id, bucket).
+    Rebuilt by `rollup_crowd_aggregates`; district-level readings use hotspot_id=''.
+    """
+    district_id = models.CharField(max_length=50)
+    hotspot_id = models.CharField(max_length=50, blank=True, default='')
+    bucket = models.DateTimeField()
+    samples = models.IntegerField(default=0)
+    count_avg = models.FloatField(null=True, blank=True)
+    count_max = models.IntegerField(null=True, blank=True)
+    peak_density_state = models.CharField(max_length=50, choices=CrowdAggregate.DensityState.choices)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.district_id}/{self.hotspot_id or '*'} @ {self.bucket} ({self.samples})"
+
+class CrowdAggregateHourly(CrowdRollup):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['district_id', 'hotspot_id', 'bucket'], name='crowd_hourly_key'),
+        ]
+        indexes = [
+            models.Index(fields=['district_id', '-bucket'], name='crowd_hourly_district'),
+        ]
+
+class CrowdAggregateDaily(CrowdRollup):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['district_id', 'hotspot_id', 'bucket'], name='crowd_daily_key'),
+        ]
+        indexes = [
+            models.Index(fields=['district_id', '-bucket'], name='crowd_daily_district'),
+        ]
+
 class DistrictRestriction(models.Model):
     class RestrictionType(models.TextChoices):
         WETLAND = 'WETLAND', 'Wetland'
@@ -78,6 +230,11 @@ class DistrictRestriction(models.Model):
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['district_id', 'start_at', 'end_at'], name='restriction_district_window'),
+        ]
+
     @property
     def is_active(self):
         now = timezone.now()
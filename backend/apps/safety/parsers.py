@@ -0,0 +1,55 @@
+import gzip
+import io
+import json
+import zlib
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+def decoded_stream(stream, parser_context):
+    """
+    The body stream, gunzipped when the request carries `Content-Encoding: gzip`.
+    The decompressed size is capped at DATA_UPLOAD_MAX_MEMORY_SIZE.
+    """
+    request = (parser_context or {}).get('request')
+    coding = request.META.get('HTTP_CONTENT_ENCODING', '').strip().lower() if request is not None else ''
+    if coding in ('', 'identity'):
+        return stream
+    if coding != 'gzip':
+        raise ParseError(f'Unsupported Content-Encoding "{coding}".')
+    limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+    try:
+        with gzip.GzipFile(fileobj=stream) as body:
+            data = body.read() if limit is None else body.read(limit + 1)
+    except (OSError, EOFError, zlib.error) as exc:
+        raise ParseError(f'Invalid gzip body - {exc}')
+    if limit is not None and len(data) > limit:
+        raise ParseError('Decompressed body too large.')
+    return io.BytesIO(data)
+
+class GzipJSONParser(JSONParser):
+    """JSON, optionally sent with `Content-Encoding: gzip`."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return super().parse(decoded_stream(stream, parser_context), media_type, parser_context)
+
+class NDJSONParser(BaseParser):
+    """
+    Newline-delimited JSON: one object per line, parsed into a list.
+    Blank lines are ignored; the body may be gzip-encoded.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        for lineno, raw in enumerate(decoded_stream(stream, parser_context), start=1):
+            line = raw.decode(encoding).strip()
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as exc:
+                raise ParseError(f'NDJSON parse error on line {lineno} - {exc}')
+        return items
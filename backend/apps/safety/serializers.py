@@ -1,11 +1,14 @@
+from django.db import transaction
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import (
     ModerationTicket, 
     CrowdAggregate, 
+    CurrentCrowdState,
     DistrictRestriction, 
     EmergencyContact
 )
+from .signals import invalidate_crowd_cache
 
 User = get_user_model()
 
@@ -47,6 +50,24 @@ class CrowdIngestSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         return attrs
 
+    def create(self, validated_data):
+        # History row and current-state upsert commit together
+        with transaction.atomic():
+            aggregate = super().create(validated_data)
+            CurrentCrowdState.objects.upsert_from([aggregate])
+        invalidate_crowd_cache([aggregate])
+        return aggregate
+
+class CurrentCrowdStateSerializer(serializers.ModelSerializer):
+    source = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CurrentCrowdState
+        fields = ['district_id', 'hotspot_id', 'density_state', 'timestamp', 'source']
+
+    def get_source(self, obj):
+        return "AGGREGATE"
+
 class DistrictRestrictionSerializer(serializers.ModelSerializer):
     class Meta:
         model = DistrictRestriction
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from shared.cache import CROWD, EMERGENCY, RESTRICTIONS, bump_versions, bump_versions_on_commit
+from .models import CrowdAggregate, DistrictRestriction, EmergencyContact
+
+# Sent by CurrentCrowdStateManager.upsert_from inside the ingest transaction.
+# kwargs: transitions (list of CrowdTransition)
+crowd_state_changed = Signal()
+
+def invalidate_crowd_cache(aggregates):
+    """Ingest writes via bulk_create/raw upsert (no post_save), so callers bump after commit."""
+    for district_id in {agg.district_id for agg in aggregates}:
+        bump_versions(CROWD, district_id)
+
+@receiver(post_delete, sender=CrowdAggregate)
+def invalidate_crowd_cache_on_delete(sender, instance, **kwargs):
+    bump_versions_on_commit(CROWD, instance.district_id)
+
+@receiver(post_save, sender=DistrictRestriction)
+@receiver(post_delete, sender=DistrictRestriction)
+def invalidate_restriction_cache(sender, instance, **kwargs):
+    bump_versions_on_commit(RESTRICTIONS, instance.district_id)
+
+@receiver(post_save, sender=EmergencyContact)
+@receiver(post_delete, sender=EmergencyContact)
+def invalidate_emergency_cache(sender, instance, **kwargs):
+    # Blank district = global contact
+    bump_versions_on_commit(EMERGENCY, instance.district_id)
@@ -0,0 +1,189 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from .models import CrowdAggregate, CrowdAggregateDaily, CrowdAggregateHourly, CurrentCrowdState
+from .timeseries import (
+    DEFAULT_PARTITION, drop_partitions_before, ensure_monthly_partitions, month_start, partition_name, rollup,
+)
+
+User = get_user_model()
+
+class CurrentCrowdStateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.device = User.objects.create_user(username='edge', email='edge@example.com', password='pw')
+        self.client.force_authenticate(self.device)
+
+    def _ingest(self, **data):
+        payload = {'district_id': 'east', 'density_state': 'LOW', 'source_type': 'CCTV_EDGE', **data}
+        response = self.client.post('/api/v1/safety/telemetry/crowd-aggregate', payload, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response
+
+    def test_ingest_upserts_current_state(self):
+        now = timezone.now()
+        self._ingest(hotspot_id='7', density_state='LOW', timestamp=now - timedelta(minutes=30))
+        self._ingest(hotspot_id='7', density_state='HIGH', timestamp=now)
+        self._ingest(density_state='MEDIUM', timestamp=now)
+
+        self.assertEqual(CrowdAggregate.objects.count(), 3)
+        self.assertEqual(CurrentCrowdState.objects.count(), 2)
+        self.assertEqual(CurrentCrowdState.objects.get(district_id='east', hotspot_id='7').density_state, 'HIGH')
+        self.assertEqual(CurrentCrowdState.objects.get(district_id='east', hotspot_id='').density_state, 'MEDIUM')
+
+    def test_late_reading_does_not_overwrite(self):
+        now = timezone.now()
+        self._ingest(hotspot_id='7', density_state='HIGH', timestamp=now)
+        self._ingest(hotspot_id='7', density_state='LOW', timestamp=now - timedelta(hours=1))
+        self.assertEqual(CurrentCrowdState.objects.get(hotspot_id='7').density_state, 'HIGH')
+
+    def test_public_latest_mode(self):
+        now = timezone.now()
+        self._ingest(hotspot_id='7', density_state='LOW', timestamp=now - timedelta(minutes=30))
+        self._ingest(hotspot_id='7', density_state='HIGH', timestamp=now)
+        self._ingest(hotspot_id='8', density_state='MEDIUM', timestamp=now)
+
+        public = APIClient()
+        with self.assertNumQueries(1):
+            response = public.get('/api/v1/safety/public/crowd', {'latest': 'true', 'hotspot_id': '7'})
+        self.assertEqual([r['density_state'] for r in response.data], ['HIGH'])
+
+        response = public.get('/api/v1/safety/public/crowd', {'latest': 'true', 'district_id': 'east'})
+        self.assertEqual({r['hotspot_id']: r['density_state'] for r in response.data}, {'7': 'HIGH', '8': 'MEDIUM'})
+
+        # History mode unchanged
+        response = public.get('/api/v1/safety/public/crowd', {'hotspot_id': '7'})
+        self.assertEqual(len(response.data), 2)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_public_crowd_etag_follows_ingest(self):
+        cache.clear()
+        public = APIClient()
+        params = {'latest': 'true', 'district_id': 'east'}
+        self._ingest(hotspot_id='7', density_state='LOW')
+        etag = public.get('/api/v1/safety/public/crowd', params)['ETag']
+
+        with self.assertNumQueries(0):
+            response = public.get('/api/v1/safety/public/crowd', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self._ingest(hotspot_id='7', density_state='HIGH')
+        response = public.get('/api/v1/safety/public/crowd', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['density_state'], 'HIGH')
+
+class BatchIngestTests(TestCase):
+    url = '/api/v1/safety/telemetry/crowd-aggregate/batch'
+
+    def setUp(self):
+        self.client = APIClient()
+        device = User.objects.create_user(username='edgebox', email='edgebox@example.com', password='pw')
+        self.client.force_authenticate(device)
+
+    def test_json_array_with_partial_failure(self):
+        now = timezone.now()
+        items = [
+            {'district_id': 'east', 'hotspot_id': str(i), 'density_state': 'LOW', 'count_15min': i,
+             'timestamp': now.isoformat()}
+            for i in range(30)
+        ]
+        items.append({'district_id': 'east', 'density_state': 'PACKED'})
+        with self.assertNumQueries(4):  # SAVEPOINT, one INSERT, one upsert, RELEASE (push events follow the commit)
+            response = self.client.post(self.url, items, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['created'], response.data['failed']), (30, 1))
+        self.assertEqual(response.data['results'][30]['status'], 'invalid')
+        self.assertIn('density_state', response.data['results'][30]['errors'])
+        self.assertEqual(CrowdAggregate.objects.count(), 30)
+        self.assertEqual(CurrentCrowdState.objects.count(), 30)
+
+    def test_ndjson_stream(self):
+        now = timezone.now()
+        body = "\n".join([
+            '{"district_id": "east", "hotspot_id": "1", "density_state": "LOW", "timestamp": "%s"}'
+            % (now - timedelta(minutes=1)).isoformat(),
+            '',
+            '{"district_id": "east", "hotspot_id": "1", "density_state": "HIGH", "timestamp": "%s"}'
+            % now.isoformat(),
+        ])
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(CurrentCrowdState.objects.get(hotspot_id='1').density_state, 'HIGH')
+
+    def test_gzip_ndjson(self):
+        lines = [json.dumps({'district_id': 'east', 'hotspot_id': 'cam_01', 'density_state': 'MEDIUM',
+                             'count_15min': 12, 'timestamp': timezone.now().isoformat(), 'source_type': 'CCTV_EDGE'})]
+        response = self.client.generic('POST', self.url, gzip.compress('\n'.join(lines).encode()),
+                                       content_type='application/x-ndjson', HTTP_CONTENT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(CrowdAggregate.objects.get().count_15min, 12)
+
+        response = self.client.generic('POST', self.url, b'not gzip', content_type='application/x-ndjson',
+                                       HTTP_CONTENT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_non_list(self):
+        response = self.client.post(self.url, {'district_id': 'east'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+class CrowdTimeSeriesTests(TestCase):
+    def _partition_of(self, pk):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT tableoid::regclass::text FROM safety_crowdaggregate WHERE id = %s', [pk])
+            return cursor.fetchone()[0]
+
+    def test_rows_route_to_monthly_partition(self):
+        agg = CrowdAggregate.objects.create(district_id='east', density_state='LOW')
+        self.assertEqual(self._partition_of(agg.pk), partition_name(month_start(agg.timestamp)))
+
+    def test_new_partition_adopts_rows_from_default(self):
+        far = datetime(2031, 5, 10, tzinfo=dt_timezone.utc)
+        agg = CrowdAggregate.objects.create(district_id='east', density_state='LOW', timestamp=far)
+        self.assertEqual(self._partition_of(agg.pk), DEFAULT_PARTITION)
+
+        created = ensure_monthly_partitions(far, 2)
+        self.assertEqual(created, ['safety_crowdaggregate_p2031_05', 'safety_crowdaggregate_p2031_06'])
+        self.assertEqual(self._partition_of(agg.pk), 'safety_crowdaggregate_p2031_05')
+        self.assertEqual(ensure_monthly_partitions(far, 2), [])
+
+        dropped = drop_partitions_before(datetime(2031, 6, 1, tzinfo=dt_timezone.utc))
+        self.assertIn('safety_crowdaggregate_p2031_05', dropped)
+        self.assertNotIn('safety_crowdaggregate_p2031_06', dropped)
+        self.assertFalse(CrowdAggregate.objects.filter(pk=agg.pk).exists())
+
+    def test_rollup_is_idempotent(self):
+        base = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=2)
+        for minutes, state, count in [(0, 'LOW', 10), (15, 'HIGH', 40), (70, 'MEDIUM', 20)]:
+            CrowdAggregate.objects.create(district_id='east', hotspot_id='7', density_state=state,
+                                          count_15min=count, timestamp=base + timedelta(minutes=minutes))
+
+        for _ in range(2):
+            rollup(base - timedelta(days=1), timezone.now())
+
+        hourly = list(CrowdAggregateHourly.objects.filter(hotspot_id='7').order_by('bucket'))
+        self.assertEqual([(h.samples, h.count_avg, h.count_max, h.peak_density_state) for h in hourly],
+                         [(2, 25.0, 40, 'HIGH'), (1, 20.0, 20, 'MEDIUM')])
+        daily = CrowdAggregateDaily.objects.filter(hotspot_id='7')
+        self.assertEqual(sum(d.samples for d in daily), 3)
+        self.assertEqual(max(d.count_max for d in daily), 40)
+
+    def test_rollup_widens_to_whole_buckets(self):
+        base = datetime(2026, 3, 2, 10, tzinfo=dt_timezone.utc)
+        for minutes, count in [(0, 10), (45, 30), (80, 50)]:
+            CrowdAggregate.objects.create(district_id='east', hotspot_id='8', density_state='LOW',
+                                          count_15min=count, timestamp=base + timedelta(minutes=minutes))
+        rollup(base, base + timedelta(hours=2))
+
+        # Mid-bucket bounds still rebuild the 10:00 and 11:00 hours (and the day) in full
+        rollup(base + timedelta(minutes=30), base + timedelta(minutes=70))
+        hourly = CrowdAggregateHourly.objects.filter(hotspot_id='8').order_by('bucket')
+        self.assertEqual([(h.samples, h.count_max) for h in hourly], [(2, 30), (1, 50)])
+        daily = CrowdAggregateDaily.objects.get(hotspot_id='8')
+        self.assertEqual((daily.samples, daily.count_max), (3, 50))
@@ -0,0 +1,127 @@
+"""
+Time-series maintenance for CrowdAggregate history.
+
+- safety_crowdaggregate is RANGE-partitioned by month on `timestamp`
+  (see migration 0006). A DEFAULT partition catches anything outside
+  the monthly ranges so ingest never fails.
+- Raw rows are rolled up into hourly/daily summary tables; old monthly
+  partitions can then be detached and dropped without a bulk DELETE.
+"""
+from datetime import datetime, timezone as dt_timezone
+from django.db import connection, transaction
+from .models import CrowdAggregate, CrowdAggregateHourly, CrowdAggregateDaily
+
+PARENT_TABLE = CrowdAggregate._meta.db_table
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_PREFIX = f"{PARENT_TABLE}_p"
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + (value.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+def partition_name(month: datetime) -> str:
+    return f"{PARTITION_PREFIX}{month.year:04d}_{month.month:02d}"
+
+def list_partitions():
+    """Monthly partitions attached to the parent, as [(name, month_start)] oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = %s AND c.relname LIKE %s
+            ORDER BY c.relname
+        """, [PARENT_TABLE, PARTITION_PREFIX + '%'])
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = []
+    for name in names:
+        year, month = name[len(PARTITION_PREFIX):].split('_')
+        partitions.append((name, datetime(int(year), int(month), 1, tzinfo=dt_timezone.utc)))
+    return partitions
+
+def ensure_monthly_partitions(start: datetime, months: int):
+    """
+    Create monthly partitions for [start, start + months).
+    Rows that already landed in the DEFAULT partition for a new range are
+    moved into it before it is attached.
+    Returns the names of partitions created.
+    """
+    existing = {name for name, _ in list_partitions()}
+    created = []
+    first = month_start(start)
+    for offset in range(months):
+        lower = add_months(first, offset)
+        upper = add_months(first, offset + 1)
+        name = partition_name(lower)
+        if name in existing:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE "{name}" (LIKE "{PARENT_TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+            )
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+                f'WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+                f'INSERT INTO "{name}" SELECT * FROM moved',
+                [lower, upper]
+            )
+            cursor.execute(
+                f'ALTER TABLE "{PARENT_TABLE}" ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)',
+                [lower, upper]
+            )
+        created.append(name)
+    return created
+
+def drop_partitions_before(cutoff: datetime):
+    """Detach and drop monthly partitions that end on or before `cutoff`. Returns dropped names."""
+    dropped = []
+    for name, lower in list_partitions():
+        if add_months(lower, 1) > cutoff:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"')
+            cursor.execute(f'DROP TABLE "{name}"')
+        dropped.append(name)
+    return dropped
+
+ROLLUP_SQL = """
+    INSERT INTO {table} (district_id, hotspot_id, bucket, samples, count_avg, count_max,
+                         peak_density_state, updated_at)
+    SELECT district_id, COALESCE(hotspot_id, ''), date_trunc(%(unit)s, "timestamp") AS bucket,
+           COUNT(*), AVG(count_15min), MAX(count_15min),
+           (ARRAY['LOW', 'MEDIUM', 'HIGH'])[MAX(CASE density_state
+                WHEN 'HIGH' THEN 3 WHEN 'MEDIUM' THEN 2 ELSE 1 END)],
+           NOW()
+    FROM {source}
+    WHERE "timestamp" >= date_trunc(%(unit)s, %(start)s::timestamptz)
+      AND "timestamp" < date_trunc(%(unit)s, %(end)s::timestamptz - interval '1 microsecond')
+                        + ('1 ' || %(unit)s)::interval
+    GROUP BY 1, 2, 3
+    ON CONFLICT (district_id, hotspot_id, bucket) DO UPDATE SET
+        samples = EXCLUDED.samples,
+        count_avg = EXCLUDED.count_avg,
+        count_max = EXCLUDED.count_max,
+        peak_density_state = EXCLUDED.peak_density_state,
+        updated_at = EXCLUDED.updated_at
+"""
+
+def rollup(start: datetime, end: datetime):
+    """
+    Recompute hourly and daily summaries for every bucket overlapping [start, end).
+    The range is widened to whole buckets, so an unaligned start or end never
+    overwrites a bucket with a partial count. Idempotent: buckets are rebuilt
+    from raw rows and upserted.
+    Returns {granularity: rows upserted}.
+    """
+    counts = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        for granularity, model in (('hour', CrowdAggregateHourly), ('day', CrowdAggregateDaily)):
+            cursor.execute(
+                ROLLUP_SQL.format(table=model._meta.db_table, source=PARENT_TABLE),
+                {'unit': granularity, 'start': start, 'end': end}
+            )
+            counts[granularity] = cursor.rowcount
+    return counts
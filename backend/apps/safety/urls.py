@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     ModerationTicketViewSet,
     CrowdAggregateIngestView,
+    CrowdAggregateBatchIngestView,
     PublicCrowdAggregateView,
     PublicDistrictRestrictionView,
     PublicEmergencyContactView
@@ -16,6 +17,7 @@ urlpatterns = [
     
     # Telemetry Ingest
     path('telemetry/crowd-aggregate', CrowdAggregateIngestView.as_view(), name='crowd-ingest'),
+    path('telemetry/crowd-aggregate/batch', CrowdAggregateBatchIngestView.as_view(), name='crowd-ingest-batch'),
     
     # Public Kiosk APIs
     path('public/crowd', PublicCrowdAggregateView.as_view(), name='public-crowd'),
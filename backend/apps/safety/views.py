@@ -1,13 +1,20 @@
+from adrf.generics import ListAPIView as AsyncListAPIView
 from rest_framework import viewsets, permissions, generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
-from .models import ModerationTicket, CrowdAggregate, DistrictRestriction, EmergencyContact
+from .models import ModerationTicket, CrowdAggregate, CurrentCrowdState, DistrictRestriction, EmergencyContact
 from .serializers import (
     ModerationTicketSerializer, ModerationActionSerializer,
-    CrowdAggregateSerializer, CrowdIngestSerializer,
+    CrowdAggregateSerializer, CrowdIngestSerializer, CurrentCrowdStateSerializer,
     DistrictRestrictionSerializer, EmergencyContactSerializer
 )
+from .parsers import GzipJSONParser, NDJSONParser
+from .signals import invalidate_crowd_cache
+from shared.cache import CROWD, EMERGENCY, RESTRICTIONS, cached_public_response, next_window_change
 from rbac.permissions import IsModerator
 
 class ModerationTicketViewSet(viewsets.ModelViewSet):
@@ -47,11 +54,83 @@ class CrowdAggregateIngestView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class PublicCrowdAggregateView(generics.ListAPIView):
+class CrowdAggregateBatchIngestView(APIView):
+    """
+    Batch ingest for edge devices.
+    Body: JSON array or NDJSON (application/x-ndjson) of crowd aggregates,
+    optionally gzip-compressed (Content-Encoding: gzip).
+    Valid items are written with bulk_create in chunks and folded into
+    CurrentCrowdState in one transaction; invalid items are reported per index.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [GzipJSONParser, NDJSONParser]
+    chunk_size = 500
+
+    def post(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            return Response({'detail': 'Expected a list of aggregates.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_batch = getattr(settings, 'CROWD_INGEST_MAX_BATCH', 1000)
+        if len(items) > max_batch:
+            return Response({'detail': f'Batch too large (max {max_batch}).'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Validate every item with one serializer instance (no per-item save round trip)
+        validator = CrowdIngestSerializer()
+        results = []
+        aggregates = []
+        for index, item in enumerate(items):
+            try:
+                data = validator.run_validation(item)
+            except ValidationError as exc:
+                results.append({'index': index, 'status': 'invalid', 'errors': exc.detail})
+                continue
+            aggregate = CrowdAggregate(**data)
+            aggregates.append(aggregate)
+            results.append({'index': index, 'status': 'created', 'id': str(aggregate.id)})
+
+        if aggregates:
+            with transaction.atomic():
+                CrowdAggregate.objects.bulk_create(aggregates, batch_size=self.chunk_size)
+                CurrentCrowdState.objects.upsert_from(aggregates)
+            invalidate_crowd_cache(aggregates)
+
+        created = len(aggregates)
+        failed = len(items) - created
+        response_status = status.HTTP_201_CREATED if not failed else status.HTTP_207_MULTI_STATUS
+        return Response({
+            'created': created,
+            'failed': failed,
+            'results': results
+        }, status=response_status)
+
+class PublicCrowdAggregateView(AsyncListAPIView):
+    """
+    Crowd readings for kiosks.
+    - ?latest=true: current state per hotspot from CurrentCrowdState
+      (unique-key lookup, independent of history size).
+    - default: 10 most recent history rows.
+    """
     serializer_class = CrowdAggregateSerializer
     permission_classes = [permissions.AllowAny]
 
+    @cached_public_response(CROWD)
+    async def get(self, request, *args, **kwargs):
+        rows = [row async for row in self.get_queryset()]
+        return Response(self.get_serializer(rows, many=True).data)
+
+    def is_latest(self):
+        return self.request.query_params.get('latest', '').lower() in ('1', 'true', 'yes')
+
+    def get_serializer_class(self):
+        if self.is_latest():
+            return CurrentCrowdStateSerializer
+        return CrowdAggregateSerializer
+
     def get_queryset(self):
+        if self.is_latest():
+            return self.get_current_queryset()
+
         # Latest aggregate per district/hotspot? 
         # Or just list recent ones?
         # Requirement: "Return { density_state, timestamp, source='AGGREGATE' }"
@@ -72,14 +151,35 @@ class PublicCrowdAggregateView(generics.ListAPIView):
         # Let's limit to recent 10 to avoid dumping history.
         return qs[:10]
 
+    def get_current_queryset(self):
+        district_id = self.request.query_params.get('district_id')
+        hotspot_id = self.request.query_params.get('hotspot_id')
+
+        qs = CurrentCrowdState.objects.all()
+        if district_id:
+            qs = qs.filter(district_id=district_id)
+        if hotspot_id:
+            qs = qs.filter(hotspot_id=hotspot_id)
+        return qs.order_by('district_id', 'hotspot_id')[:100]
+
 class PublicDistrictRestrictionView(generics.ListAPIView):
     serializer_class = DistrictRestrictionSerializer
     permission_classes = [permissions.AllowAny]
 
+    @cached_public_response(RESTRICTIONS)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_cache_timeout(self):
+        return next_window_change(self.get_district_queryset())
+
     def get_queryset(self):
-        district_id = self.request.query_params.get('district_id')
         now = timezone.now()
-        qs = DistrictRestriction.objects.filter(start_at__lte=now, end_at__gte=now)
+        return self.get_district_queryset().filter(start_at__lte=now, end_at__gte=now)
+
+    def get_district_queryset(self):
+        district_id = self.request.query_params.get('district_id')
+        qs = DistrictRestriction.objects.all()
         
         if district_id:
             qs = qs.filter(district_id=district_id)
@@ -90,6 +190,10 @@ class PublicEmergencyContactView(generics.ListAPIView):
     serializer_class = EmergencyContactSerializer
     permission_classes = [permissions.AllowAny]
 
+    @cached_public_response(EMERGENCY)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def get_queryset(self):
         district_id = self.request.query_params.get('district_id')
         qs = EmergencyContact.objects.filter(active=True)
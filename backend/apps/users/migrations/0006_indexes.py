@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_user_address_user_country_user_identity_type_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="connectcode",
+            index=models.Index(
+                condition=models.Q(("is_used", False)),
+                fields=["code", "expires_at"],
+                name="connectcode_unused",
+            ),
+        ),
+    ]
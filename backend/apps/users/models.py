@@ -75,6 +75,13 @@ class ConnectCode(models.Model):
     expires_at = models.DateTimeField()
     is_used = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Kiosk login looks up unused codes only
+            models.Index(fields=['code', 'expires_at'], name='connectcode_unused',
+                         condition=models.Q(is_used=False)),
+        ]
+
     def is_valid(self):
         from django.utils import timezone
         return not self.is_used and self.expires_at > timezone.now()
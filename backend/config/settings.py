@@ -1,5 +1,7 @@
+import copy
 from pathlib import Path
 from decouple import config, Csv
+from django.core.exceptions import ImproperlyConfigured
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -23,6 +25,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third Party
     'rest_framework',
@@ -46,6 +49,7 @@ INSTALLED_APPS = [
     'kiosk', # New Kiosk Experience App
     'reco', # Recommendation Engine (Isolated)
     'broadcasts', # Government Broadcasts
+    'realtime', # Kiosk push (SSE)
 ]
 
 MIDDLEWARE = [
@@ -58,8 +62,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # Custom Middlewares
-    'core.middleware.KioskIsolationMiddleware',
-    'rbac.middleware.RbacEnforcementMiddleware',
+    'core.middleware.AccessPolicyMiddleware',
+    'core.middleware.ReplicaReadMiddleware',
     'audit.middleware.AuditLogMiddleware',
 ]
 
@@ -82,6 +86,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 
 # Database
@@ -94,6 +99,28 @@ DB_HOST = config('DB_HOST', default='localhost')
 DB_PORT = config('DB_PORT', default='5432')
 
 
+# asgi | wsgi: how gunicorn.conf.py serves the app (read here for the DB default below)
+SERVER_MODE = config('SERVER_MODE', default='asgi')
+
+# Connection handling, DB_CONN_MODE:
+# - persistent: each worker thread keeps its connection for DB_CONN_MAX_AGE seconds,
+#   health-checked before reuse (WSGI default)
+# - pool: psycopg 3 pool per process, DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections
+#   (ASGI default)
+# - pgbouncer: connect to PgBouncer in transaction-pooling mode (DB_HOST/DB_PORT point
+#   at PgBouncer); no server-side cursors, prepared statements stay off
+# - direct: new connection per request
+# persistent is refused under ASGI: async requests run on varying threads, so every
+# thread would keep its own idle connection open.
+DB_CONN_MODE = config('DB_CONN_MODE', default='') or ('pool' if SERVER_MODE == 'asgi' else 'persistent')
+if DB_CONN_MODE == 'persistent' and SERVER_MODE == 'asgi':
+    raise ImproperlyConfigured("DB_CONN_MODE=persistent leaks connections under ASGI; use pool or pgbouncer")
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=2, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=10, cast=int)
+# Seconds a request waits for a free pooled connection before erroring
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=float)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -102,8 +129,43 @@ DATABASES = {
         'PASSWORD': DB_PASSWORD,
         'HOST': DB_HOST,
         'PORT': DB_PORT,
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE if DB_CONN_MODE in ('persistent', 'pgbouncer') else 0,
+        'CONN_HEALTH_CHECKS': DB_CONN_MODE in ('persistent', 'pgbouncer'),
+        'DISABLE_SERVER_SIDE_CURSORS': DB_CONN_MODE == 'pgbouncer',
+        'OPTIONS': {},
     }
 }
+if DB_CONN_MODE == 'pool':
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': DB_POOL_MIN_SIZE,
+        'max_size': DB_POOL_MAX_SIZE,
+        'timeout': DB_POOL_TIMEOUT,
+        'name': 'default',
+    }
+elif DB_CONN_MODE not in ('persistent', 'pgbouncer', 'direct'):
+    raise ImproperlyConfigured(f"Unknown DB_CONN_MODE {DB_CONN_MODE!r}")
+
+# Read replicas (same credentials and connection mode as the primary). Public GETs
+# under REPLICA_READ_PREFIXES read from one of them; see shared.db.PrimaryReplicaRouter.
+DB_REPLICA_HOSTS = config('DB_REPLICA_HOSTS', default='', cast=Csv())
+DATABASE_REPLICAS = []
+for index, host in enumerate(h for h in DB_REPLICA_HOSTS if h):
+    alias = f'replica_{index}'
+    replica = copy.deepcopy(DATABASES['default'])
+    replica.update(HOST=host, TEST={'MIRROR': 'default'})
+    if 'pool' in replica['OPTIONS']:
+        replica['OPTIONS']['pool']['name'] = alias
+    DATABASES[alias] = replica
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['shared.db.PrimaryReplicaRouter']
+REPLICA_READ_PREFIXES = config('REPLICA_READ_PREFIXES', cast=Csv(), default=','.join([
+    '/api/v1/listings/hotspots/', '/api/v1/listings/public/sights/', '/api/public/',
+    '/api/v1/safety/public/', '/api/v1/public/broadcasts', '/api/v1/kiosk/discover/', '/api/v1/kiosk/feed/',
+]))
+# After a successful write, that client reads from the primary for this long (cookie),
+# and cache misses in the changed scope do too; keep above the replicas' typical lag.
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=10, cast=int)
+REPLICA_PIN_COOKIE = 'db_pin'
 
 
 # Password validation
@@ -164,10 +226,72 @@ REST_FRAMEWORK = {
 
 # CORS
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='http://localhost:3000,http://localhost:3001,http://localhost:5173,http://localhost:5174, http://localhost:5175, http://localhost:5176', cast=Csv())
+# Kiosk clients read ETag to send If-None-Match on their next poll
+CORS_EXPOSE_HEADERS = ['ETag']
 
 # Celery
 CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379/0')
 
-# Feature Flags
+# Feature Flags (features.services): seconds a process trusts its flag snapshot
+# before checking the shared version key
+FEATURE_FLAG_CHECK_SECONDS = config('FEATURE_FLAG_CHECK_SECONDS', default=5, cast=float)
+# Reco engine state while no `reco_engine` FeatureFlag row exists
 RECO_FEATURE_FLAG = config('RECO_FEATURE_FLAG', default=True, cast=bool)
+
+# Reco candidate snapshot: upper bound (seconds) on staleness for hotspot
+# changes made in other worker processes. Same-process changes invalidate immediately.
+RECO_SNAPSHOT_TTL = config('RECO_SNAPSHOT_TTL', default=300, cast=int)
+
+# Crowd readings older than this are ignored by the reco crowd penalty
+RECO_CROWD_STALENESS_SECONDS = config('RECO_CROWD_STALENESS_SECONDS', default=1800, cast=int)
+
+# Max aggregates accepted per batch telemetry request
+CROWD_INGEST_MAX_BATCH = config('CROWD_INGEST_MAX_BATCH', default=1000, cast=int)
+
+# Shared cache: Redis so every worker reads the same entries.
+# Set CACHE_URL=locmem:// for local development without Redis.
+CACHE_URL = config('CACHE_URL', default='redis://localhost:6379/1')
+if CACHE_URL.startswith('locmem://'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+            'KEY_PREFIX': 'safar',
+        }
+    }
+
+# Public response cache: entries are invalidated by per-district version bumps;
+# this timeout only bounds memory for keys nobody asks for again.
+PUBLIC_CACHE_TIMEOUT = config('PUBLIC_CACHE_TIMEOUT', default=6 * 60 * 60, cast=int)
+
+# Kiosk SSE stream (realtime app). One poller per process reads the event log.
+REALTIME_POLL_INTERVAL = config('REALTIME_POLL_INTERVAL', default=1.0, cast=float)
+REALTIME_HEARTBEAT_SECONDS = config('REALTIME_HEARTBEAT_SECONDS', default=15, cast=int)
+# Max events replayed for Last-Event-ID; further behind gets a `reset` event
+REALTIME_REPLAY_LIMIT = config('REALTIME_REPLAY_LIMIT', default=500, cast=int)
+# Events buffered per connection before a slow client is dropped (it resumes via Last-Event-ID)
+REALTIME_SUBSCRIBER_QUEUE = config('REALTIME_SUBSCRIBER_QUEUE', default=100, cast=int)
+REALTIME_EVENT_RETENTION_HOURS = config('REALTIME_EVENT_RETENTION_HOURS', default=48, cast=int)
+
+# Path policy (core.middleware.AccessPolicyMiddleware), compiled once at startup.
+# Prefixes blocked for requests carrying X-Kiosk-ID
+ACCESS_POLICY_KIOSK_BLOCKED = config(
+    'ACCESS_POLICY_KIOSK_BLOCKED', default='/api/v1/users/me/,/api/v1/auth/signup/,/api/v1/bookings/', cast=Csv())
+# Prefixes limited to superusers and the roles below
+ACCESS_POLICY_ADMIN_PREFIXES = config('ACCESS_POLICY_ADMIN_PREFIXES', default='/admin/', cast=Csv())
+ACCESS_POLICY_ADMIN_ROLES = config('ACCESS_POLICY_ADMIN_ROLES', default='ADMIN,SUPER_ADMIN', cast=Csv())
+
+# Audit pipeline (audit.pipeline): entries are queued per process and bulk-written by a background thread
+AUDIT_QUEUE_SIZE = config('AUDIT_QUEUE_SIZE', default=10000, cast=int)
+AUDIT_BATCH_SIZE = config('AUDIT_BATCH_SIZE', default=500, cast=int)
+AUDIT_FLUSH_INTERVAL = config('AUDIT_FLUSH_INTERVAL', default=1.0, cast=float)
+# Full queue: 'block' (wait AUDIT_BLOCK_SECONDS, then write inline), 'inline' or 'drop'
+AUDIT_OVERFLOW = config('AUDIT_OVERFLOW', default='block')
+AUDIT_BLOCK_SECONDS = config('AUDIT_BLOCK_SECONDS', default=0.05, cast=float)
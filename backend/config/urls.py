@@ -12,6 +12,8 @@ urlpatterns = [
     path('api/', include('reco.urls')), # Recommendation Engine (Exposed at /api/public/...)
     path('api/v1/', include('broadcasts.urls')), # Includes public/broadcasts and admin/broadcasts
     path('api/v1/bookings/', include('bookings.urls')),
+    path('api/v1/realtime/', include('realtime.urls')),
+    path('api/v1/ops/', include('core.urls')),
 ]
 
 # Admin Branding
@@ -0,0 +1,22 @@
+"""
+Gunicorn settings. SERVER_MODE selects the entry point:
+- asgi (default): config.asgi with uvicorn workers; async views and SSE
+  streams wait on slow kiosk links without holding a thread each.
+- wsgi: config.wsgi with threaded sync workers.
+config/settings.py reads SERVER_MODE too, to pick the DB connection mode.
+"""
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+
+if os.environ.get('SERVER_MODE', 'asgi') == 'wsgi':
+    wsgi_app = 'config.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS', 4))
+else:
+    wsgi_app = 'config.asgi:application'
+    # Heartbeats come from the event loop, not per request: open SSE streams never
+    # trip `timeout`, while a loop blocked by sync code still gets the worker restarted
+    worker_class = 'uvicorn_worker.UvicornWorker'
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import logging
+import time
+from contextlib import nullcontext
+from functools import partial, wraps
+from inspect import iscoroutinefunction
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from shared.db import primary_reads, replica_aliases
+
+logger = logging.getLogger(__name__)
+
+# Version slots per scope:
+# - GLOBAL: content without a district (global broadcasts, contacts); part of every key
+# - ALL_DISTRICTS: requests that don't filter by district; bumped by any district change
+GLOBAL = '*'
+ALL_DISTRICTS = ''
+
+# Scopes shared by views and invalidation signals
+HOTSPOTS = 'hotspots'
+BROADCASTS = 'broadcasts'
+RESTRICTIONS = 'restrictions'
+EMERGENCY = 'emergency'
+CROWD = 'crowd'
+# Not a response scope: version of the feature flag table (features.services)
+FEATURES = 'features'
+
+def normalize_district(district) -> str:
+    return (district or '').strip().lower()
+
+def _version_key(scope: str, part: str) -> str:
+    return f"ver:{scope}:{part}"
+
+def _fresh_version() -> int:
+    # Time-based seed: a version key that was evicted never restarts at a
+    # number an old cached response was stored under.
+    return int(time.time() * 1000)
+
+def get_versions(scope: str, district=None) -> str:
+    """Current '<global>.<district>' version for a scope, e.g. '1718000000000.1718000000042'."""
+    keys = [_version_key(scope, GLOBAL), _version_key(scope, normalize_district(district))]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _fresh_version(), timeout=None)
+            found[key] = cache.get(key)
+    return f"{found[keys[0]]}.{found[keys[1]]}"
+
+def _recent_key(scope: str, part: str) -> str:
+    return f"recent:{scope}:{part}"
+
+def recently_changed(scope: str, district=None) -> bool:
+    """
+    True for REPLICA_STICKY_SECONDS after a bump that covers this district.
+    Cache misses then read from the primary, so a lagging replica never
+    fills the new version's entry with pre-change rows.
+    """
+    if not replica_aliases():
+        return False
+    return bool(cache.get_many([_recent_key(scope, GLOBAL), _recent_key(scope, normalize_district(district))]))
+
+def _incr(key: str):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), timeout=None)
+
+def bump_versions(scope: str, district=None):
+    """
+    Invalidate cached public responses for a scope.
+    - district given: that district plus the cross-district listings
+    - district None/'': global content, so every key in the scope
+    Never raises: a cache outage must not break the write that triggered it.
+    """
+    try:
+        district = normalize_district(district)
+        parts = [district, ALL_DISTRICTS] if district else [GLOBAL]
+        for part in parts:
+            _incr(_version_key(scope, part))
+        if replica_aliases():
+            cache.set_many({_recent_key(scope, part): 1 for part in parts}, settings.REPLICA_STICKY_SECONDS)
+    except Exception as exc:
+        logger.warning("Cache version bump failed for %s/%s: %s", scope, district, exc)
+
+def bump_versions_on_commit(scope: str, district=None):
+    """
+    bump_versions once the current transaction commits (at once in autocommit).
+    Bumping earlier lets a concurrent cache miss read the pre-commit rows and
+    store them under the new version, where they would stay until the timeout.
+    """
+    transaction.on_commit(partial(bump_versions, scope, district))
+
+def request_district(request, params) -> str:
+    for param in params:
+        value = request.query_params.get(param)
+        if value:
+            return value
+    return ''
+
+def response_cache_key(scope: str, versions: str, request) -> str:
+    # Full path covers filters and cursors; host because pagination links are absolute
+    raw = f"{request.get_host()}{request.get_full_path()}"
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f"resp:{scope}:{versions}:{digest}"
+
+def make_etag(versions: str, data) -> str:
+    """Strong ETag: district versions plus a digest of the body they produced."""
+    body = json.dumps(data, cls=JSONEncoder, sort_keys=True, separators=(',', ':'))
+    return f'"{versions}-{hashlib.md5(body.encode("utf-8")).hexdigest()[:16]}"'
+
+def etag_matches(request, etag: str) -> bool:
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    tags = parse_etags(header)
+    return '*' in tags or etag in tags or f"W/{etag}" in tags
+
+def _conditional_response(request, etag: str, data):
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+    response['ETag'] = etag
+    return response
+
+def next_window_change(queryset, start_field='start_at', end_field='end_at'):
+    """
+    Seconds until the next row in `queryset` enters or leaves its [start, end] window.
+    Time-windowed content changes without a write, so its cache entries must expire then.
+    """
+    now = timezone.now()
+    bounds = queryset.aggregate(
+        next_start=Min(start_field, filter=Q(**{f"{start_field}__gt": now})),
+        next_end=Min(end_field, filter=Q(**{f"{end_field}__gte": now})),
+    )
+    upcoming = [b for b in bounds.values() if b is not None]
+    if not upcoming:
+        return None
+    return max(int((min(upcoming) - now).total_seconds()) + 1, 1)
+
+def _lookup(scope: str, district_params, request):
+    """(versions, key, cached entry, whether a miss must read from the primary)"""
+    district = request_district(request, district_params)
+    versions = get_versions(scope, district)
+    key = response_cache_key(scope, versions, request)
+    entry = cache.get(key)
+    return versions, key, entry, entry is None and recently_changed(scope, district)
+
+def _cache_timeout(view) -> int:
+    timeout = settings.PUBLIC_CACHE_TIMEOUT
+    get_timeout = getattr(view, 'get_cache_timeout', None)
+    if get_timeout is not None:
+        timeout = min(get_timeout() or timeout, timeout)
+    return timeout
+
+def _store(scope: str, request, response, versions: str, key: str, timeout: int):
+    etag = make_etag(versions, response.data)
+    try:
+        cache.set(key, (etag, response.data), timeout)
+    except Exception as exc:
+        logger.warning("Public cache write failed for %s: %s", scope, exc)
+    if etag_matches(request, etag):
+        return _conditional_response(request, etag, None)
+    response['ETag'] = etag
+    return response
+
+def cached_public_response(scope: str, district_params=('district_id',)):
+    """
+    Cache a public GET handler's 200 response in the shared cache, with an ETag.
+
+        @cached_public_response(BROADCASTS)
+        def get(self, request, *args, **kwargs): ...
+
+    - Keys embed the scope's district versions, so `bump_versions` invalidates them.
+    - Each entry stores its ETag; a matching If-None-Match gets 304 straight
+      from the cache, without running the view or its queryset.
+    - Views may define `get_cache_timeout()` to expire earlier (e.g. time windows).
+    - Works on sync and async (`async def get`) handlers.
+    - Cache errors fall back to running the view (no ETag).
+    - Misses right after a change read from the primary (see `recently_changed`).
+    """
+    def decorator(method):
+        if iscoroutinefunction(method):
+            @wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                try:
+                    versions, key, entry, primary = await sync_to_async(_lookup, thread_sensitive=False)(
+                        scope, district_params, request)
+                except Exception as exc:
+                    logger.warning("Public cache unavailable for %s: %s", scope, exc)
+                    return await method(view, request, *args, **kwargs)
+                if entry is not None:
+                    return _conditional_response(request, *entry)
+
+                with primary_reads() if primary else nullcontext():
+                    response = await method(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                timeout = await sync_to_async(_cache_timeout)(view)  # may query (time windows)
+                return await sync_to_async(_store, thread_sensitive=False)(
+                    scope, request, response, versions, key, timeout)
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            try:
+                versions, key, entry, primary = _lookup(scope, district_params, request)
+            except Exception as exc:
+                logger.warning("Public cache unavailable for %s: %s", scope, exc)
+                return method(view, request, *args, **kwargs)
+            if entry is not None:
+                return _conditional_response(request, *entry)
+
+            with primary_reads() if primary else nullcontext():
+                response = method(view, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            return _store(scope, request, response, versions, key, _cache_timeout(view))
+        return wrapper
+    return decorator
@@ -0,0 +1,53 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Alias ORM reads go to in the current request/task; None means the primary
+_read_alias: ContextVar[Optional[str]] = ContextVar('read_alias', default=None)
+
+def replica_aliases() -> List[str]:
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+def current_read_alias() -> str:
+    return _read_alias.get() or DEFAULT_DB_ALIAS
+
+@contextmanager
+def replica_reads():
+    """Send reads in this block to one replica (picked per block); no-op without replicas."""
+    aliases = replica_aliases()
+    token = _read_alias.set(random.choice(aliases) if aliases else None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+@contextmanager
+def primary_reads():
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+class PrimaryReplicaRouter:
+    """
+    - Reads go to a replica only inside `replica_reads()`
+      (public GETs, see core.middleware.ReplicaReadMiddleware).
+    - A write sends the rest of that block's reads to the primary (read-your-writes).
+    - Writes, and rows loaded from a replica when saved, always go to the primary.
+    """
+    def db_for_read(self, model, **hints):
+        return current_read_alias()
+
+    def db_for_write(self, model, **hints):
+        _read_alias.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # replicas mirror the primary
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,156 @@
+import base64
+import datetime
+import json
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+def _cursor_value(value):
+    # Full precision: a cursor rounded to milliseconds would skip or repeat rows
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination on every column of `ordering`, e.g. (updated_at, id).
+    The cursor carries the sort key of the page's edge row, and the next page is
+    `WHERE (a, id) < (x, y)` (expanded to `a <= x AND (a < x OR (a = x AND id < y))`
+    so a composite index on (a, id) serves it). Ties on the leading column cost
+    nothing extra: there is no COUNT(*), no OFFSET and no cutoff.
+    All `ordering` columns must sort in the same direction; the last one must be unique.
+    Response: {next, previous, results}, same shape as DRF's CursorPagination.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 20
+    page_size_query_param = None
+    max_page_size = None
+    ordering = ('-id',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.fields, descending = self._parse_ordering(self.ordering)
+        position, reverse = self.decode_cursor(request)
+
+        # A previous page is read backwards from the page's first row, then flipped
+        scan_descending = descending != reverse
+        queryset = queryset.order_by(*[('-' if scan_descending else '') + f for f in self.fields])
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._seek(position, scan_descending))
+            except (ValidationError, ValueError, TypeError):  # tampered cursor values
+                raise NotFound(self.invalid_cursor_message)
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = rows
+        return rows
+
+    def _parse_ordering(self, ordering):
+        directions = {field.startswith('-') for field in ordering}
+        if len(directions) != 1:
+            raise ImproperlyConfigured(f"{type(self).__name__}.ordering must sort every column the same way")
+        return [field.lstrip('-') for field in ordering], directions.pop()
+
+    def _seek(self, position, descending):
+        """Rows strictly after `position` in scan order, as a row-value comparison."""
+        op = 'lt' if descending else 'gt'
+        condition = None
+        for field, value in reversed(list(zip(self.fields, position))):
+            after = Q(**{f'{field}__{op}': value})
+            condition = after if condition is None else after | (Q(**{field: value}) & condition)
+        first, value = self.fields[0], position[0]
+        # Redundant leading bound: lets the planner range-scan the index on the first column
+        return Q(**{f"{first}__{'lte' if descending else 'gte'}": value}) & condition
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size) if self.max_page_size else size
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = data['p'], bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, row, reverse=False):
+        data = {'p': [getattr(row, field) for field in self.fields]}
+        if reverse:
+            data['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(data, default=_cursor_value).encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        return self.encode_cursor(self.page[-1]) if self.has_next and self.page else None
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:  # stepped past the end: start over from the top
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+class UpdatedCursorPagination(KeysetPagination):
+    """Keyset pagination on (updated_at, id), most recently updated first."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-updated_at', '-id')
+
+class CreatedCursorPagination(UpdatedCursorPagination):
+    """Keyset pagination on (created_at, id), newest first."""
+    ordering = ('-created_at', '-id')
+
+class RankedCursorPagination(KeysetPagination):
+    """
+    Keyset pagination for ranked results.
+    Views set `ordering` per request (e.g. ('-tag_overlap', '-id')); annotated
+    rank columns work like model fields.
+    """
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 50
+    ordering = ('-id',)
@@ -0,0 +1,20 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for per-endpoint query budgets.
+
+        self.assertQueryBudget(3, self.client.get, '/api/v1/listings/hotspots/')
+
+    Fails if the call runs more than `budget` queries and lists the SQL that ran.
+    Returns the response so callers can keep asserting on it.
+    """
+    def assertQueryBudget(self, budget, func, *args, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            result = func(*args, **kwargs)
+        executed = len(ctx.captured_queries)
+        if executed > budget:
+            queries = "\n".join(f"{i}. {q['sql']}" for i, q in enumerate(ctx.captured_queries, start=1))
+            self.fail(f"{executed} queries executed, budget is {budget}:\n{queries}")
+        return result
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useAuth } from '../../context/AuthContext';
 import { Button } from '../../components/ui/Button';
 import { Check, Eye, FileText } from 'lucide-react';
-import api from '../../services/api';
+import api, { getAllPages } from '../../services/api';
 
 const AdminDashboard = () => {
     const { token, logout } = useAuth();
@@ -12,10 +12,8 @@ const AdminDashboard = () => {
     const fetchQueue = async () => {
         setLoading(true);
         try {
-            // Fetch all for now, filter client side or use search param
-            const response = await api.get('/listings/mod/hotspots/');
-            // Filter only UNDER_REVIEW
-            setQueue(response.data.filter((h: any) => h.status === 'UNDER_REVIEW'));
+            // Filtered server-side; every page, not just the most recently updated
+            setQueue(await getAllPages('/listings/mod/hotspots/', { status: 'UNDER_REVIEW' }));
         } catch (error) {
             console.error("Fetch failed", error);
         } finally {
@@ -43,16 +43,24 @@ const TravelerHome = () => {
                     headers['Authorization'] = `Bearer ${token}`;
                 }
 
-                const response = await fetch(`${API_BASE}/listings/hotspots/`, {
-                    headers: headers
-                });
-
-                if (response.ok) {
+                // Cursor-paginated: { next, previous, results }; search filters the full list
+                const all: Hotspot[] = [];
+                let next: string | null = `${API_BASE}/listings/hotspots/`;
+                while (next) {
+                    const response = await fetch(next, { headers: headers });
+                    if (!response.ok) {
+                        console.error("Failed to fetch hotspots");
+                        break;
+                    }
                     const data = await response.json();
-                    setHotspots(data);
-                } else {
-                    console.error("Failed to fetch hotspots");
+                    if (Array.isArray(data)) {
+                        all.push(...data);
+                        break;
+                    }
+                    all.push(...(data.results || []));
+                    next = data.next;
                 }
+                setHotspots(all);
             } catch (error) {
                 console.error("Error fetching hotspots:", error);
             } finally {
@@ -31,4 +31,18 @@ api.interceptors.response.use(
     }
 );
 
+// Cursor-paginated lists: follow `next` until the last page
+export const getAllPages = async <T = any>(url: string, params?: Record<string, string>): Promise<T[]> => {
+    const items: T[] = [];
+    let next: string | null = url;
+    while (next) {
+        const response: { data: any } = await api.get(next, { params });
+        if (Array.isArray(response.data)) return response.data;
+        items.push(...(response.data.results || []));
+        next = response.data.next;
+        params = undefined; // `next` already carries the query string
+    }
+    return items;
+};
+
 export default api;
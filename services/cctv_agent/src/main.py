@@ -1,5 +1,5 @@
+import queue
 import threading
-import time
 import logging
 import yaml
 import uvicorn
@@ -8,9 +8,10 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from .api import app as api_app
-from .ingestion import VideoStream
-from .processing import FrameProcessor
-from .storage import init_db, SessionLocal, save_aggregate
+from .pipeline import CameraConfig, Pipeline
+from .aggregation import WindowedAggregator
+from .storage import init_db, SessionLocal, flush_aggregates, run_retention, high_water_mark
+from .uplink import Uplink
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -29,103 +30,142 @@ def load_config():
 # Global flag to stop threads
 STOP_EVENT = threading.Event()
 
+# Running pipeline, for the /pipeline stats endpoint
+PIPELINE = None
+
+# Backend uplink (None when not configured), for retention and /uplink
+UPLINK = None
+
 def processing_loop():
+    global PIPELINE
     logger.info("Starting processing loop...")
-    init_db()
     config = load_config()
-    
-    # Initialize streams
-    streams = []
-    processor = FrameProcessor()
-    
+    pipeline_config = config.get('pipeline') or {}
+    default_fps = float(pipeline_config.get('default_fps', 1.0))
+
+    cameras = []
     for cam in config.get('cameras', []):
         try:
-            # Check if source is a file or stream
-            # For this MVP, we assume files are local paths in 'data/samples/'
-            source = cam['source']
-            is_file = False
-            
-            # Simple heuristic for file vs stream url
-            if not source.startswith('rtsp://') and not source.startswith('http'):
-                 is_file = True
-                 # Adjust path if relative
-                 if not os.path.isabs(source):
-                     source = os.path.join("data", "samples", source)
-
-            stream = VideoStream(source, is_file=is_file)
-            streams.append({
-                "stream": stream,
-                "id": cam['id'],
-                "district_id": cam['district_id']
-            })
-            logger.info(f"Initialized camera {cam['id']} for district {cam['district_id']}")
+            cameras.append(CameraConfig.from_dict(cam, default_fps))
         except Exception as e:
             logger.error(f"Failed to init camera {cam.get('id')}: {e}")
 
-    # Main Loop
-    # In a real system, we might use multiprocessing or async properly.
-    # Here, we sequentially process frames from all cameras.
+    if not cameras:
+        logger.warning("No cameras configured. Processing loop idle.")
+        STOP_EVENT.wait()
+        return
+
+    # Decoding and detection run in the pipeline; this thread is the only DB writer
+    pipeline = Pipeline(
+        cameras,
+        workers=pipeline_config.get('workers'),
+        results_size=int(pipeline_config.get('results_queue', 10000)),
+        motion_threshold=float(pipeline_config.get('motion_threshold', 0)),
+        max_detect_interval=float(pipeline_config.get('max_detect_interval', 30)),
+    )
+    pipeline.start()
+    PIPELINE = pipeline
     db = SessionLocal()
-    
+
+    # One row per camera per window (plus immediate rows on density changes),
+    # written in one transaction per loop pass instead of one per frame
+    aggregator = WindowedAggregator(float((config.get('aggregation') or {}).get('window_seconds', 60)))
+
+    # Rows a failed write left behind (other writers: retention, uplink mark)
+    pending = []
     while not STOP_EVENT.is_set():
-        if not streams:
-            logger.warning("No active streams. Sleeping...")
-            time.sleep(5)
-            continue
-
-        for item in streams:
-            stream = item['stream']
-            frame = stream.get_frame()
-            
-            if frame is not None:
-                # Process
-                count, _, density_state = processor.process_frame(frame)
-                
-                # Log to DB (Throttling: In real production, we wouldn't write EVERY frame.
-                # maybe every 5 seconds or 1 minute average.)
-                # For this pilot implementation/demo, we'll write every ~Nth frame or just simple sleep.
-                
-                # Let's aggregate 1 reading per 5 seconds per camera to save DB space
-                # But here in the loop, we are running fast.
-                
-                # Implementation: Just write it for now, let's assume low framerate in loop.
-                aggregate = {
-                    "district_id": item['district_id'],
-                    "camera_id": item['id'],
-                    "count": count,
-                    "density_state": density_state,
-                    "flow_rate": 0.0 # Placeholder
-                }
-                
-                # Only log if changed or periodically? 
-                # Let's log periodically.
-                # (Skipping sophisticated throttling for this MVP code, just log execution)
-                
-                save_aggregate(db, aggregate)
-                logger.debug(f"Cam {item['id']}: Count={count}, Density={density_state.value}")
-
-        # Sleep to simulate interval (e.g., 1 frame per second processing rate)
-        time.sleep(1)
+        try:
+            result = pipeline.results.get(timeout=1)
+            while True:
+                pending.extend(aggregator.add(result))
+                logger.debug(f"Cam {result.camera_id}: Count={result.count}, Density={result.density_state.value}")
+                result = pipeline.results.get_nowait()
+        except queue.Empty:
+            pass
+        pending.extend(aggregator.due())
+        pending = flush_aggregates(db, pending)
 
+    flush_aggregates(db, pending + aggregator.drain())
     db.close()
-    for item in streams:
-        item['stream'].release()
+    pipeline.stop()
     logger.info("Processing loop stopped.")
 
+def retention_loop():
+    """Downsamples and prunes old aggregates in the background (see storage.run_retention)."""
+    retention = load_config().get('retention') or {}
+    interval = float(retention.get('interval_minutes', 60)) * 60
+    while not STOP_EVENT.wait(interval):
+        db = SessionLocal()
+        try:
+            run_retention(
+                db,
+                raw_days=float(retention.get('raw_days', 7)),
+                hourly_days=float(retention.get('hourly_days', 365)),
+                vacuum_pages=int(retention.get('vacuum_pages', 1000)),
+                # Rows the backend hasn't accepted yet stay at full resolution
+                max_id=high_water_mark(db, UPLINK.name) if UPLINK is not None else None,
+            )
+        except Exception as e:
+            logger.error(f"Retention pass failed: {e}")
+        finally:
+            db.close()
+
+def build_uplink(config: dict):
+    """Uplink from the `uplink` config section; credentials come from the environment."""
+    uplink = config.get('uplink') or {}
+    url = os.getenv("UPLINK_URL", uplink.get('url'))
+    if not url:
+        return None
+    return Uplink(
+        url,
+        SessionLocal,
+        token=os.getenv("UPLINK_TOKEN"),
+        email=os.getenv("UPLINK_EMAIL"),
+        password=os.getenv("UPLINK_PASSWORD"),
+        hotspots={cam['id']: cam['hotspot_id'] for cam in config.get('cameras', []) if cam.get('hotspot_id')},
+        batch_size=int(uplink.get('batch_size', 500)),
+        interval=float(uplink.get('interval_seconds', 10)),
+        backoff_max=float(uplink.get('backoff_max_seconds', 300)),
+        timeout=float(uplink.get('timeout_seconds', 10)),
+    )
+
 # FastAPI Lifecycle
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global UPLINK
     # Startup
-    t = threading.Thread(target=processing_loop, daemon=True)
-    t.start()
+    init_db()
+    UPLINK = build_uplink(load_config())
+    threads = [
+        threading.Thread(target=processing_loop, daemon=True),
+        threading.Thread(target=retention_loop, name="retention", daemon=True),
+    ]
+    if UPLINK is not None:
+        threads.append(threading.Thread(target=UPLINK.run, args=(STOP_EVENT,), name="uplink", daemon=True))
+    for t in threads:
+        t.start()
     yield
     # Shutdown
     STOP_EVENT.set()
-    t.join(timeout=2)
+    for t in threads:
+        t.join(timeout=2)
 
 # Mount the lifespan to the imported API app (or create a new wrapper)
 # Since we imported 'app' from .api, we should modify it.
 api_app.router.lifespan_context = lifespan
 
+@api_app.get("/pipeline")
+def pipeline_stats():
+    """
+    Per-camera processed/missed/failed detections and dropped frames.
+    A growing `missed` count means the camera's FPS target isn't being met.
+    """
+    return PIPELINE.stats() if PIPELINE is not None else {}
+
+@api_app.get("/uplink")
+def uplink_stats():
+    """Rows shipped to the backend, high-water mark and the current failure streak."""
+    return UPLINK.stats() if UPLINK is not None else {"enabled": False}
+
 if __name__ == "__main__":
     uvicorn.run("src.main:api_app", host="0.0.0.0", port=8000, reload=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
 import enum
@@ -13,12 +13,22 @@ class CrowdDensityState(str, enum.Enum):
 
 class AggregateStats(Base):
     __tablename__ = 'aggregates'
+    __table_args__ = (
+        # /stats filters by district and orders by time
+        Index('ix_aggregates_district_ts', 'district_id', 'timestamp'),
+        # ids never go backwards, even after retention deletes the newest rows (uplink high-water mark)
+        {'sqlite_autoincrement': True},
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    district_id = Column(String, index=True, nullable=False)
+    district_id = Column(String, nullable=False)
     camera_id = Column(String, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
-    count = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False) # Mean over the aggregation window
+    count_max = Column(Integer, nullable=True)
+    count_p95 = Column(Float, nullable=True)
+    samples = Column(Integer, nullable=True) # Frames folded into this row
+    resolution = Column(String, nullable=True) # None: aggregation window, 'hour': downsampled by retention
     density_state = Column(SQLEnum(CrowdDensityState), nullable=False)
     flow_rate = Column(Float, nullable=True) # People per minute approximation
 
@@ -29,6 +39,18 @@ class AggregateStats(Base):
             "camera_id": self.camera_id,
             "timestamp": self.timestamp.isoformat(),
             "count": self.count,
+            "count_max": self.count_max,
+            "count_p95": self.count_p95,
+            "samples": self.samples,
+            "resolution": self.resolution,
             "density_state": self.density_state.value,
             "flow_rate": self.flow_rate
         }
+
+class UplinkState(Base):
+    """Durable progress of a shipping target: every window row with id <= last_id was accepted."""
+    __tablename__ = 'uplink_state'
+
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,274 @@
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import NamedTuple, Optional
+
+from .ingestion import VideoStream
+from .models import CrowdDensityState
+from .processing import FrameProcessor, MotionGate
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CameraConfig:
+    id: str
+    district_id: str
+    source: str
+    is_file: bool
+    fps: float
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.fps
+
+    @classmethod
+    def from_dict(cls, cam: dict, default_fps: float = 1.0) -> "CameraConfig":
+        source = cam['source']
+        # Simple heuristic for file vs stream url
+        is_file = not source.startswith('rtsp://') and not source.startswith('http')
+        if is_file and not os.path.isabs(source):
+            # For this MVP, files are local paths in 'data/samples/'
+            source = os.path.join("data", "samples", source)
+        return cls(
+            id=cam['id'],
+            district_id=cam['district_id'],
+            source=source,
+            is_file=is_file,
+            fps=float(cam.get('fps', default_fps)),
+        )
+
+class FrameResult(NamedTuple):
+    camera_id: str
+    district_id: str
+    count: int
+    density_state: CrowdDensityState
+    captured_at: datetime
+
+class LatestFrame:
+    """
+    Single-slot buffer between a decoder and the scheduler: a new frame replaces
+    one nobody picked up (counted in `dropped`), so detection always sees the
+    newest frame and a slow consumer never builds a backlog.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self._captured_at = None
+        self.dropped = 0
+
+    def put(self, frame):
+        with self._lock:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = frame
+            self._captured_at = datetime.utcnow()
+
+    def take(self):
+        """(frame, captured_at), or (None, None) if nothing new arrived."""
+        with self._lock:
+            frame, captured_at = self._frame, self._captured_at
+            self._frame = self._captured_at = None
+            return frame, captured_at
+
+class CameraDecoder(threading.Thread):
+    """
+    Reads one camera into its LatestFrame slot.
+    Live streams are read continuously so the slot holds the newest frame
+    (a stalled RTSP read only stalls this camera); files are paced at the
+    camera's FPS instead of being decoded as fast as the CPU allows.
+    """
+    reconnect_delay = 5
+
+    def __init__(self, camera: CameraConfig, stop_event: threading.Event, stream_factory=VideoStream):
+        super().__init__(name=f"decoder-{camera.id}", daemon=True)
+        self.camera = camera
+        self.slot = LatestFrame()
+        self.stop_event = stop_event
+        self.stream_factory = stream_factory
+
+    def _open(self):
+        while not self.stop_event.is_set():
+            try:
+                return self.stream_factory(self.camera.source, is_file=self.camera.is_file)
+            except Exception as e:
+                logger.error(f"Failed to open camera {self.camera.id}: {e}. Retrying in {self.reconnect_delay}s")
+                self.stop_event.wait(self.reconnect_delay)
+        return None
+
+    def run(self):
+        stream = self._open()
+        if stream is None:
+            return
+        logger.info(f"Decoding camera {self.camera.id} for district {self.camera.district_id}")
+        try:
+            while not self.stop_event.is_set():
+                frame = stream.get_frame()
+                if frame is None:
+                    self.stop_event.wait(1)
+                    continue
+                self.slot.put(frame)
+                if self.camera.is_file:
+                    self.stop_event.wait(self.camera.interval)
+        finally:
+            stream.release()
+
+# Worker-process side: one FrameProcessor (HOG model) per process
+_worker_processor: Optional[FrameProcessor] = None
+
+def _init_worker():
+    global _worker_processor
+    _worker_processor = FrameProcessor()
+
+def detect(frame):
+    """Runs in a pool worker. Boxes stay in the worker; only the count crosses back."""
+    if _worker_processor is None:
+        _init_worker()
+    count, _, density_state = _worker_processor.process_frame(frame)
+    return count, density_state
+
+class CameraStats:
+    __slots__ = ('processed', 'missed', 'failed', 'skipped', 'discarded')
+
+    def __init__(self):
+        self.processed = 0
+        self.missed = 0  # sampling ticks skipped because the previous frame was still in detection
+        self.failed = 0
+        self.skipped = 0  # frames the motion gate answered with the last count
+        self.discarded = 0  # results dropped because `results` was full (DB writer stalled)
+
+class Pipeline:
+    """
+    Multi-camera pipeline:
+    - one CameraDecoder thread per camera feeding a latest-frame slot
+    - a scheduler thread that, every 1/fps seconds per camera, submits the
+      newest frame to a process pool of FrameProcessor workers (HOG runs
+      outside the GIL); at most one frame per camera is in flight
+    - with `motion_threshold`, a per-camera MotionGate runs first: frames with
+      no motion since the last detection reuse its count instead of going to
+      the pool, with a full detection at least every `max_detect_interval` s
+    - results are queued on `results` for a single consumer (the DB writer);
+      it holds at most `results_size`, newer results are dropped beyond that
+    """
+    def __init__(self, cameras, workers: Optional[int] = None, executor=None, stream_factory=VideoStream,
+                 motion_threshold: Optional[float] = None, max_detect_interval: float = 30.0,
+                 results_size: int = 10000):
+        self.cameras = list(cameras)
+        self.workers = workers or os.cpu_count() or 1
+        self.results: "queue.Queue[FrameResult]" = queue.Queue(maxsize=results_size)
+        self.stop_event = threading.Event()
+        self._executor = executor
+        self._stream_factory = stream_factory
+        self._decoders = []
+        self._scheduler = None
+        self._inflight = {}
+        self._stats = {cam.id: CameraStats() for cam in self.cameras}
+        self._gates = {}
+        if motion_threshold:
+            self._gates = {cam.id: MotionGate(motion_threshold, max_detect_interval) for cam in self.cameras}
+        self._last = {}  # camera id -> (count, density_state) of its last detection
+
+    def start(self):
+        if self._executor is None:
+            # spawn: forking a process that already runs decoder threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        self._decoders = [CameraDecoder(cam, self.stop_event, self._stream_factory) for cam in self.cameras]
+        for decoder in self._decoders:
+            decoder.start()
+        self._scheduler = threading.Thread(target=self._schedule, name="frame-scheduler", daemon=True)
+        self._scheduler.start()
+        logger.info(f"Pipeline started: {len(self.cameras)} cameras, {self.workers} workers")
+
+    def stop(self, timeout: float = 2):
+        self.stop_event.set()
+        if self._scheduler is not None:
+            self._scheduler.join(timeout)
+        for decoder in self._decoders:
+            decoder.join(timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule(self):
+        now = time.monotonic()
+        next_due = {decoder.camera.id: now for decoder in self._decoders}
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            for decoder in self._decoders:
+                cam = decoder.camera
+                if now < next_due[cam.id]:
+                    continue
+                # Fixed-rate ticks; after a stall, resume from now instead of bursting
+                next_due[cam.id] = max(next_due[cam.id] + cam.interval, now)
+                self._dispatch(decoder)
+            wait = min(next_due.values(), default=now + 1) - time.monotonic()
+            self.stop_event.wait(max(wait, 0.001))
+
+    def _dispatch(self, decoder: CameraDecoder):
+        cam = decoder.camera
+        if cam.id in self._inflight:
+            self._stats[cam.id].missed += 1
+            return
+        frame, captured_at = decoder.slot.take()
+        if frame is None:
+            return
+        gate = self._gates.get(cam.id)
+        if gate is not None and not gate.should_detect(frame) and cam.id in self._last:
+            # Gating runs here, not in the workers: they hold no per-camera state
+            self._stats[cam.id].skipped += 1
+            self._publish(FrameResult(cam.id, cam.district_id, *self._last[cam.id], captured_at))
+            return
+        try:
+            future = self._executor.submit(detect, frame)
+        except RuntimeError:
+            return  # executor shut down
+        self._inflight[cam.id] = future
+        future.add_done_callback(partial(self._done, cam, captured_at))
+
+    def _done(self, cam: CameraConfig, captured_at: datetime, future):
+        try:
+            if future.cancelled():
+                return
+            try:
+                count, density_state = future.result()
+            except Exception as e:
+                self._stats[cam.id].failed += 1
+                if cam.id in self._gates:
+                    self._gates[cam.id].reset()
+                logger.error(f"Detection failed for camera {cam.id}: {e}")
+                return
+            self._stats[cam.id].processed += 1
+            self._last[cam.id] = (count, density_state)
+            self._publish(FrameResult(cam.id, cam.district_id, count, density_state, captured_at))
+        finally:
+            # Released last, so the scheduler never sees this camera's gate mid-update
+            self._inflight.pop(cam.id, None)
+
+    def _publish(self, result: FrameResult):
+        try:
+            self.results.put_nowait(result)
+        except queue.Full:
+            self._stats[result.camera_id].discarded += 1
+
+    def stats(self) -> dict:
+        slots = {decoder.camera.id: decoder.slot for decoder in self._decoders}
+        return {
+            cam_id: {
+                "processed": s.processed,
+                "missed": s.missed,
+                "failed": s.failed,
+                "skipped": s.skipped,
+                "discarded": s.discarded,
+                "dropped_frames": slots[cam_id].dropped if cam_id in slots else 0,
+            }
+            for cam_id, s in self._stats.items()
+        }
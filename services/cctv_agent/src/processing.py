@@ -1,3 +1,5 @@
+import time
+
 import cv2
 import numpy as np
 from .models import CrowdDensityState
@@ -62,3 +64,49 @@ class FrameProcessor:
         For now returning 0 placeholder to keep it lightweight.
         """
         return 0.0
+
+class MotionGate:
+    """
+    Cheap pre-stage in front of HOG for one camera.
+    Each frame is shrunk to a `width`-pixel grayscale thumbnail and compared
+    with the thumbnail of the last fully detected frame. Motion energy is the
+    fraction of thumbnail pixels whose grey level moved by more than
+    `pixel_delta` (sensor noise is averaged away by the downscale; a mean over
+    the whole frame would hide one distant walker). Below `threshold` the
+    scene is considered unchanged and detection can be skipped, but never for
+    longer than `max_interval` seconds.
+    """
+    def __init__(self, threshold: float = 0.002, max_interval: float = 30.0, width: int = 96,
+                 pixel_delta: int = 12, clock=time.monotonic):
+        self.threshold = threshold
+        self.max_interval = max_interval
+        self.width = width
+        self.pixel_delta = pixel_delta
+        self.clock = clock
+        self._reference = None
+        self._detected_at = 0.0
+
+    def thumbnail(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        height, width = gray.shape[:2]
+        # INTER_AREA averages whole pixel blocks, which also smooths sensor noise
+        return cv2.resize(gray, (self.width, max(1, round(height * self.width / width))), interpolation=cv2.INTER_AREA)
+
+    def energy(self, thumbnail) -> float:
+        changed = cv2.absdiff(thumbnail, self._reference) > self.pixel_delta
+        return float(np.count_nonzero(changed)) / changed.size
+
+    def should_detect(self, frame) -> bool:
+        """True when `frame` needs full detection; it then becomes the new reference."""
+        small = self.thumbnail(frame)
+        now = self.clock()
+        if (self._reference is None or self._reference.shape != small.shape
+                or now - self._detected_at >= self.max_interval or self.energy(small) >= self.threshold):
+            self._reference = small
+            self._detected_at = now
+            return True
+        return False
+
+    def reset(self):
+        """Force detection on the next frame (e.g. after a failed detection)."""
+        self._reference = None
@@ -1,18 +1,107 @@
-from sqlalchemy import create_engine
+from sqlalchemy import case, create_engine, event, func, inspect, select, text, tuple_
 from sqlalchemy.orm import sessionmaker
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
 import os
-from .models import Base, AggregateStats
+from .models import Base, AggregateStats, CrowdDensityState, UplinkState
+
+logger = logging.getLogger(__name__)
 
 # Use a local SQLite file for this agent.
 # In a real cluster, this might point to a shared Postgres, 
 # but per instructions, this is a standalone service/module.
 DB_PATH = os.getenv("DB_PATH", "sqlite:///data/db/cctv_stats.db")
+# tuned: WAL + pragmas below (API reads don't block the writer); default: SQLite defaults
+STORAGE_MODE = os.getenv("STORAGE_MODE", "tuned")
+
+TUNED_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL", # durable at checkpoints; a power cut loses at most the last commits
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000", # KiB
+    "PRAGMA wal_autocheckpoint=1000",
+)
 
-engine = create_engine(DB_PATH, connect_args={"check_same_thread": False})
+def make_engine(url: str = DB_PATH, mode: str = STORAGE_MODE):
+    db_engine = create_engine(url, connect_args={"check_same_thread": False})
+    if mode == "tuned" and db_engine.dialect.name == "sqlite":
+        @event.listens_for(db_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in TUNED_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+    return db_engine
+
+engine = make_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+def init_db(db_engine=None):
+    db_engine = db_engine or engine
+    if STORAGE_MODE == "tuned" and db_engine.dialect.name == "sqlite":
+        _enable_incremental_vacuum(db_engine)
+    Base.metadata.create_all(bind=db_engine)
+    if db_engine.dialect.name == "sqlite":
+        _ensure_autoincrement(db_engine)
+    _add_missing_columns(db_engine)
+    # create_all skips indexes of tables that already exist
+    for index in AggregateStats.__table__.indexes:
+        index.create(bind=db_engine, checkfirst=True)
+
+def _enable_incremental_vacuum(db_engine):
+    """auto_vacuum only changes on an empty DB or through one full VACUUM; done once per file."""
+    with db_engine.connect() as conn:
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+            return
+        conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.exec_driver_sql("VACUUM")
+
+def _ensure_autoincrement(db_engine):
+    """
+    create_all doesn't alter existing tables: rebuild an `aggregates` table
+    created before AUTOINCREMENT, so ids freed by retention are never reused
+    (the uplink would skip rows reusing ids at or below its mark).
+    """
+    table = AggregateStats.__table__
+    old = f"_{table.name}_old"
+    with db_engine.begin() as conn:
+        tables = dict(conn.exec_driver_sql("SELECT name, sql FROM sqlite_master WHERE type = 'table'").all())
+        if old not in tables:  # else: resume a rebuild that was interrupted
+            if "AUTOINCREMENT" in tables[table.name].upper():
+                return
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} RENAME TO {old}")
+            # Index names stay taken by the renamed table
+            for index in table.indexes:
+                conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+            table.create(bind=conn)
+        elif table.name not in tables:
+            table.create(bind=conn)
+        copied = [c['name'] for c in inspect(conn).get_columns(old) if c['name'] in table.columns]
+        columns = ", ".join(copied)
+        conn.exec_driver_sql(f"INSERT OR IGNORE INTO {table.name} ({columns}) SELECT {columns} FROM {old}")
+        conn.exec_driver_sql(f"DROP TABLE {old}")
+        # Continue above every id already handed out, including rows retention since deleted
+        last = conn.execute(select(func.max(UplinkState.last_id))).scalar() or 0
+        conn.exec_driver_sql(
+            "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (last, table.name))
+        conn.exec_driver_sql(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT ?, ? WHERE NOT EXISTS "
+            "(SELECT 1 FROM sqlite_sequence WHERE name = ?)", (table.name, last, table.name))
+    logger.info(f"Rebuilt {table.name} with AUTOINCREMENT ids")
+
+def _add_missing_columns(db_engine):
+    """
+    create_all doesn't alter existing tables: add nullable columns introduced
+    since a field unit's DB was created.
+    """
+    table = AggregateStats.__table__
+    existing = {c['name'] for c in inspect(db_engine).get_columns(table.name)}
+    with db_engine.begin() as conn:
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(db_engine.dialect)}'))
 
 def get_db():
     db = SessionLocal()
@@ -37,9 +126,134 @@ def save_aggregate(db, stats: dict):
     db.refresh(db_item)
     return db_item
 
+def save_aggregates(db, rows):
+    """
+    Save a batch of aggregate rows in a single transaction.
+    """
+    if not rows:
+        return 0
+    db.add_all([AggregateStats(**row) for row in rows])
+    db.commit()
+    return len(rows)
+
+def flush_aggregates(db, pending: list, max_pending: int = 10000) -> list:
+    """
+    Write `pending` rows in one transaction and return the rows still unwritten
+    (empty on success). If the write fails, e.g. `database is locked` past the
+    busy timeout while retention or the uplink hold the write lock, the
+    transaction is rolled back and the rows are returned for the next pass;
+    beyond `max_pending` the oldest are dropped.
+    """
+    if not pending:
+        return pending
+    try:
+        save_aggregates(db, pending)
+        return []
+    except Exception as e:
+        db.rollback()
+        if len(pending) > max_pending:
+            logger.error(f"Dropping {len(pending) - max_pending} unwritten aggregate rows")
+            pending = pending[-max_pending:]
+        logger.warning(f"Saving {len(pending)} aggregate rows failed, retrying next pass: {e}")
+        return pending
+
 def get_aggregates(db, district_id: str = None, limit: int = 100):
     query = db.query(AggregateStats)
     if district_id:
         query = query.filter(AggregateStats.district_id == district_id)
     
     return query.order_by(AggregateStats.timestamp.desc()).limit(limit).all()
+
+def high_water_mark(db, name: str) -> int:
+    """Last aggregate id accepted by uplink `name` (0 if nothing was shipped yet)."""
+    state = db.get(UplinkState, name)
+    return state.last_id if state is not None else 0
+
+def set_high_water_mark(db, name: str, last_id: int):
+    state = db.get(UplinkState, name)
+    if state is None:
+        db.add(UplinkState(name=name, last_id=last_id))
+    else:
+        state.last_id = last_id
+    db.commit()
+
+def pending_aggregates(db, after_id: int, limit: int):
+    """Window rows with id > `after_id`, oldest first (hourly rows are never shipped)."""
+    return (db.query(AggregateStats)
+            .filter(AggregateStats.id > after_id, AggregateStats.resolution.is_(None))
+            .order_by(AggregateStats.id)
+            .limit(limit)
+            .all())
+
+# Density states by severity, for "worst state in the hour"
+SEVERITY = [CrowdDensityState.LOW, CrowdDensityState.MODERATE, CrowdDensityState.HIGH, CrowdDensityState.CRITICAL]
+HOURLY = 'hour'
+
+def downsample(db, older_than: datetime, max_id: Optional[int] = None):
+    """
+    Collapse window rows of hours entirely before `older_than` into one row
+    per (district, camera, hour) and delete them, in one transaction.
+    count is the sample-weighted mean, count_max the max, count_p95 the max
+    of the windows' p95 (an upper bound), density_state the worst seen.
+    With `max_id`, an hour holding any row above it (not shipped yet) is left
+    alone. Only whole hours are collapsed, so a later pass never writes a
+    second hourly row for the same hour.
+    Returns (rows removed, hourly rows written).
+    """
+    A = AggregateStats
+    hour = func.strftime('%Y-%m-%d %H:00:00', A.timestamp)
+    weight = func.coalesce(A.samples, 1)
+    severity = case({state.name: rank for rank, state in enumerate(SEVERITY)}, value=A.density_state)
+    old = (A.resolution.is_(None), A.timestamp < older_than.replace(minute=0, second=0, microsecond=0))
+    having = () if max_id is None else (func.max(A.id) <= max_id,)
+    complete = select(A.district_id, A.camera_id, hour).where(*old).group_by(
+        A.district_id, A.camera_id, hour).having(*having)
+    old += (tuple_(A.district_id, A.camera_id, hour).in_(complete),)
+    groups = db.execute(
+        select(A.district_id, A.camera_id, hour,
+               func.sum(A.count * weight) * 1.0 / func.sum(weight),
+               func.max(func.coalesce(A.count_max, A.count)),
+               func.max(func.coalesce(A.count_p95, A.count)),
+               func.sum(weight),
+               func.max(severity),
+               func.avg(A.flow_rate))
+        .where(*old)
+        .group_by(A.district_id, A.camera_id, hour)
+    ).all()
+    if not groups:
+        return 0, 0
+    db.add_all([
+        A(district_id=district_id, camera_id=camera_id,
+          timestamp=datetime.strptime(bucket, '%Y-%m-%d %H:%M:%S'),
+          count=int(round(mean)), count_max=count_max, count_p95=count_p95, samples=samples,
+          density_state=SEVERITY[worst], flow_rate=flow_rate, resolution=HOURLY)
+        for district_id, camera_id, bucket, mean, count_max, count_p95, samples, worst, flow_rate in groups
+    ])
+    removed = db.query(A).filter(*old).delete(synchronize_session=False)
+    db.commit()
+    return removed, len(groups)
+
+def run_retention(db, raw_days: float, hourly_days: float, vacuum_pages: int = 1000, max_id: Optional[int] = None):
+    """
+    One retention pass: downsample window rows older than `raw_days` (and not
+    above `max_id`, the uplink high-water mark), drop hourly rows older than
+    `hourly_days`, then return up to `vacuum_pages` free pages to the
+    filesystem (incremental: never rewrites the whole file).
+    """
+    now = datetime.utcnow()
+    removed, hourly = downsample(db, now - timedelta(days=raw_days), max_id)
+    expired = db.query(AggregateStats).filter(
+        AggregateStats.resolution == HOURLY,
+        AggregateStats.timestamp < now - timedelta(days=hourly_days),
+    ).delete(synchronize_session=False)
+    db.commit()
+    bind = db.get_bind()
+    if bind.dialect.name == "sqlite":
+        # executescript steps the pragma to completion; a plain execute frees a single page
+        raw = bind.raw_connection()
+        try:
+            raw.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)});")
+        finally:
+            raw.close()
+    logger.info(f"Retention: {removed} rows -> {hourly} hourly rows, {expired} hourly rows expired")
+    return removed, hourly, expired
@@ -0,0 +1,156 @@
+import gzip
+import json
+import logging
+import random
+import threading
+from datetime import timezone
+from typing import Dict, Optional
+
+import requests
+
+from .models import CrowdDensityState
+from .storage import high_water_mark, pending_aggregates, set_high_water_mark
+
+logger = logging.getLogger(__name__)
+
+INGEST_PATH = "/api/v1/safety/telemetry/crowd-aggregate/batch"
+LOGIN_PATH = "/api/v1/auth/login/"
+
+# The backend only knows LOW / MEDIUM / HIGH
+BACKEND_DENSITY = {
+    CrowdDensityState.LOW: "LOW",
+    CrowdDensityState.MODERATE: "MEDIUM",
+    CrowdDensityState.HIGH: "HIGH",
+    CrowdDensityState.CRITICAL: "HIGH",
+}
+
+class UplinkError(Exception):
+    pass
+
+def to_ingest_item(row, hotspots: Dict[str, str]) -> dict:
+    """One `aggregates` row in the backend's CrowdAggregate ingest format."""
+    return {
+        "district_id": row.district_id,
+        "hotspot_id": hotspots.get(row.camera_id, row.camera_id),
+        "density_state": BACKEND_DENSITY[row.density_state],
+        "count_15min": row.count,
+        "timestamp": row.timestamp.replace(tzinfo=timezone.utc).isoformat(),
+        "source_type": "CCTV_EDGE",
+    }
+
+def encode_batch(items) -> bytes:
+    """gzip-compressed NDJSON, one aggregate per line."""
+    return gzip.compress("\n".join(json.dumps(item, separators=(",", ":")) for item in items).encode())
+
+class Uplink:
+    """
+    Store-and-forward shipping of window aggregates to the backend batch ingest.
+    - Tails `aggregates` past a durable high-water mark (`uplink_state` table),
+      oldest first, `batch_size` rows per gzip NDJSON request.
+    - The mark only advances once the backend answered 2xx, so an outage or a
+      restart resends from the last accepted row (at-least-once delivery).
+      Items the backend rejects as invalid (207) are logged and skipped.
+    - Failures back off exponentially (with jitter) up to `backoff_max`; once
+      the backend is reachable again a backlog is sent batch after batch.
+    Auth: a bearer `token`, or `email`/`password` to log in (again on a 401).
+    """
+    def __init__(self, base_url: str, session_factory, name: str = "backend", token: Optional[str] = None,
+                 email: Optional[str] = None, password: Optional[str] = None, hotspots: Optional[dict] = None,
+                 batch_size: int = 500, interval: float = 10, backoff_base: float = 1, backoff_max: float = 300,
+                 timeout: float = 10, http=None):
+        self.url = base_url.rstrip("/") + INGEST_PATH
+        self.login_url = base_url.rstrip("/") + LOGIN_PATH
+        self.session_factory = session_factory
+        self.name = name
+        self.token = token
+        self.email = email
+        self.password = password
+        self.hotspots = hotspots or {}
+        self.batch_size = batch_size
+        self.interval = interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.http = http or requests.Session()
+        self.high_water_mark = None
+        self.sent = 0
+        self.rejected = 0
+        self.failures = 0  # consecutive failed attempts
+        self.last_error = None
+
+    def ship_once(self) -> int:
+        """Send the next batch; returns the number of rows handed over (0 when caught up). Raises on failure."""
+        db = self.session_factory()
+        try:
+            mark = high_water_mark(db, self.name)
+            rows = pending_aggregates(db, mark, self.batch_size)
+            if not rows:
+                self.high_water_mark = mark
+                return 0
+            response = self._post(encode_batch([to_ingest_item(row, self.hotspots) for row in rows]))
+            if response.status_code == 207:
+                rejected = [r for r in response.json().get("results", []) if r.get("status") != "created"]
+                self.rejected += len(rejected)
+                logger.warning(f"Uplink: backend rejected {len(rejected)} of {len(rows)} aggregates: {rejected[:3]}")
+            set_high_water_mark(db, self.name, rows[-1].id)
+            self.high_water_mark = rows[-1].id
+            self.sent += len(rows)
+            return len(rows)
+        finally:
+            db.close()
+
+    def _post(self, body: bytes):
+        if self.token is None and self.email:
+            self._login()
+        response = self._send(body)
+        if response.status_code == 401 and self.email:
+            self._login()
+            response = self._send(body)
+        if not 200 <= response.status_code < 300:
+            raise UplinkError(f"Ingest returned {response.status_code}: {response.text[:200]}")
+        return response
+
+    def _send(self, body: bytes):
+        headers = {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return self.http.post(self.url, data=body, headers=headers, timeout=self.timeout)
+
+    def _login(self):
+        response = self.http.post(self.login_url, json={"email": self.email, "password": self.password},
+                                  timeout=self.timeout)
+        if response.status_code != 200:
+            raise UplinkError(f"Login returned {response.status_code}")
+        self.token = response.json()["access"]
+
+    def backoff(self) -> float:
+        """Delay before the next attempt after `failures` consecutive failures."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** max(self.failures - 1, 0))
+        return delay * random.uniform(0.5, 1.0)
+
+    def run(self, stop_event: threading.Event):
+        logger.info(f"Uplink to {self.url} started")
+        while not stop_event.is_set():
+            try:
+                shipped = self.ship_once()
+            except Exception as e:  # network, HTTP status or a locked DB: retry them all
+                self.failures += 1
+                self.last_error = str(e)
+                delay = self.backoff()
+                logger.warning(f"Uplink attempt {self.failures} failed: {e}. Retrying in {delay:.1f}s")
+                stop_event.wait(delay)
+                continue
+            if self.failures:
+                logger.info(f"Uplink recovered after {self.failures} failed attempts")
+                self.failures = 0
+            if shipped < self.batch_size:
+                stop_event.wait(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "high_water_mark": self.high_water_mark,
+            "sent": self.sent,
+            "rejected": self.rejected,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,120 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.models import CrowdDensityState
+from src.pipeline import CameraConfig, LatestFrame, Pipeline
+from src.processing import MotionGate
+
+class FakeStream:
+    def __init__(self, source, is_file=False):
+        self.frame = np.zeros((120, 160, 3), dtype=np.uint8)
+
+    def get_frame(self):
+        time.sleep(0.005)
+        return self.frame
+
+    def release(self):
+        pass
+
+class BlockingStream(FakeStream):
+    """A stalled RTSP read: never returns a frame."""
+    released = threading.Event()
+
+    def get_frame(self):
+        self.released.wait()
+        return None
+
+def test_latest_frame_wins():
+    slot = LatestFrame()
+    slot.put("old")
+    slot.put("new")
+    frame, captured_at = slot.take()
+    assert frame == "new" and captured_at is not None
+    assert slot.dropped == 1
+    assert slot.take() == (None, None)
+
+def test_camera_config_from_dict():
+    cam = CameraConfig.from_dict({"id": "c1", "district_id": "d", "source": "sample.mp4"}, default_fps=2)
+    assert cam.is_file and cam.source.endswith("data/samples/sample.mp4")
+    assert cam.interval == 0.5
+    live = CameraConfig.from_dict({"id": "c2", "district_id": "d", "source": "rtsp://cam/1", "fps": 5})
+    assert not live.is_file and live.fps == 5
+
+def test_stalled_camera_does_not_block_others():
+    def factory(source, is_file=False):
+        return BlockingStream(source) if source == "rtsp://stuck" else FakeStream(source)
+
+    cameras = [
+        CameraConfig("ok", "d1", "rtsp://ok", is_file=False, fps=20),
+        CameraConfig("stuck", "d2", "rtsp://stuck", is_file=False, fps=20),
+    ]
+    pipeline = Pipeline(cameras, executor=ThreadPoolExecutor(2), stream_factory=factory)
+    pipeline.start()
+    time.sleep(0.5)
+    pipeline.stop()
+    BlockingStream.released.set()
+
+    results = []
+    while not pipeline.results.empty():
+        results.append(pipeline.results.get())
+    assert {r.camera_id for r in results} == {"ok"}
+    assert all(r.count == 0 and r.density_state == CrowdDensityState.LOW for r in results)
+    # ~20 fps for 0.5s, within scheduling slack
+    assert 5 <= pipeline.stats()["ok"]["processed"] <= 12
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_motion_gate():
+    clock = FakeClock()
+    gate = MotionGate(threshold=0.002, max_interval=30, clock=clock)
+    rng = np.random.default_rng(0)
+    scene = rng.integers(60, 120, (480, 640, 3)).astype(np.uint8)
+    assert gate.should_detect(scene)  # no reference yet
+
+    noisy = np.clip(scene + rng.normal(0, 5, scene.shape), 0, 255).astype(np.uint8)
+    clock.now = 10
+    assert not gate.should_detect(noisy)
+    walker = noisy.copy()
+    walker[200:250, 300:320] = 220  # one small figure far from the camera
+    assert gate.should_detect(walker)
+
+    clock.now = 39
+    assert not gate.should_detect(walker)
+    clock.now = 40  # max_interval since the last detection
+    assert gate.should_detect(walker)
+    gate.reset()
+    assert gate.should_detect(walker)
+
+def test_static_scene_reuses_last_count():
+    cameras = [CameraConfig("ok", "d1", "rtsp://ok", is_file=False, fps=20)]
+    pipeline = Pipeline(cameras, executor=ThreadPoolExecutor(1), stream_factory=FakeStream,
+                        motion_threshold=0.002, max_detect_interval=60)
+    pipeline.start()
+    time.sleep(0.5)
+    pipeline.stop()
+
+    results = []
+    while not pipeline.results.empty():
+        results.append(pipeline.results.get())
+    stats = pipeline.stats()["ok"]
+    assert stats["processed"] == 1 and stats["skipped"] >= 4
+    assert len(results) == stats["processed"] + stats["skipped"]
+    assert all(r.count == 0 for r in results)
+
+def test_full_results_queue_discards():
+    cameras = [CameraConfig("ok", "d1", "rtsp://ok", is_file=False, fps=50)]
+    pipeline = Pipeline(cameras, executor=ThreadPoolExecutor(1), stream_factory=FakeStream, results_size=3)
+    pipeline.start()
+    time.sleep(0.3)  # nobody consumes results
+    pipeline.stop()
+    stats = pipeline.stats()["ok"]
+    assert pipeline.results.qsize() == 3
+    assert stats["discarded"] == stats["processed"] - 3 > 0
@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.aggregation import WindowedAggregator
+from src.models import AggregateStats, Base, CrowdDensityState
+from src.pipeline import FrameResult
+from src.storage import downsample, flush_aggregates, init_db, make_engine, run_retention, save_aggregates
+
+LOW, MODERATE = CrowdDensityState.LOW, CrowdDensityState.MODERATE
+T0 = datetime(2026, 1, 1, 10, 0, 0)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def reading(count, state=LOW, camera="cam_01", seconds=0):
+    return FrameResult(camera, "district_A", count, state, T0 + timedelta(seconds=seconds))
+
+def test_window_rows_and_statistics():
+    clock = FakeClock()
+    aggregator = WindowedAggregator(window_seconds=60, clock=clock)
+    for i, count in enumerate([1, 2, 3, 4, 0]):
+        assert aggregator.add(reading(count, seconds=i)) == []
+    assert aggregator.add(reading(2, camera="cam_02")) == []
+    assert aggregator.due() == []
+
+    clock.now = 60
+    rows = sorted(aggregator.due(), key=lambda r: r["camera_id"])
+    assert [(r["camera_id"], r["samples"]) for r in rows] == [("cam_01", 5), ("cam_02", 1)]
+    assert (rows[0]["count"], rows[0]["count_max"]) == (2, 4)
+    assert abs(rows[0]["count_p95"] - 3.8) < 1e-9
+    assert rows[0]["timestamp"] == T0 + timedelta(seconds=4)
+    assert aggregator.due() == []  # windows restarted empty
+
+def test_state_change_emits_immediately():
+    aggregator = WindowedAggregator(window_seconds=60, clock=FakeClock())
+    aggregator.add(reading(1))
+    aggregator.add(reading(2, seconds=1))
+    rows = aggregator.add(reading(9, MODERATE, seconds=2))
+    assert [(r["density_state"], r["samples"], r["count"]) for r in rows] == [(LOW, 2, 2), (MODERATE, 1, 9)]
+    assert aggregator.add(reading(8, MODERATE, seconds=3)) == []
+    assert [r["samples"] for r in aggregator.drain()] == [1]
+
+def test_batch_save_single_transaction():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    aggregator = WindowedAggregator(window_seconds=0, clock=FakeClock())
+    for camera in ("cam_01", "cam_02", "cam_03"):
+        aggregator.add(reading(3, camera=camera))
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    assert save_aggregates(db, aggregator.due()) == 3
+    assert len(commits) == 1
+    assert db.query(AggregateStats).count() == 3
+
+def test_tuned_storage_and_retention(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'stats.db'}", mode="tuned")
+    init_db(engine)
+    db = sessionmaker(bind=engine)()
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2
+        plan = conn.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT * FROM aggregates WHERE district_id='d' ORDER BY timestamp DESC").all()
+        assert "ix_aggregates_district_ts" in str(plan)
+
+    old = (datetime.utcnow() - timedelta(days=10)).replace(minute=0, second=0, microsecond=0)
+    rows = [dict(district_id="district_A", camera_id="cam_01", timestamp=old + timedelta(minutes=m),
+                 count=c, count_max=c + 1, count_p95=c + 0.5, samples=60, density_state=state)
+            for m, c, state in [(0, 2, LOW), (1, 4, LOW), (2, 9, MODERATE)]]
+    rows.append(dict(district_id="district_A", camera_id="cam_01", timestamp=datetime.utcnow(),
+                     count=1, samples=60, density_state=LOW))
+    save_aggregates(db, rows)
+
+    assert run_retention(db, raw_days=7, hourly_days=365) == (3, 1, 0)
+    hourly = db.query(AggregateStats).filter(AggregateStats.resolution == "hour").one()
+    assert (hourly.count, hourly.count_max, hourly.count_p95, hourly.samples) == (5, 10, 9.5, 180)
+    assert hourly.density_state == MODERATE
+    assert hourly.timestamp == old
+    assert db.query(AggregateStats).count() == 2
+
+    assert run_retention(db, raw_days=7, hourly_days=1) == (0, 0, 1)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA freelist_count").scalar() == 0
+
+def test_downsample_only_whole_hours():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    save_aggregates(db, [dict(district_id="district_A", camera_id="cam_01", timestamp=T0 + timedelta(minutes=m),
+                              count=m, samples=60, density_state=LOW) for m in range(0, 60, 10)])
+
+    # A cutoff inside 10:00-11:00 leaves that hour alone instead of collapsing part of it
+    assert downsample(db, T0 + timedelta(minutes=25)) == (0, 0)
+    assert downsample(db, T0 + timedelta(minutes=90)) == (6, 1)
+    hourly = db.query(AggregateStats).one()
+    assert (hourly.timestamp, hourly.count, hourly.samples) == (T0, 25, 360)
+
+def test_failed_write_keeps_rows_for_next_pass(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    rows = [dict(district_id="district_A", camera_id="cam_01", timestamp=T0, count=i, density_state=LOW)
+            for i in range(3)]
+
+    def locked():
+        raise OperationalError("COMMIT", {}, Exception("database is locked"))
+    monkeypatch.setattr(db, "commit", locked)
+    pending = flush_aggregates(db, rows, max_pending=2)
+    assert [r["count"] for r in pending] == [1, 2]  # oldest dropped beyond max_pending
+    assert db.query(AggregateStats).count() == 0  # rolled back
+
+    monkeypatch.undo()
+    assert flush_aggregates(db, pending) == []
+    assert db.query(AggregateStats).count() == 2
+
+def test_existing_table_rebuilt_with_autoincrement(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'stats.db'}", mode="default")
+    with engine.begin() as conn:
+        # Layout of a unit's DB from before AUTOINCREMENT (and before count_max/count_p95/samples/resolution)
+        conn.exec_driver_sql(
+            "CREATE TABLE aggregates (id INTEGER NOT NULL PRIMARY KEY, district_id VARCHAR NOT NULL, "
+            "camera_id VARCHAR NOT NULL, timestamp DATETIME, count INTEGER NOT NULL, "
+            "density_state VARCHAR(8) NOT NULL, flow_rate FLOAT)")
+        conn.exec_driver_sql("CREATE INDEX ix_aggregates_timestamp ON aggregates (timestamp)")
+        conn.exec_driver_sql("INSERT INTO aggregates VALUES (1, 'd', 'c', '2026-01-01 10:00:00', 3, 'LOW', 0), "
+                             "(2, 'd', 'c', '2026-01-01 10:01:00', 4, 'LOW', 0)")
+        conn.exec_driver_sql("CREATE TABLE uplink_state (name VARCHAR PRIMARY KEY, last_id INTEGER NOT NULL, "
+                             "updated_at DATETIME)")
+        # Shipped up to 5, then retention deleted rows 3..5
+        conn.exec_driver_sql("INSERT INTO uplink_state VALUES ('backend', 5, NULL)")
+
+    init_db(engine)
+    init_db(engine)  # no-op once rebuilt
+    with engine.connect() as conn:
+        sql = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'aggregates'").scalar()
+        assert "AUTOINCREMENT" in sql
+    db = sessionmaker(bind=engine)()
+    assert [(r.id, r.count) for r in db.query(AggregateStats).order_by(AggregateStats.id)] == [(1, 3), (2, 4)]
+    save_aggregates(db, [dict(district_id="d", camera_id="c", timestamp=T0, count=5, density_state=LOW)])
+    assert db.query(func.max(AggregateStats.id)).scalar() == 6
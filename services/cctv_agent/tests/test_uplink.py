@@ -0,0 +1,133 @@
+import gzip
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.models import AggregateStats, CrowdDensityState
+from src.storage import (
+    high_water_mark, init_db, make_engine, pending_aggregates, run_retention, save_aggregates, set_high_water_mark,
+)
+from src.uplink import INGEST_PATH, LOGIN_PATH, Uplink
+
+class StandInBackend(ThreadingHTTPServer):
+    """Batch ingest stand-in: answers 503 while `down`, requires a token from the login endpoint."""
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), IngestHandler)
+        self.down = False
+        self.token = "t1"
+        self.items = []
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class IngestHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == LOGIN_PATH:
+            return self._reply(200, {"access": server.token, "refresh": "r"})
+        if server.down:
+            return self._reply(503, {"detail": "unavailable"})
+        if self.headers.get("Authorization") != f"Bearer {server.token}":
+            return self._reply(401, {"detail": "token expired"})
+        assert self.path == INGEST_PATH and self.headers["Content-Encoding"] == "gzip"
+        items = [json.loads(line) for line in gzip.decompress(body).decode().splitlines()]
+        server.items.extend(items)
+        self._reply(201, {"created": len(items), "failed": 0, "results": []})
+
+@pytest.fixture
+def backend():
+    server = StandInBackend()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    init_db(engine)
+    return sessionmaker(bind=engine)
+
+def window_rows(n, start, camera="cam_02", state=CrowdDensityState.MODERATE):
+    return [dict(district_id="district_B", camera_id=camera, timestamp=start + timedelta(minutes=i),
+                 count=i, samples=60, density_state=state) for i in range(n)]
+
+def test_batches_mapping_and_mark(backend, session_factory):
+    db = session_factory()
+    save_aggregates(db, window_rows(5, datetime(2026, 1, 1, 10)))
+    uplink = Uplink(backend.base_url, session_factory, email="edge@example.com", password="pw",
+                    hotspots={"cam_02": "hotspot_B1"}, batch_size=2)
+
+    assert [uplink.ship_once() for _ in range(4)] == [2, 2, 1, 0]
+    assert len(backend.items) == 5
+    assert backend.items[0] == {
+        "district_id": "district_B", "hotspot_id": "hotspot_B1", "density_state": "MEDIUM",
+        "count_15min": 0, "timestamp": "2026-01-01T10:00:00+00:00", "source_type": "CCTV_EDGE",
+    }
+    assert high_water_mark(db, uplink.name) == 5
+
+    # Token rotated on the backend: log in again and resend the same batch
+    backend.token = "t2"
+    save_aggregates(db, window_rows(1, datetime(2026, 1, 1, 11)))
+    assert uplink.ship_once() == 1
+    assert len(backend.items) == 6
+
+def test_outage_backoff_and_resume(backend, session_factory):
+    db = session_factory()
+    save_aggregates(db, window_rows(3, datetime(2026, 1, 1, 10)))
+    backend.down = True
+    uplink = Uplink(backend.base_url, session_factory, token=backend.token, batch_size=2, interval=0.01,
+                    backoff_base=0.01, backoff_max=0.05)
+    stop = threading.Event()
+    worker = threading.Thread(target=uplink.run, args=(stop,), daemon=True)
+    worker.start()
+    try:
+        deadline = time.monotonic() + 5
+        while uplink.failures < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert uplink.failures >= 3 and backend.items == []
+        assert high_water_mark(db, uplink.name) == 0
+        # Rows written during the outage are queued locally, and shipped once it ends
+        save_aggregates(db, window_rows(2, datetime(2026, 1, 1, 12)))
+        backend.down = False
+        while len(backend.items) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop.set()
+        worker.join(2)
+    assert [item["count_15min"] for item in backend.items] == [0, 1, 2, 0, 1]
+    assert uplink.failures == 0 and uplink.sent == 5
+
+    # A restarted agent resumes from the stored mark instead of resending
+    restarted = Uplink(backend.base_url, session_factory, token=backend.token)
+    assert restarted.ship_once() == 0
+
+def test_retention_keeps_unsent_rows(session_factory):
+    db = session_factory()
+    old = (datetime.utcnow() - timedelta(days=10)).replace(minute=0, second=0, microsecond=0)
+    save_aggregates(db, window_rows(2, old) + window_rows(2, old + timedelta(hours=1)))
+    set_high_water_mark(db, "backend", 3)
+
+    assert run_retention(db, raw_days=7, hourly_days=365, max_id=3) == (2, 1, 0)
+    # The second hour still holds an unsent row, so it is kept whole; the new hourly row is never shipped
+    assert [r.id for r in pending_aggregates(db, 3, 10)] == [4]
+    assert db.query(AggregateStats.id).filter(AggregateStats.resolution.is_(None)).count() == 2